@@ -6,11 +6,12 @@ from django.contrib.auth import get_user_model
 from .models import User, CandidateProfile
 from candidates.models import Candidature, CandidatureFile
 from categories.models import Category
+from config.sparse import SparseFieldsMixin
 
 User = get_user_model()
 
 
-class AdminUserSerializer(serializers.ModelSerializer):
+class AdminUserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Sérialiseur pour la gestion des utilisateurs par l'admin"""
     full_name = serializers.CharField(source='get_full_name', read_only=True)
     candidate_profile = serializers.SerializerMethodField()
@@ -26,6 +27,13 @@ class AdminUserSerializer(serializers.ModelSerializer):
             'candidate_profile', 'candidatures_count'
         ]
         read_only_fields = ['id', 'date_joined', 'created_at', 'updated_at']
+        expandable_fields = ['candidate_profile']
+        select_related_fields = {
+            'candidate_profile': ['candidate_profile'],
+        }
+        prefetch_related_fields = {
+            'candidatures': ['candidatures_count'],
+        }
     
     def get_candidate_profile(self, obj):
         if obj.user_type == 'candidate' and hasattr(obj, 'candidate_profile'):
@@ -62,9 +70,10 @@ class AdminCandidatureFileSerializer(serializers.ModelSerializer):
         model = CandidatureFile
         fields = [
             'id', 'file_type', 'file', 'file_url', 'title', 'order',
-            'file_size', 'file_extension', 'uploaded_at'
+            'file_size', 'file_extension', 'mime_type', 'width', 'height', 'duration',
+            'uploaded_at'
         ]
-        read_only_fields = ['id', 'uploaded_at']
+        read_only_fields = ['id', 'mime_type', 'width', 'height', 'duration', 'uploaded_at']
     
     def get_file_size(self, obj):
         return obj.get_file_size()
@@ -18,6 +18,8 @@ from .admin_serializers import (
 )
 from candidates.models import Candidature
 from candidates.admin_serializers import AdminCandidatureSerializer
+from config.search import search_queryset
+from dashboard.services import DashboardStatsService
 
 User = get_user_model()
 
@@ -49,11 +51,10 @@ class AdminUsersView(APIView):
         
         search = request.query_params.get('search')
         if search:
-            users = users.filter(
-                Q(first_name__icontains=search) |
-                Q(last_name__icontains=search) |
-                Q(email__icontains=search) |
-                Q(username__icontains=search)
+            users = search_queryset(
+                users, search,
+                ['first_name', 'last_name', 'email', 'username'],
+                vector_field='search_vector'
             )
         
         is_verified = request.query_params.get('is_verified')
@@ -64,15 +65,18 @@ class AdminUsersView(APIView):
         if is_active is not None:
             users = users.filter(is_active=is_active.lower() == 'true')
         
+        # Jointures limitées aux champs demandés (?fields= / ?expand=)
+        users = AdminUserSerializer.prune_queryset(users, request)
+        
         # Pagination
         paginator = AdminUserPagination()
         page = paginator.paginate_queryset(users, request)
         
         if page is not None:
-            serializer = AdminUserSerializer(page, many=True)
+            serializer = AdminUserSerializer(page, many=True, context={'request': request})
             return paginator.get_paginated_response(serializer.data)
         
-        serializer = AdminUserSerializer(users, many=True)
+        serializer = AdminUserSerializer(users, many=True, context={'request': request})
         return Response(serializer.data)
     
     def post(self, request):
@@ -142,11 +146,9 @@ class AdminCandidateProfilesView(APIView):
         # Filtres
         search = request.query_params.get('search')
         if search:
-            profiles = profiles.filter(
-                Q(user__first_name__icontains=search) |
-                Q(user__last_name__icontains=search) |
-                Q(user__email__icontains=search) |
-                Q(bio__icontains=search)
+            profiles = search_queryset(
+                profiles, search,
+                ['user__first_name', 'user__last_name', 'user__email', 'bio']
             )
         
         # Pagination
@@ -279,26 +281,18 @@ def admin_dashboard_stats(request):
             status=status.HTTP_403_FORBIDDEN
         )
     
+    shared_stats = DashboardStatsService.get_stats()
+    candidatures = shared_stats['candidatures']
+    
     stats = {
-        'users': {
-            'total': User.objects.count(),
-            'candidates': User.objects.filter(user_type='candidate').count(),
-            'admins': User.objects.filter(user_type='admin').count(),
-            'verified': User.objects.filter(is_verified=True).count(),
-            'active': User.objects.filter(is_active=True).count(),
-        },
+        'users': shared_stats['users'],
         'candidatures': {
-            'total': Candidature.objects.count(),
-            'pending': Candidature.objects.filter(status='pending').count(),
-            'approved': Candidature.objects.filter(status='approved').count(),
-            'rejected': Candidature.objects.filter(status='rejected').count(),
+            'total': candidatures['total'],
+            'pending': candidatures['pending'],
+            'approved': candidatures['approved'],
+            'rejected': candidatures['rejected'],
         },
-        'profiles': {
-            'total': CandidateProfile.objects.count(),
-            'with_social': CandidateProfile.objects.exclude(
-                Q(facebook_url='') & Q(instagram_url='') & Q(youtube_url='') & Q(website_url='')
-            ).count(),
-        }
+        'profiles': shared_stats['profiles'],
     }
     
     return Response(stats)
@@ -0,0 +1,109 @@
+"""
+Authentification par jeton JWT pour l'app accounts
+
+Le jeton d'accès porte l'identifiant, le type et l'état de vérification de
+l'utilisateur : les vérifications de permissions (IsAdminUser,
+IsCandidateUser, IsVerifiedUser...) se font sans requête. L'utilisateur
+n'est chargé depuis la base qu'au premier accès à un autre attribut.
+Ces claims sont relus en base à chaque rafraîchissement du jeton.
+"""
+from django.contrib.auth import get_user_model
+from django.utils.functional import SimpleLazyObject
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+# Claims recopiés depuis l'utilisateur dans les jetons
+USER_CLAIMS = ('user_type', 'is_verified', 'is_staff')
+
+
+def set_user_claims(token, user):
+    """
+    Copie dans le jeton les attributs de l'utilisateur utilisés par les permissions
+    """
+    for claim in USER_CLAIMS:
+        token[claim] = getattr(user, claim)
+    return token
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """
+    Jeton de rafraîchissement portant les claims de l'utilisateur
+    (recopiés dans les jetons d'accès qui en sont dérivés)
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        return set_user_claims(super().for_user(user), user)
+
+
+class ClaimsUser(SimpleLazyObject):
+    """
+    Utilisateur authentifié par jeton
+
+    Les attributs portés par le jeton sont lus sans requête ; tout autre
+    accès (ou son utilisation dans une requête ORM) charge l'utilisateur.
+    """
+    is_authenticated = True
+    is_anonymous = False
+    is_active = True
+
+    def __init__(self, token):
+        user_id = token[api_settings.USER_ID_CLAIM]
+
+        def load():
+            try:
+                return get_user_model().objects.get(**{api_settings.USER_ID_FIELD: user_id})
+            except get_user_model().DoesNotExist:
+                raise AuthenticationFailed('Utilisateur introuvable.', code='user_not_found')
+
+        super().__init__(load)
+        self.__dict__['token'] = token
+
+    def __bool__(self):
+        # `request.user and ...` dans les permissions ne doit pas charger l'utilisateur
+        return True
+
+    @property
+    def id(self):
+        # Le claim est une chaîne : converti comme la clé primaire du modèle
+        return get_user_model()._meta.pk.to_python(self.token[api_settings.USER_ID_CLAIM])
+
+    @property
+    def pk(self):
+        return self.id
+
+    @property
+    def user_type(self):
+        return self.token.get('user_type')
+
+    @property
+    def is_verified(self):
+        return self.token.get('is_verified', False)
+
+    @property
+    def is_staff(self):
+        return self.token.get('is_staff', False)
+
+    def is_candidate(self):
+        return self.user_type == 'candidate'
+
+    def is_admin(self):
+        return self.user_type == 'admin'
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    Authentification par en-tête `Authorization: Bearer <jeton>` sans
+    lecture de session ni de l'utilisateur en base
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken('Le jeton ne contient pas d\'identifiant utilisateur.')
+        if any(claim not in validated_token for claim in USER_CLAIMS):
+            # Jeton émis sans les claims : on revient à la lecture en base
+            return super().get_user(validated_token)
+        return ClaimsUser(validated_token)
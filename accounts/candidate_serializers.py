@@ -6,6 +6,7 @@ from django.contrib.auth import get_user_model
 from .models import CandidateProfile
 from candidates.models import Candidature, CandidatureFile
 from categories.models import Category, CategoryClass
+from mediafiles.serializers import ResponsiveImageField
 
 User = get_user_model()
 
@@ -43,12 +44,13 @@ class CandidateProfileUpdateSerializer(serializers.ModelSerializer):
 class UserProfileSerializer(serializers.ModelSerializer):
     """Serializer pour les informations utilisateur du candidat"""
     profile_picture_url = serializers.SerializerMethodField()
+    profile_picture_variants = ResponsiveImageField(source='profile_picture')
     
     class Meta:
         model = User
         fields = [
             'id', 'email', 'username', 'first_name', 'last_name', 
-            'phone', 'country', 'is_verified', 'profile_picture', 'profile_picture_url', 'created_at', 'updated_at'
+            'phone', 'country', 'is_verified', 'profile_picture', 'profile_picture_url', 'profile_picture_variants', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'email', 'username', 'is_verified', 'created_at', 'updated_at']
     
@@ -95,7 +97,7 @@ class CandidatureFileSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = CandidatureFile
-        fields = ['id', 'file', 'file_type', 'description', 'uploaded_at']
+        fields = ['id', 'file', 'file_type', 'title', 'uploaded_at']
         read_only_fields = ['id', 'uploaded_at']
 
 
@@ -164,11 +166,18 @@ class CandidateDashboardSerializer(serializers.ModelSerializer):
     user = UserProfileSerializer(read_only=True)
     candidate_profile = CandidateProfileSerializer(read_only=True)
     candidatures = CandidatureSerializer(many=True, read_only=True)
+    total_candidatures = serializers.IntegerField(read_only=True)
+    pending_candidatures = serializers.IntegerField(read_only=True)
+    approved_candidatures = serializers.IntegerField(read_only=True)
+    rejected_candidatures = serializers.IntegerField(read_only=True)
+    profile_completion = serializers.IntegerField(read_only=True)
     
     class Meta:
         model = CandidateProfile
         fields = [
             'user', 'candidate_profile', 'candidatures',
+            'total_candidatures', 'pending_candidatures', 'approved_candidatures',
+            'rejected_candidatures', 'profile_completion',
             'created_at', 'updated_at'
         ]
         read_only_fields = ['created_at', 'updated_at']
@@ -14,7 +14,9 @@ from .candidate_serializers import (
     UserProfileUpdateSerializer, UserProfileSerializer, CandidatureCreateSerializer,
     PasswordChangeSerializer, CategorySerializer, CandidatureSerializer
 )
+from .services import CandidateDashboardService
 from candidates.models import Candidature
+from candidates.uploadhandlers import CandidatureUploadMixin
 from categories.models import Category, CategoryClass
 
 User = get_user_model()
@@ -40,24 +42,28 @@ class CandidateDashboardView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # Construire les données du dashboard manuellement
-        candidatures = Candidature.objects.filter(candidate=request.user).select_related('category', 'category__category_class').prefetch_related('files')
-        categories = Category.objects.filter(is_active=True).select_related('category_class').order_by('category_class__order', 'name')
+        # Partie propre au candidat (en cache, invalidée par signaux)
+        data = CandidateDashboardService.get_cached_dashboard(request.user)
+        if data is None:
+            candidatures = Candidature.objects.filter(candidate=request.user).select_related('category', 'category__category_class').prefetch_related('files')
+            
+            dashboard_data = {
+                'user': request.user,
+                'candidate_profile': profile,
+                **CandidateDashboardService.get_candidature_stats(request.user),
+                'profile_completion': self._calculate_profile_completion(profile),
+                'candidatures': candidatures,
+            }
+            
+            serializer = CandidateDashboardSerializer(dashboard_data, context={'request': request})
+            data = serializer.data
+            CandidateDashboardService.set_cached_dashboard(request.user, data)
         
-        dashboard_data = {
-            'user': request.user,
-            'candidate_profile': profile,
-            'total_candidatures': candidatures.count(),
-            'pending_candidatures': candidatures.filter(status='pending').count(),
-            'approved_candidatures': candidatures.filter(status='approved').count(),
-            'rejected_candidatures': candidatures.filter(status='rejected').count(),
-            'profile_completion': self._calculate_profile_completion(profile),
-            'candidatures': candidatures,
-            'categories': categories,
-        }
-        
-        serializer = CandidateDashboardSerializer(dashboard_data, context={'request': request})
-        return Response(serializer.data)
+        # Liste des catégories partagée entre tous les candidats
+        return Response({
+            **data,
+            'categories': CandidateDashboardService.get_active_categories(),
+        })
     
     def _calculate_profile_completion(self, profile):
         """Calculer le pourcentage de completion du profil"""
@@ -188,9 +194,10 @@ class CandidateCandidaturesView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class CandidateCandidatureUpdateView(APIView):
+class CandidateCandidatureUpdateView(CandidatureUploadMixin, APIView):
     """Vue pour mettre à jour une candidature existante"""
     permission_classes = [permissions.IsAuthenticated]
+    upload_candidature_kwarg = 'candidature_id'
     
     def put(self, request, candidature_id):
         """Mettre à jour une candidature"""
@@ -254,12 +261,7 @@ class CandidateCategoriesView(APIView):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        categories = Category.objects.filter(
-            is_active=True
-        ).select_related('category_class').order_by('category_class__order', 'name')
-        
-        serializer = CategorySerializer(categories, many=True)
-        return Response(serializer.data)
+        return Response(CandidateDashboardService.get_active_categories())
 
 
 class PasswordChangeView(APIView):
@@ -297,20 +299,10 @@ class CandidateStatsView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        candidatures = Candidature.objects.filter(candidate=profile.user)
-        
-        # Dernière candidature
-        last_candidature = candidatures.order_by('-submitted_at').first()
-        last_activity = last_candidature.submitted_at if last_candidature else None
-        
         stats = {
-            'total_candidatures': candidatures.count(),
-            'pending_candidatures': candidatures.filter(status='pending').count(),
-            'approved_candidatures': candidatures.filter(status='approved').count(),
-            'rejected_candidatures': candidatures.filter(status='rejected').count(),
-            'categories_available': Category.objects.filter(is_active=True).count(),
+            **CandidateDashboardService.get_candidature_stats(request.user),
+            'categories_available': len(CandidateDashboardService.get_active_categories()),
             'profile_completion': self._calculate_profile_completion(profile),
-            'last_activity': last_activity
         }
         
         return Response(stats)
@@ -1,22 +1,29 @@
 """
 Module pour la gestion des envois d'emails
+
+Les emails sont mis en file d'attente (app mailer) et envoyés par le worker :
+la requête n'attend pas le serveur SMTP.
 """
-from django.core.mail import send_mail
 from django.template.loader import render_to_string
 from django.conf import settings
 from django.utils.html import strip_tags
 
+from mailer.services import MailService
+
+# Les codes OTP passent avant les autres emails en attente
+OTP_PRIORITY = 10
+
 
 def send_otp_email(user, otp_code):
     """
-    Envoie un email avec le code OTP pour la vérification de l'email
+    Met en file d'attente un email avec le code OTP pour la vérification de l'email
     
     Args:
         user: Instance de User
         otp_code: Code OTP à 6 chiffres
     
     Returns:
-        bool: True si l'email a été envoyé avec succès, False sinon
+        bool: True si l'email a été mis en file d'attente, False sinon
     """
     try:
         subject = "Code de vérification - Makona Awards 2025"
@@ -35,21 +42,21 @@ Cordialement,
 L'équipe Makona Awards
         """
         
-        # Envoyer l'email
+        # Mettre l'email en file d'attente
         from_email = getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@makonaawards.com')
         
-        send_mail(
+        MailService.queue(
+            to=user.email,
             subject=subject,
-            message=strip_tags(message),
+            body=strip_tags(message),
             from_email=from_email,
-            recipient_list=[user.email],
-            fail_silently=False,
+            priority=OTP_PRIORITY,
         )
         
         return True
         
     except Exception as e:
-        print(f"Erreur lors de l'envoi de l'email OTP: {str(e)}")
+        print(f"Erreur lors de la mise en file de l'email OTP: {str(e)}")
         # En développement, on peut logger l'erreur sans faire échouer
         # En production, vous pourriez vouloir utiliser un service de logging
         return False
@@ -57,13 +64,13 @@ L'équipe Makona Awards
 
 def send_welcome_email(user):
     """
-    Envoie un email de bienvenue après vérification de l'email
+    Met en file d'attente un email de bienvenue après vérification de l'email
     
     Args:
         user: Instance de User
     
     Returns:
-        bool: True si l'email a été envoyé avec succès, False sinon
+        bool: True si l'email a été mis en file d'attente, False sinon
     """
     try:
         subject = "Bienvenue sur Makona Awards 2025"
@@ -83,17 +90,16 @@ L'équipe Makona Awards
         
         from_email = getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@makonaawards.com')
         
-        send_mail(
+        MailService.queue(
+            to=user.email,
             subject=subject,
-            message=strip_tags(message),
+            body=strip_tags(message),
             from_email=from_email,
-            recipient_list=[user.email],
-            fail_silently=False,
         )
         
         return True
         
     except Exception as e:
-        print(f"Erreur lors de l'envoi de l'email de bienvenue: {str(e)}")
+        print(f"Erreur lors de la mise en file de l'email de bienvenue: {str(e)}")
         return False
 
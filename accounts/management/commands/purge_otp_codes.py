@@ -0,0 +1,25 @@
+"""
+Commande Django pour supprimer les codes OTP utilisés ou expirés
+Usage: python manage.py purge_otp_codes [--batch-size N]
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from accounts.services import OTPService
+
+
+class Command(BaseCommand):
+    help = 'Supprimer par lots les codes OTP utilisés ou expirés'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.OTP_PURGE_BATCH_SIZE,
+            help='Nombre de codes supprimés par requête (défaut: %(default)s)',
+        )
+
+    def handle(self, *args, **options):
+        deleted = OTPService.purge(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'✅ {deleted} codes OTP supprimés'))
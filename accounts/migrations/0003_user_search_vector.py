@@ -0,0 +1,53 @@
+# Generated by Django 5.2.7 on 2026-10-19 17:46
+
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+TRIGRAM_FIELDS = ['first_name', 'last_name', 'email', 'username']
+
+
+def create_search_indexes(apps, schema_editor):
+    """Index GIN (vecteur + trigrammes) et remplissage initial, PostgreSQL uniquement"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS accounts_user_search_vector_gin "
+        "ON accounts_user USING gin (search_vector)"
+    )
+    for field in TRIGRAM_FIELDS:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS accounts_user_{field}_trgm "
+            f"ON accounts_user USING gin (UPPER({field}::text) gin_trgm_ops)"
+        )
+    schema_editor.execute(
+        "UPDATE accounts_user SET search_vector = "
+        "setweight(to_tsvector('simple', coalesce(first_name, '') || ' ' || coalesce(last_name, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(email, '') || ' ' || coalesce(username, '')), 'B')"
+    )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS accounts_user_search_vector_gin")
+    for field in TRIGRAM_FIELDS:
+        schema_editor.execute(f"DROP INDEX IF EXISTS accounts_user_{field}_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_user_profile_picture'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='user',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True, verbose_name='Vecteur de recherche'),
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
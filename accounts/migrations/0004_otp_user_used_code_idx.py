@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-19 18:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_user_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='onetimepassword',
+            index=models.Index(fields=['user', 'is_used', 'code'], name='otp_user_used_code_idx'),
+        ),
+    ]
@@ -4,6 +4,7 @@ Modèles pour l'app accounts
 import uuid
 import hashlib
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.core.validators import RegexValidator
 
@@ -58,6 +59,11 @@ class User(AbstractUser):
     )
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Date de création")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Date de modification")
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        verbose_name="Vecteur de recherche"
+    )
     
     # Configuration
     USERNAME_FIELD = 'email'
@@ -79,6 +85,15 @@ class User(AbstractUser):
     
     def is_admin(self):
         return self.user_type == 'admin'
+    
+    def get_search_document(self):
+        """
+        Retourne les textes indexés (texte, poids) pour la recherche plein texte
+        """
+        return [
+            (self.get_full_name(), 'A'),
+            (f"{self.email} {self.username}", 'B'),
+        ]
 
 
 class CandidateProfile(models.Model):
@@ -203,6 +218,10 @@ class OneTimePassword(models.Model):
         verbose_name = "Code OTP"
         verbose_name_plural = "Codes OTP"
         ordering = ['-created_at']
+        indexes = [
+            # Invalidation (user, is_used) et vérification (user, is_used, code)
+            models.Index(fields=['user', 'is_used', 'code'], name='otp_user_used_code_idx'),
+        ]
     
     def __str__(self):
         return f"OTP {self.code} pour {self.user.email}"
@@ -2,6 +2,9 @@
 Serializers pour l'app accounts
 """
 from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer as BaseTokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
 from django.contrib.auth import authenticate
 from django.contrib.auth.password_validation import validate_password
 from django.utils import timezone
@@ -9,7 +12,8 @@ from datetime import timedelta
 import random
 import string
 
-from .models import User, CandidateProfile, DeviceFingerprint, OneTimePassword
+from .authentication import set_user_claims
+from .models import User, CandidateProfile, DeviceFingerprint
 
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
@@ -62,10 +66,9 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         
         # Créer et envoyer le code OTP après la création
         from .services import OTPService
-        from .mailing.mail import send_otp_email
         
         otp = OTPService.create_otp(user)
-        send_otp_email(user, otp.code)
+        OTPService.queue_otp_email(otp)
         
         return user
 
@@ -162,10 +165,14 @@ class DeviceFingerprintCreateSerializer(serializers.Serializer):
     language = serializers.CharField()
     
     def create(self, validated_data):
+        """
+        Retourne {'id', 'fingerprint_hash', 'created'} (lecture en cache pour un device connu)
+        """
+        from .services import DeviceFingerprintService
         request = self.context['request']
         ip_address = self.get_client_ip(request)
         
-        fingerprint, created = DeviceFingerprint.get_or_create_fingerprint(
+        fingerprint_id, fingerprint_hash, created = DeviceFingerprintService.resolve_fingerprint(
             user_agent=validated_data['user_agent'],
             screen_resolution=validated_data['screen_resolution'],
             timezone=validated_data['timezone'],
@@ -173,7 +180,7 @@ class DeviceFingerprintCreateSerializer(serializers.Serializer):
             ip_address=ip_address
         )
         
-        return fingerprint
+        return {'id': fingerprint_id, 'fingerprint_hash': fingerprint_hash, 'created': created}
     
     def get_client_ip(self, request):
         x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
@@ -208,29 +215,12 @@ class OTPVerifySerializer(serializers.Serializer):
     code = serializers.CharField(max_length=6, min_length=6)
     
     def validate(self, attrs):
-        email = attrs['email']
-        code = attrs['code']
-        
+        # Le code est vérifié et consommé par OTPService.verify_otp (un seul
+        # UPDATE conditionnel) : seul l'utilisateur est chargé ici
         try:
-            user = User.objects.get(email=email)
-            otp = OneTimePassword.objects.filter(
-                user=user,
-                code=code,
-                is_used=False
-            ).order_by('-created_at').first()
-            
-            if not otp:
-                raise serializers.ValidationError("Code OTP invalide.")
-            
-            if otp.is_expired():
-                raise serializers.ValidationError("Le code OTP a expiré.")
-            
-            attrs['user'] = user
-            attrs['otp'] = otp
-            
+            attrs['user'] = User.objects.get(email=attrs['email'])
         except User.DoesNotExist:
             raise serializers.ValidationError("Utilisateur non trouvé.")
-        
         return attrs
 
 
@@ -280,3 +270,34 @@ class PasswordChangeSerializer(serializers.Serializer):
             raise serializers.ValidationError("Ancien mot de passe incorrect.")
         return value
 
+
+class TokenRefreshSerializer(BaseTokenRefreshSerializer):
+    """
+    Serializer pour rafraîchir les jetons JWT
+    Les claims de l'utilisateur (type, vérification) sont relus en base, et
+    l'ancien jeton de rafraîchissement est révoqué s'il y a rotation.
+    """
+    
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        
+        user = User.objects.filter(pk=refresh.get(api_settings.USER_ID_CLAIM)).first()
+        if user is None or not user.is_active:
+            raise AuthenticationFailed(
+                self.error_messages['no_active_account'],
+                'no_active_account'
+            )
+        set_user_claims(refresh, user)
+        
+        data = {'access': str(refresh.access_token)}
+        
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+            data['refresh'] = str(refresh)
+        
+        return data
@@ -1,15 +1,31 @@
 """
 Services pour l'app accounts
 """
+import atexit
+import logging
 import random
 import string
+import threading
+import time
+from django.core.cache import cache
 from django.core.mail import send_mail
 from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Case, Count, DateTimeField, F, Max, Q, Value, When
+from django.db.models.functions import Greatest
 from django.utils import timezone
 from datetime import timedelta
 
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from config.search import is_postgres
+from .authentication import ClaimsRefreshToken
 from .models import OneTimePassword
 
+logger = logging.getLogger(__name__)
+
 
 class OTPService:
     """
@@ -49,38 +65,65 @@ class OTPService:
     @staticmethod
     def send_otp_email(user, otp_code):
         """
-        Envoie le code OTP par email
+        Met le code OTP en file d'attente d'envoi par email
         Utilise le module mailing/mail.py
         """
         from .mailing.mail import send_otp_email as send_email
         return send_email(user, otp_code)
     
+    @staticmethod
+    def queue_otp_email(otp):
+        """
+        Met l'envoi du code OTP en file d'attente (envoyé par le worker)
+        """
+        return OTPService.send_otp_email(otp.user, otp.code)
+    
     @staticmethod
     def verify_otp(user, code):
         """
         Vérifie un code OTP
+        
+        Le code est marqué utilisé par un UPDATE conditionnel : deux
+        vérifications simultanées du même code ne peuvent pas réussir toutes
+        les deux.
         """
         try:
-            otp = OneTimePassword.objects.filter(
+            codes = OneTimePassword.objects.filter(
                 user=user,
                 code=code,
                 is_used=False
-            ).order_by('-created_at').first()
+            )
             
-            if not otp:
-                return False, "Code OTP invalide"
+            if codes.filter(expires_at__gt=timezone.now()).update(is_used=True):
+                return True, "Code OTP valide"
             
-            if otp.is_expired():
+            if codes.exists():
                 return False, "Le code OTP a expiré"
             
-            # Marquer le code comme utilisé
-            otp.is_used = True
-            otp.save()
-            
-            return True, "Code OTP valide"
+            return False, "Code OTP invalide"
             
         except Exception as e:
             return False, f"Erreur de vérification: {str(e)}"
+    
+    @staticmethod
+    def purge(batch_size=None):
+        """
+        Supprime les codes OTP utilisés ou expirés, par lots
+        Retourne le nombre de codes supprimés.
+        """
+        batch_size = batch_size or settings.OTP_PURGE_BATCH_SIZE
+        deleted = 0
+        while True:
+            now = timezone.now()
+            stale = Q(is_used=True) | Q(expires_at__lt=now)
+            ids = list(
+                OneTimePassword.objects.filter(stale).values_list('pk', flat=True)[:batch_size]
+            )
+            if not ids:
+                return deleted
+            deleted += OneTimePassword.objects.filter(stale, pk__in=ids).delete()[0]
+            if len(ids) < batch_size:
+                return deleted
 
 
 class UserService:
@@ -143,6 +186,48 @@ class UserService:
         return stats
 
 
+class TokenService:
+    """
+    Service pour les jetons JWT (accès et rafraîchissement)
+    """
+    
+    @staticmethod
+    def issue(user):
+        """
+        Émet une paire de jetons pour un utilisateur
+        """
+        refresh = ClaimsRefreshToken.for_user(user)
+        return {
+            'access': str(refresh.access_token),
+            'refresh': str(refresh),
+        }
+    
+    @staticmethod
+    def revoke(refresh):
+        """
+        Révoque un jeton de rafraîchissement (ValueError s'il est invalide)
+        """
+        try:
+            RefreshToken(refresh).blacklist()
+        except TokenError as e:
+            raise ValueError(str(e))
+    
+    @staticmethod
+    def revoke_all(user):
+        """
+        Révoque tous les jetons de rafraîchissement encore valides d'un utilisateur
+        """
+        tokens = OutstandingToken.objects.filter(
+            user=user,
+            expires_at__gt=timezone.now(),
+            blacklistedtoken__isnull=True
+        )
+        BlacklistedToken.objects.bulk_create(
+            [BlacklistedToken(token=token) for token in tokens],
+            ignore_conflicts=True
+        )
+
+
 class DeviceFingerprintService:
     """
     Service pour la gestion des fingerprints de devices
@@ -168,6 +253,83 @@ class DeviceFingerprintService:
             user_agent, screen_resolution, timezone, language, ip_address
         )
     
+    @staticmethod
+    def _cache_key(fingerprint_hash):
+        return f'fingerprint:{fingerprint_hash}'
+    
+    @staticmethod
+    def resolve_fingerprint(user_agent, screen_resolution, timezone, language, ip_address):
+        """
+        Retourne (id, hash, créé) du fingerprint d'un device, créé au besoin
+        
+        La correspondance hash → id est en cache : un device connu ne coûte
+        aucune requête, et sa date d'utilisation passe par LastUsedBuffer.
+        Le cache doit être partagé entre les processus (obligatoire hors
+        DEBUG) : la suppression d'un fingerprint retire son entrée pour tous.
+        Un fingerprint créé n'y est ajouté qu'après la validation de la
+        transaction, pour ne jamais renvoyer l'id d'une ligne annulée.
+        """
+        from .models import DeviceFingerprint
+        fingerprint_hash = DeviceFingerprint.generate_fingerprint_hash(
+            user_agent, screen_resolution, timezone, language
+        )
+        cache_key = DeviceFingerprintService._cache_key(fingerprint_hash)
+        
+        created = False
+        fingerprint_id = cache.get(cache_key)
+        if fingerprint_id is None:
+            fingerprint, created = DeviceFingerprint.get_or_create_fingerprint(
+                user_agent, screen_resolution, timezone, language, ip_address
+            )
+            fingerprint_id = fingerprint.pk
+            transaction.on_commit(
+                lambda: cache.set(cache_key, fingerprint_id, timeout=settings.FINGERPRINT_CACHE_TTL)
+            )
+        
+        if not created:
+            LastUsedBuffer.touch(fingerprint_id)
+        return fingerprint_id, fingerprint_hash, created
+    
+    @staticmethod
+    def invalidate(fingerprint_hash):
+        """
+        Retire un fingerprint du cache de correspondance
+        """
+        cache.delete(DeviceFingerprintService._cache_key(fingerprint_hash))
+    
+    @staticmethod
+    def bulk_touch(last_used):
+        """
+        Enregistre les dates d'utilisation {id: date} en un seul UPDATE
+        Une date n'est jamais reculée (tampons de plusieurs processus).
+        """
+        from .models import DeviceFingerprint
+        if not last_used:
+            return 0
+        
+        if is_postgres():
+            table = connection.ops.quote_name(DeviceFingerprint._meta.db_table)
+            values = ', '.join(['(%s, %s::timestamptz)'] * len(last_used))
+            params = [param for item in last_used.items() for param in item]
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'UPDATE {table} AS f SET last_used = v.last_used '
+                    f'FROM (VALUES {values}) AS v(id, last_used) '
+                    f'WHERE f.id = v.id AND f.last_used < v.last_used',
+                    params
+                )
+                return cursor.rowcount
+        
+        return DeviceFingerprint.objects.filter(pk__in=list(last_used)).update(
+            last_used=Greatest(
+                F('last_used'),
+                Case(
+                    *[When(pk=pk, then=Value(when)) for pk, when in last_used.items()],
+                    output_field=DateTimeField()
+                )
+            )
+        )
+    
     @staticmethod
     def get_client_ip(request):
         """
@@ -191,3 +353,142 @@ class DeviceFingerprintService:
             category=category,
             is_valid=True
         ).exists()
+
+
+class LastUsedBuffer:
+    """
+    Tampon des dates d'utilisation des fingerprints (un par processus)
+    
+    Chaque utilisation est notée en mémoire ; le tampon est écrit en un seul
+    UPDATE toutes les FINGERPRINT_TOUCH_FLUSH_INTERVAL secondes ou dès
+    FINGERPRINT_TOUCH_BATCH_SIZE devices, au lieu d'une écriture par requête
+    sur des lignes très sollicitées. Une perte du tampon (arrêt brutal) ne
+    fait que retarder `last_used`.
+    """
+    pending = {}
+    lock = threading.Lock()
+    flushed_at = time.monotonic()
+    
+    @classmethod
+    def touch(cls, fingerprint_id, when=None):
+        """
+        Note l'utilisation d'un fingerprint ; écrit le tampon s'il est dû
+        """
+        with cls.lock:
+            cls.pending[fingerprint_id] = when or timezone.now()
+            due = (
+                len(cls.pending) >= settings.FINGERPRINT_TOUCH_BATCH_SIZE or
+                time.monotonic() - cls.flushed_at >= settings.FINGERPRINT_TOUCH_FLUSH_INTERVAL
+            )
+        if due:
+            cls.flush()
+    
+    @classmethod
+    def flush(cls):
+        """
+        Écrit les dates en attente ; retourne le nombre de devices concernés
+        """
+        with cls.lock:
+            pending, cls.pending = cls.pending, {}
+            cls.flushed_at = time.monotonic()
+        try:
+            DeviceFingerprintService.bulk_touch(pending)
+        except Exception:
+            logger.exception("Échec de l'écriture de %s dates d'utilisation de fingerprints", len(pending))
+        return len(pending)
+
+
+atexit.register(LastUsedBuffer.flush)
+
+
+class CandidateDashboardService:
+    """
+    Service pour les données du dashboard candidat
+
+    Les compteurs de candidatures sont calculés en une seule requête agrégée
+    et mis en cache par utilisateur ; la liste des catégories actives est
+    partagée entre tous les candidats. Les caches sont invalidés par signaux,
+    d'où le cache partagé exigé en production (voir CACHES).
+    """
+    CATEGORIES_CACHE_KEY = 'candidate:categories'
+    
+    @staticmethod
+    def _user_cache_key(user_id, part):
+        return f'candidate:{user_id}:{part}'
+    
+    @staticmethod
+    def get_candidature_stats(user):
+        """
+        Retourne les compteurs de candidatures d'un candidat (une requête)
+        """
+        from candidates.models import Candidature
+        
+        def compute():
+            return Candidature.objects.filter(candidate=user).aggregate(
+                total_candidatures=Count('id'),
+                pending_candidatures=Count('id', filter=Q(status='pending')),
+                approved_candidatures=Count('id', filter=Q(status='approved')),
+                rejected_candidatures=Count('id', filter=Q(status='rejected')),
+                last_activity=Max('submitted_at'),
+            )
+        
+        return cache.get_or_set(
+            CandidateDashboardService._user_cache_key(user.id, 'stats'),
+            compute,
+            timeout=settings.CANDIDATE_DASHBOARD_CACHE_TTL
+        )
+    
+    @staticmethod
+    def get_cached_dashboard(user):
+        """
+        Retourne la partie du dashboard propre au candidat (None si absente)
+        """
+        return cache.get(CandidateDashboardService._user_cache_key(user.id, 'dashboard'))
+    
+    @staticmethod
+    def set_cached_dashboard(user, data):
+        """
+        Met en cache la partie du dashboard propre au candidat
+        """
+        cache.set(
+            CandidateDashboardService._user_cache_key(user.id, 'dashboard'),
+            data,
+            timeout=settings.CANDIDATE_DASHBOARD_CACHE_TTL
+        )
+    
+    @staticmethod
+    def get_active_categories():
+        """
+        Retourne la liste sérialisée des catégories actives (partagée)
+        """
+        from categories.models import Category
+        from .candidate_serializers import CategorySerializer
+        
+        def compute():
+            categories = Category.objects.filter(
+                is_active=True
+            ).select_related('category_class').order_by('category_class__order', 'name')
+            return [dict(item) for item in CategorySerializer(categories, many=True).data]
+        
+        return cache.get_or_set(
+            CandidateDashboardService.CATEGORIES_CACHE_KEY,
+            compute,
+            timeout=settings.CANDIDATE_CATEGORIES_CACHE_TTL
+        )
+    
+    @staticmethod
+    def invalidate_user(user_id):
+        """
+        Invalide les données en cache d'un candidat
+        """
+        cache.delete_many([
+            CandidateDashboardService._user_cache_key(user_id, 'stats'),
+            CandidateDashboardService._user_cache_key(user_id, 'dashboard'),
+        ])
+    
+    @staticmethod
+    def invalidate_categories():
+        """
+        Invalide la liste partagée des catégories actives
+        """
+        cache.delete(CandidateDashboardService.CATEGORIES_CACHE_KEY)
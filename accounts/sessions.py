@@ -0,0 +1,126 @@
+"""
+Moteur de sessions lu depuis le cache et écrit en base (write-through)
+
+    SESSION_ENGINE = 'accounts.sessions'
+
+La base reste la référence : le cache évite la lecture de `django_session`
+à chaque requête authentifiée par session. Une session n'est réécrite
+(base et cache) que si ses données ont changé, ou si son expiration doit
+avancer de plus de SESSION_SAVE_INTERVAL secondes : une session marquée
+modifiée sans changement réel ne coûte plus d'écriture.
+
+Le cache doit être partagé entre les processus (Redis, Memcached) : avec
+un cache propre à chaque processus (LocMemCache, valeur par défaut), une
+session modifiée ailleurs y resterait périmée, et les lectures se font
+donc en base.
+"""
+import logging
+
+from django.conf import settings
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+from django.core.cache.backends.locmem import LocMemCache
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'accounts.sessions'
+
+
+class SessionStore(CachedDBStore):
+    """
+    Session en cache (données et date d'expiration), écrite en base
+    uniquement quand elle change
+    """
+    cache_key_prefix = KEY_PREFIX
+
+    def __init__(self, session_key=None):
+        super().__init__(session_key)
+        self._shared_cache = not isinstance(self._cache, LocMemCache)
+        # (données sérialisées, date d'expiration) telles qu'enregistrées
+        self._stored = None
+
+    def _dumps(self, data):
+        return self.serializer().dumps(data)
+
+    def _cache_set(self, data, expire_date):
+        if not self._shared_cache:
+            return
+        try:
+            self._cache.set(self.cache_key, (data, expire_date), self.get_expiry_age(expiry=expire_date))
+        except Exception:
+            logger.exception("Échec de l'écriture de la session en cache (%s)", self._cache)
+
+    def load(self):
+        cached = None
+        if self._shared_cache:
+            try:
+                cached = self._cache.get(self.cache_key)
+            except Exception:
+                # Clé refusée ou cache indisponible : lecture en base
+                cached = None
+
+        if cached is not None:
+            data, expire_date = cached
+        else:
+            s = self._get_session_from_db()
+            if s is None:
+                self._stored = None
+                return {}
+            data, expire_date = self.decode(s.session_data), s.expire_date
+            self._cache_set(data, expire_date)
+
+        self._stored = (self._dumps(data), expire_date)
+        return data
+
+    def _unchanged(self):
+        """
+        Indique si la version enregistrée est à jour (données et expiration)
+        """
+        if self._stored is None:
+            return False
+        dumped, expire_date = self._stored
+        if self._dumps(self._get_session()) != dumped:
+            return False
+        delta = self.get_expiry_date() - expire_date
+        return delta.total_seconds() < settings.SESSION_SAVE_INTERVAL
+
+    def save(self, must_create=False):
+        if self.session_key is None:
+            return self.create()
+        if not must_create and self._unchanged():
+            return
+
+        super(CachedDBStore, self).save(must_create)
+        data = self._get_session(no_load=must_create)
+        expire_date = self.get_expiry_date()
+        self._stored = (self._dumps(data), expire_date)
+        self._cache_set(data, expire_date)
+
+    def delete(self, session_key=None):
+        if session_key is None or session_key == self.session_key:
+            self._stored = None
+        super().delete(session_key)
+
+    @classmethod
+    def clear_expired(cls, batch_size=None):
+        """
+        Supprime les sessions expirées par lots de SESSION_PURGE_BATCH_SIZE
+        (une seule grosse suppression verrouillerait la table)
+
+        Retourne le nombre de sessions supprimées. Les entrées du cache
+        expirent d'elles-mêmes.
+        """
+        batch_size = batch_size or settings.SESSION_PURGE_BATCH_SIZE
+        model = cls.get_model_class()
+        deleted = 0
+        while True:
+            now = timezone.now()
+            keys = list(
+                model.objects.filter(expire_date__lt=now)
+                .values_list('session_key', flat=True)[:batch_size]
+            )
+            if not keys:
+                return deleted
+            deleted += model.objects.filter(session_key__in=keys, expire_date__lt=now).delete()[0]
+            if len(keys) < batch_size:
+                return deleted
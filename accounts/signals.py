@@ -0,0 +1,63 @@
+"""
+Signaux pour l'app accounts
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from candidates.models import Candidature, CandidatureFile
+from categories.models import Category, CategoryClass
+from config.search import refresh_search_vector, search_fields_changed
+from .models import CandidateProfile, DeviceFingerprint, User
+from .services import CandidateDashboardService, DeviceFingerprintService
+
+# Champs de l'utilisateur repris dans les documents de recherche
+USER_SEARCH_FIELDS = frozenset({'first_name', 'last_name', 'email', 'username'})
+
+
+@receiver(post_save, sender=User)
+def update_user_search_vector(sender, instance, update_fields=None, **kwargs):
+    """Maintient le vecteur de recherche de l'utilisateur à jour"""
+    # `update_last_login` et les autres sauvegardes partielles n'y touchent pas
+    if search_fields_changed(update_fields, USER_SEARCH_FIELDS):
+        refresh_search_vector(instance)
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user_dashboard(sender, instance, **kwargs):
+    """Invalide le dashboard en cache du candidat modifié"""
+    CandidateDashboardService.invalidate_user(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=CandidateProfile)
+def invalidate_profile_dashboard(sender, instance, **kwargs):
+    """Invalide le dashboard en cache du candidat dont le profil a changé"""
+    CandidateDashboardService.invalidate_user(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=Candidature)
+def invalidate_candidature_dashboard(sender, instance, **kwargs):
+    """Invalide le dashboard en cache de l'auteur de la candidature"""
+    CandidateDashboardService.invalidate_user(instance.candidate_id)
+
+
+@receiver([post_save, post_delete], sender=CandidatureFile)
+def invalidate_candidature_file_dashboard(sender, instance, **kwargs):
+    """Invalide le dashboard en cache du candidat propriétaire du fichier"""
+    candidate_id = Candidature.objects.filter(
+        pk=instance.candidature_id
+    ).values_list('candidate_id', flat=True).first()
+    if candidate_id:
+        CandidateDashboardService.invalidate_user(candidate_id)
+
+
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=CategoryClass)
+def invalidate_active_categories(sender, **kwargs):
+    """Invalide la liste des catégories actives partagée"""
+    CandidateDashboardService.invalidate_categories()
+
+
+@receiver(post_delete, sender=DeviceFingerprint)
+def invalidate_fingerprint(sender, instance, **kwargs):
+    """Retire le fingerprint supprimé du cache hash → id"""
+    DeviceFingerprintService.invalidate(instance.fingerprint_hash)
@@ -0,0 +1,21 @@
+"""
+Tâches en arrière-plan de l'app accounts
+"""
+from django.conf import settings
+
+from jobs.registry import task
+
+from .services import OTPService
+from .sessions import SessionStore
+
+
+@task(priority=-10, every=settings.SESSION_PURGE_INTERVAL)
+def clear_expired_sessions():
+    """Supprime les sessions expirées par lots (tâche périodique)"""
+    SessionStore.clear_expired()
+
+
+@task(priority=-10, every=settings.OTP_PURGE_INTERVAL)
+def purge_otp_codes():
+    """Supprime les codes OTP utilisés ou expirés par lots (tâche périodique)"""
+    OTPService.purge()
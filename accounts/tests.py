@@ -1,3 +1,466 @@
-from django.test import TestCase
+import tempfile
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.contrib.auth.models import update_last_login
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from candidates.models import Candidature
+from categories.models import Category
+from config.search import RankedSearchFilter, _search_postgres, is_postgres, search_queryset
+from .authentication import ClaimsJWTAuthentication, ClaimsUser
+from .models import DeviceFingerprint, OneTimePassword, User
+from .permissions import IsAdminUser, IsCandidateUser, IsVerifiedUser
+from .services import (
+    CandidateDashboardService, DeviceFingerprintService, LastUsedBuffer, OTPService, TokenService
+)
+from .sessions import SessionStore
+
+
+class JWTAuthenticationTest(TestCase):
+    """
+    Les permissions se vérifient sur les claims du jeton sans requête ;
+    le rafraîchissement relit l'utilisateur et révoque l'ancien jeton.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email='mariama@example.com', username='mariama', password='Secret-123',
+            first_name='Mariama', last_name='Bah', user_type='candidate', is_verified=True
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def authenticate(self, access):
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {access}')
+        user, _ = ClaimsJWTAuthentication().authenticate(request)
+        request.user = user
+        return request
+
+    def test_login_returns_tokens(self):
+        response = self.client.post(
+            '/api/auth/login/', {'email': 'mariama@example.com', 'password': 'Secret-123'}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('access', response.data)
+        self.assertIn('refresh', response.data)
+
+    def test_permissions_without_queries(self):
+        request = self.authenticate(TokenService.issue(self.user)['access'])
+        with self.assertNumQueries(0):
+            self.assertIsInstance(request.user, ClaimsUser)
+            self.assertEqual(request.user.pk, self.user.pk)
+            self.assertTrue(IsCandidateUser().has_permission(request, None))
+            self.assertTrue(IsVerifiedUser().has_permission(request, None))
+            self.assertFalse(IsAdminUser().has_permission(request, None))
+
+    def test_user_loaded_on_demand(self):
+        request = self.authenticate(TokenService.issue(self.user)['access'])
+        with self.assertNumQueries(1):
+            self.assertEqual(request.user.email, 'mariama@example.com')
+        self.assertEqual(User.objects.get(pk=request.user.pk), request.user)
+
+    def test_bearer_request(self):
+        access = TokenService.issue(self.user)['access']
+        response = self.client.get('/api/auth/profile/', HTTP_AUTHORIZATION=f'Bearer {access}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['email'], 'mariama@example.com')
+
+    def test_refresh_rotation_and_claims(self):
+        refresh = TokenService.issue(self.user)['refresh']
+        User.objects.filter(pk=self.user.pk).update(user_type='admin')
+
+        response = self.client.post('/api/auth/token/refresh/', {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.data['refresh'], refresh)
+        request = self.authenticate(response.data['access'])
+        self.assertTrue(IsAdminUser().has_permission(request, None))
+
+        # L'ancien jeton de rafraîchissement est révoqué
+        response = self.client.post('/api/auth/token/refresh/', {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, 401)
+
+    def test_refresh_rejected_for_inactive_user(self):
+        refresh = TokenService.issue(self.user)['refresh']
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        response = self.client.post('/api/auth/token/refresh/', {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, 401)
+
+    def test_logout_revokes_refresh_token(self):
+        tokens = TokenService.issue(self.user)
+        response = self.client.post(
+            '/api/auth/logout/', {'refresh': tokens['refresh']}, format='json',
+            HTTP_AUTHORIZATION=f'Bearer {tokens["access"]}'
+        )
+        self.assertEqual(response.status_code, 200)
+        response = self.client.post('/api/auth/token/refresh/', {'refresh': tokens['refresh']}, format='json')
+        self.assertEqual(response.status_code, 401)
+
+    def test_password_change_revokes_all(self):
+        TokenService.issue(self.user)
+        tokens = TokenService.issue(self.user)
+        response = self.client.post('/api/auth/password/change/', {
+            'old_password': 'Secret-123', 'new_password': 'Autre-Secret-456',
+            'new_password_confirm': 'Autre-Secret-456',
+        }, format='json', HTTP_AUTHORIZATION=f'Bearer {tokens["access"]}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(BlacklistedToken.objects.filter(token__user=self.user).count(), 2)
+        self.assertTrue(User.objects.get(pk=self.user.pk).check_password('Autre-Secret-456'))
+
+
+@override_settings(CACHES={'default': {
+    'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+    'LOCATION': tempfile.mkdtemp(prefix='makona-sessions-'),
+}})
+class SessionStoreTest(TestCase):
+    """
+    Les sessions sont lues depuis un cache partagé et réécrites seulement
+    quand leurs données changent.
+    """
+
+    def setUp(self):
+        self.session = SessionStore()
+        self.session['vote'] = 1
+        self.session.save()
+        self.key = self.session.session_key
+
+    def test_read_from_cache(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(SessionStore(self.key)['vote'], 1)
+
+    def test_unchanged_session_not_written(self):
+        session = SessionStore(self.key)
+        session['vote'] = 1
+        with self.assertNumQueries(0):
+            session.save()
+
+    def test_changed_session_written_through(self):
+        session = SessionStore(self.key)
+        session['vote'] = 2
+        session.save()
+        self.assertEqual(SessionStore().decode(Session.objects.get(pk=self.key).session_data), {'vote': 2})
+        self.assertEqual(SessionStore(self.key)['vote'], 2)
+
+    def test_expiry_refreshed_after_interval(self):
+        Session.objects.filter(pk=self.key).update(expire_date=timezone.now() + timezone.timedelta(hours=1))
+        session = SessionStore(self.key)
+        session._cache.clear()
+        self.assertEqual(session['vote'], 1)
+        session.save()
+        self.assertGreater(Session.objects.get(pk=self.key).expire_date, timezone.now() + timezone.timedelta(hours=23))
+
+    def test_deleted_session(self):
+        SessionStore(self.key).delete()
+        self.assertFalse(Session.objects.filter(pk=self.key).exists())
+        self.assertEqual(dict(SessionStore(self.key).items()), {})
+
+    def test_clear_expired_in_batches(self):
+        past = timezone.now() - timezone.timedelta(days=1)
+        Session.objects.bulk_create([
+            Session(session_key=f'expired{index:02d}', session_data='', expire_date=past)
+            for index in range(25)
+        ])
+        with self.assertNumQueries(6):
+            self.assertEqual(SessionStore.clear_expired(batch_size=10), 25)
+        self.assertEqual(list(Session.objects.values_list('pk', flat=True)), [self.key])
+
+
+class OTPServiceTest(TestCase):
+    """
+    Un code OTP est consommé par un seul UPDATE conditionnel ; les codes
+    utilisés ou expirés sont purgés.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email='ibrahima@example.com', username='ibrahima', password='x',
+            first_name='Ibrahima', last_name='Sow', user_type='candidate'
+        )
+
+    def test_verify_view_reads_code_once(self):
+        otp = OTPService.create_otp(self.user)
+        url = '/api/auth/otp/verify/'
+        with CaptureQueriesContext(connection) as queries:
+            response = APIClient().post(url, {'email': self.user.email, 'code': otp.code}, format='json')
+        self.assertEqual(response.status_code, 200)
+        otp_queries = [query for query in queries if 'accounts_onetimepassword' in query['sql']]
+        self.assertEqual(len(otp_queries), 1)
+
+        response = APIClient().post(url, {'email': self.user.email, 'code': otp.code}, format='json')
+        self.assertEqual((response.status_code, response.data['error']), (400, "Code OTP invalide"))
+
+    def test_code_used_once(self):
+        otp = OTPService.create_otp(self.user)
+        with self.assertNumQueries(1):
+            self.assertEqual(OTPService.verify_otp(self.user, otp.code), (True, "Code OTP valide"))
+        self.assertEqual(OTPService.verify_otp(self.user, otp.code), (False, "Code OTP invalide"))
+
+    def test_expired_code(self):
+        otp = OTPService.create_otp(self.user)
+        OneTimePassword.objects.filter(pk=otp.pk).update(expires_at=timezone.now())
+        self.assertEqual(OTPService.verify_otp(self.user, otp.code), (False, "Le code OTP a expiré"))
+
+    def test_new_code_invalidates_previous(self):
+        first = OTPService.create_otp(self.user)
+        second = OTPService.create_otp(self.user)
+        if first.code != second.code:
+            self.assertFalse(OTPService.verify_otp(self.user, first.code)[0])
+        self.assertTrue(OTPService.verify_otp(self.user, second.code)[0])
+
+    def test_purge(self):
+        OTPService.create_otp(self.user)
+        expired = OTPService.create_otp(self.user)
+        OneTimePassword.objects.filter(pk=expired.pk).update(expires_at=timezone.now())
+        valid = OTPService.create_otp(self.user)
+        self.assertEqual(OTPService.purge(batch_size=1), 2)
+        self.assertEqual(list(OneTimePassword.objects.values_list('pk', flat=True)), [valid.pk])
+
+
+class CandidateDashboardServiceTest(TestCase):
+    """
+    Les compteurs du candidat sont agrégés en une requête et mis en cache ;
+    un changement de statut ou de catégorie invalide les caches concernés.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.musique = Category.objects.create(name='Musique', description='d')
+        cls.danse = Category.objects.create(name='Danse', description='d', is_active=False)
+        cls.candidate = User.objects.create_user(
+            email='candidat@example.com', username='candidat', password='x', user_type='candidate'
+        )
+        cls.other = User.objects.create_user(
+            email='autre@example.com', username='autre', password='x', user_type='candidate'
+        )
+        cls.candidature = Candidature.objects.create(candidate=cls.candidate, category=cls.musique)
+        Candidature.objects.create(candidate=cls.candidate, category=cls.danse, status='rejected')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_stats_aggregated_once_then_cached(self):
+        with self.assertNumQueries(1):
+            stats = CandidateDashboardService.get_candidature_stats(self.candidate)
+        self.assertEqual(
+            (stats['total_candidatures'], stats['pending_candidatures'],
+             stats['approved_candidatures'], stats['rejected_candidatures']),
+            (2, 1, 0, 1)
+        )
+        self.assertIsNotNone(stats['last_activity'])
+        with self.assertNumQueries(0):
+            self.assertEqual(CandidateDashboardService.get_candidature_stats(self.candidate), stats)
+
+    def test_status_change_invalidates_candidate_cache(self):
+        CandidateDashboardService.get_candidature_stats(self.candidate)
+        CandidateDashboardService.set_cached_dashboard(self.candidate, {'cached': True})
+        CandidateDashboardService.get_candidature_stats(self.other)
+
+        self.candidature.status = 'approved'
+        self.candidature.save()
+
+        self.assertIsNone(CandidateDashboardService.get_cached_dashboard(self.candidate))
+        stats = CandidateDashboardService.get_candidature_stats(self.candidate)
+        self.assertEqual((stats['pending_candidatures'], stats['approved_candidatures']), (0, 1))
+        # Le cache des autres candidats est conservé
+        with self.assertNumQueries(0):
+            CandidateDashboardService.get_candidature_stats(self.other)
+
+    def test_category_edit_invalidates_category_list(self):
+        with self.assertNumQueries(1):
+            categories = CandidateDashboardService.get_active_categories()
+        self.assertEqual([category['name'] for category in categories], ['Musique'])
+        with self.assertNumQueries(0):
+            CandidateDashboardService.get_active_categories()
+
+        self.danse.is_active = True
+        self.danse.save()
+        self.musique.name = 'Musique urbaine'
+        self.musique.save()
+
+        categories = CandidateDashboardService.get_active_categories()
+        self.assertEqual([category['name'] for category in categories], ['Danse', 'Musique urbaine'])
+
+
+@override_settings(FINGERPRINT_TOUCH_FLUSH_INTERVAL=3600, FINGERPRINT_TOUCH_BATCH_SIZE=100)
+class DeviceFingerprintTest(TestCase):
+    """
+    Un device connu est résolu depuis le cache, et ses utilisations sont
+    écrites en un seul UPDATE groupé.
+    """
+    DEVICE = {
+        'user_agent': 'Mozilla/5.0', 'screen_resolution': '1920x1080',
+        'timezone': 'Africa/Conakry', 'language': 'fr',
+    }
+
+    def setUp(self):
+        cache.clear()
+        LastUsedBuffer.pending = {}
+        self.client = APIClient()
+
+    def tearDown(self):
+        # Rien ne doit rester à écrire à la sortie du processus de test
+        LastUsedBuffer.pending = {}
+
+    def post(self, **device):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post('/api/auth/device/fingerprint/', {**self.DEVICE, **device}, format='json')
+
+    def test_known_device_without_queries(self):
+        first = self.post()
+        self.assertEqual(first.status_code, 201)
+        with self.assertNumQueries(0):
+            second = self.post()
+        self.assertEqual(second.data['fingerprint_id'], first.data['fingerprint_id'])
+        self.assertEqual(second.data['fingerprint_hash'], first.data['fingerprint_hash'])
+        self.assertEqual(list(LastUsedBuffer.pending), [first.data['fingerprint_id']])
+
+    def test_flush_in_one_update(self):
+        ids = [self.post(language=f'l{index}').data['fingerprint_id'] for index in range(3)]
+        past = timezone.now() - timezone.timedelta(days=1)
+        DeviceFingerprint.objects.update(last_used=past)
+        now = timezone.now()
+        for fingerprint_id in ids:
+            LastUsedBuffer.touch(fingerprint_id, now)
+        with self.assertNumQueries(1):
+            self.assertEqual(LastUsedBuffer.flush(), 3)
+        self.assertEqual(set(DeviceFingerprint.objects.values_list('last_used', flat=True)), {now})
+
+    def test_last_used_never_moves_back(self):
+        fingerprint_id = self.post().data['fingerprint_id']
+        later = timezone.now() + timezone.timedelta(hours=1)
+        DeviceFingerprint.objects.filter(pk=fingerprint_id).update(last_used=later)
+        DeviceFingerprintService.bulk_touch({fingerprint_id: timezone.now()})
+        self.assertEqual(DeviceFingerprint.objects.get(pk=fingerprint_id).last_used, later)
+
+    def test_deleted_device_recreated(self):
+        first = self.post()
+        DeviceFingerprint.objects.get(pk=first.data['fingerprint_id']).delete()
+        second = self.post()
+        self.assertNotEqual(second.data['fingerprint_id'], first.data['fingerprint_id'])
+        self.assertTrue(DeviceFingerprint.objects.filter(pk=second.data['fingerprint_id']).exists())
+
+    def test_bulk_deleted_device_not_returned(self):
+        first = self.post()
+        DeviceFingerprint.objects.all().delete()
+        second = self.post()
+        self.assertTrue(DeviceFingerprint.objects.filter(pk=second.data['fingerprint_id']).exists())
+        self.assertNotEqual(second.data['fingerprint_id'], first.data['fingerprint_id'])
+
+    def test_rolled_back_device_not_cached(self):
+        device = [self.DEVICE[key] for key in ('user_agent', 'screen_resolution', 'timezone', 'language')]
+        with self.captureOnCommitCallbacks(execute=False):
+            try:
+                with transaction.atomic():
+                    DeviceFingerprintService.resolve_fingerprint(*device, '127.0.0.1')
+                    raise IntegrityError
+            except IntegrityError:
+                pass
+        fingerprint_id, _, created = DeviceFingerprintService.resolve_fingerprint(*device, '127.0.0.1')
+        self.assertTrue(created)
+        self.assertTrue(DeviceFingerprint.objects.filter(pk=fingerprint_id).exists())
+
+
+def where_lookups(node):
+    """(champ, lookup, valeur) des conditions d'une clause WHERE"""
+    for child in node.children:
+        if hasattr(child, 'children'):
+            yield from where_lookups(child)
+        elif hasattr(child.lhs, 'target'):
+            yield child.lhs.target.name, child.lookup_name, child.rhs
+
+
+class SearchTest(TestCase):
+    """
+    Recherche classée : repli `icontains` sur SQLite, plein texte et
+    trigrammes sur PostgreSQL ; les champs préfixés gardent le lookup DRF.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.awa = User.objects.create_user(
+            email='awa.diallo@example.com', username='awa', password='x',
+            first_name='Awa', last_name='Diallo', user_type='candidate'
+        )
+        cls.moussa = User.objects.create_user(
+            email='moussa@example.com', username='moussa', password='x',
+            first_name='Moussa', last_name='Kawa', user_type='candidate'
+        )
+
+    def search(self, search_fields, term):
+        view = type('View', (), {'search_fields': search_fields})()
+        request = Request(APIRequestFactory().get('/', {'search': term}))
+        return list(RankedSearchFilter().filter_queryset(request, User.objects.all(), view))
+
+    def test_fallback_ranks_prefix_matches_first(self):
+        results = list(search_queryset(User.objects.all(), 'awa', ['first_name', 'last_name']))
+        self.assertEqual(results, [self.awa, self.moussa])
+        self.assertGreater(results[0].search_rank, results[1].search_rank)
+
+    def test_all_terms_must_match(self):
+        results = search_queryset(User.objects.all(), 'awa diallo', ['first_name', 'last_name'])
+        self.assertEqual(list(results), [self.awa])
+
+    def test_prefixed_fields_keep_drf_lookup(self):
+        # `=email` reste une égalité : 'example.com' ne correspond à personne
+        self.assertEqual(self.search(['last_name', '=email'], 'example.com'), [])
+        self.assertEqual(self.search(['last_name', '=email'], 'moussa@example.com'), [self.moussa])
+        self.assertEqual(self.search(['^last_name'], 'kaw'), [self.moussa])
+        self.assertEqual(self.search(['^last_name'], 'awa'), [])
+
+    def test_postgres_query(self):
+        queryset = _search_postgres(
+            User.objects.all(), ['awa'], ['first_name'], 'search_vector', ['email__iexact']
+        )
+        sql = str(queryset.query)
+        self.assertIn('@@', sql)
+        self.assertIn('SIMILARITY', sql)
+        self.assertIn('ts_rank', sql)
+        # Lookup préfixé conservé tel quel (SQL propre à chaque base)
+        self.assertIn(('email', 'iexact', 'awa'), list(where_lookups(queryset.query.where)))
+
+    @skipUnless(is_postgres(), 'Recherche plein texte PostgreSQL')
+    def test_postgres_prefixed_lookup(self):
+        self.assertEqual(self.search(['last_name', '=email'], 'MOUSSA@example.com'), [self.moussa])
+        self.assertEqual(self.search(['last_name', '=email'], 'example.com'), [])
+
+    @skipUnless(is_postgres(), 'Recherche plein texte PostgreSQL')
+    def test_postgres_search(self):
+        results = list(search_queryset(
+            User.objects.all(), 'diallo', ['first_name', 'last_name'], vector_field='search_vector'
+        ))
+        self.assertEqual(results, [self.awa])
+
+    @mock.patch('accounts.signals.refresh_search_vector')
+    def test_partial_save_skips_user_vector(self, refresh):
+        update_last_login(None, self.awa)
+        self.awa.save(update_fields=['is_verified'])
+        refresh.assert_not_called()
+        self.awa.save(update_fields=['last_name'])
+        self.awa.save()
+        self.assertEqual(refresh.call_count, 2)
+
+    @mock.patch('candidates.signals.refresh_search_vector')
+    @mock.patch('candidates.signals.is_postgres', return_value=True)
+    def test_partial_save_skips_candidatures_vector(self, postgres, refresh):
+        category = Category.objects.create(name='Musique', description='d')
+        candidature = Candidature.objects.create(candidate=self.awa, category=category)
+        refresh.reset_mock()
+
+        update_last_login(None, self.awa)
+        candidature.save(update_fields=['status'])
+        category.save(update_fields=['description'])
+        refresh.assert_not_called()
+
+        self.awa.save(update_fields=['email'])
+        category.save()
+        self.assertEqual(refresh.call_count, 2)
@@ -12,6 +12,7 @@ urlpatterns = [
     path('register/', views.UserRegistrationView.as_view(), name='register'),
     path('login/', views.UserLoginView.as_view(), name='login'),
     path('logout/', views.LogoutView.as_view(), name='logout'),
+    path('token/refresh/', views.TokenRefreshView.as_view(), name='token_refresh'),
     
     # OTP
     path('otp/request/', views.OTPRequestView.as_view(), name='otp_request'),
@@ -5,6 +5,7 @@ from rest_framework import status, generics, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework_simplejwt.views import TokenRefreshView as BaseTokenRefreshView
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.hashers import make_password
 
@@ -13,13 +14,14 @@ from .serializers import (
     UserRegistrationSerializer, UserSerializer, CandidateProfileSerializer,
     CandidateProfileCreateSerializer, DeviceFingerprintSerializer,
     DeviceFingerprintCreateSerializer, OTPRequestSerializer,
-    OTPVerifySerializer, UserLoginSerializer, PasswordChangeSerializer
+    OTPVerifySerializer, UserLoginSerializer, PasswordChangeSerializer,
+    TokenRefreshSerializer
 )
 from .permissions import (
     IsAdminUser, IsCandidateUser, IsOwnerOrAdmin, IsVerifiedUser,
     IsPublicOrAuthenticated
 )
-from .services import OTPService, UserService, DeviceFingerprintService
+from .services import OTPService, UserService, DeviceFingerprintService, TokenService
 
 
 class UserRegistrationView(APIView):
@@ -108,7 +110,7 @@ class OTPRequestView(APIView):
             
             # Créer et envoyer un nouveau code OTP
             otp = OTPService.create_otp(user)
-            OTPService.send_otp_email(user, otp.code)
+            OTPService.queue_otp_email(otp)
             
             return Response({
                 'message': f'Un nouveau code de vérification a été envoyé à {email}'
@@ -143,7 +145,8 @@ class OTPVerifyView(APIView):
             
             return Response({
                 'message': 'Connexion réussie',
-                'user': UserSerializer(user).data
+                'user': UserSerializer(user).data,
+                **TokenService.issue(user)
             }, status=status.HTTP_200_OK)
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -166,7 +169,8 @@ class UserLoginView(APIView):
             
             return Response({
                 'message': 'Connexion réussie',
-                'user': UserSerializer(user).data
+                'user': UserSerializer(user).data,
+                **TokenService.issue(user)
             }, status=status.HTTP_200_OK)
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -223,8 +227,8 @@ class DeviceFingerprintView(APIView):
         if serializer.is_valid():
             fingerprint = serializer.save()
             return Response({
-                'fingerprint_id': fingerprint.id,
-                'fingerprint_hash': fingerprint.fingerprint_hash,
+                'fingerprint_id': fingerprint['id'],
+                'fingerprint_hash': fingerprint['fingerprint_hash'],
                 'message': 'Fingerprint créé avec succès'
             }, status=status.HTTP_201_CREATED)
         
@@ -249,6 +253,9 @@ class PasswordChangeView(APIView):
             user.set_password(serializer.validated_data['new_password'])
             user.save()
             
+            # Les jetons émis avec l'ancien mot de passe ne sont plus rafraîchissables
+            TokenService.revoke_all(user)
+            
             return Response({
                 'message': 'Mot de passe modifié avec succès'
             }, status=status.HTTP_200_OK)
@@ -275,6 +282,22 @@ class LogoutView(APIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def post(self, request):
+        # Révoquer le jeton de rafraîchissement fourni (clients JWT)
+        refresh = request.data.get('refresh')
+        if refresh:
+            try:
+                TokenService.revoke(refresh)
+            except ValueError as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
         # Déconnecter l'utilisateur (détruire la session)
         logout(request)
-        return Response({'message': 'Déconnexion réussie'}, status=status.HTTP_200_OK)
\ No newline at end of file
+        return Response({'message': 'Déconnexion réussie'}, status=status.HTTP_200_OK)
+
+
+class TokenRefreshView(BaseTokenRefreshView):
+    """
+    Vue pour obtenir un nouveau jeton d'accès (et un nouveau jeton de
+    rafraîchissement, l'ancien étant révoqué)
+    """
+    serializer_class = TokenRefreshSerializer
\ No newline at end of file
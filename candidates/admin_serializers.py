@@ -5,6 +5,9 @@ from rest_framework import serializers
 from .models import Candidature, CandidatureFile
 from accounts.models import User
 from categories.models import Category
+from config.sparse import SparseFieldsMixin
+from .services import MediaDurationService, UploadLimitService
+from mediafiles.serializers import ResponsiveImageField, ResponsiveImageListSerializer
 
 
 class AdminCandidatureFileSerializer(serializers.ModelSerializer):
@@ -12,6 +15,7 @@ class AdminCandidatureFileSerializer(serializers.ModelSerializer):
     file_size = serializers.SerializerMethodField()
     file_extension = serializers.SerializerMethodField()
     file_url = serializers.SerializerMethodField()
+    variants = ResponsiveImageField(source='file')
     is_image = serializers.BooleanField(read_only=True)
     is_video = serializers.BooleanField(read_only=True)
     is_audio = serializers.BooleanField(read_only=True)
@@ -19,12 +23,13 @@ class AdminCandidatureFileSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = CandidatureFile
+        list_serializer_class = ResponsiveImageListSerializer
         fields = [
-            'id', 'file_type', 'file', 'file_url', 'title', 'order',
-            'file_size', 'file_extension', 'is_image', 'is_video',
-            'is_audio', 'is_document', 'uploaded_at'
+            'id', 'file_type', 'file', 'file_url', 'variants', 'title', 'order',
+            'file_size', 'file_extension', 'mime_type', 'width', 'height', 'duration',
+            'is_image', 'is_video', 'is_audio', 'is_document', 'uploaded_at'
         ]
-        read_only_fields = ['id', 'uploaded_at']
+        read_only_fields = ['id', 'mime_type', 'width', 'height', 'duration', 'uploaded_at']
     
     def get_file_size(self, obj):
         return obj.get_file_size()
@@ -38,7 +43,7 @@ class AdminCandidatureFileSerializer(serializers.ModelSerializer):
         return None
 
 
-class AdminCandidatureSerializer(serializers.ModelSerializer):
+class AdminCandidatureSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Sérialiseur pour les candidatures (admin)"""
     candidate_name = serializers.CharField(source='candidate.get_full_name', read_only=True)
     candidate_email = serializers.CharField(source='candidate.email', read_only=True)
@@ -54,6 +59,7 @@ class AdminCandidatureSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Candidature
+        list_serializer_class = ResponsiveImageListSerializer
         fields = [
             'id', 'candidate', 'candidate_name', 'candidate_email', 'candidate_phone', 'candidate_country',
             'category', 'category_name', 'category_icon', 'status', 'status_display',
@@ -61,6 +67,17 @@ class AdminCandidatureSerializer(serializers.ModelSerializer):
             'rejection_reason', 'files', 'can_be_modified', 'days_since_submission'
         ]
         read_only_fields = ['id', 'submitted_at', 'reviewed_at', 'reviewed_by']
+        expandable_fields = ['files']
+        select_related_fields = {
+            'candidate': [
+                'candidate_name', 'candidate_email', 'candidate_phone', 'candidate_country'
+            ],
+            'category': ['category_name', 'category_icon'],
+            'reviewed_by': ['reviewed_by_name'],
+        }
+        prefetch_related_fields = {
+            'files': ['files'],
+        }
     
     def get_days_since_submission(self, obj):
         from django.utils import timezone
@@ -163,6 +180,14 @@ class AdminCandidatureFileCreateSerializer(serializers.ModelSerializer):
         if value not in ['photo', 'video', 'portfolio', 'audio']:
             raise serializers.ValidationError("Type de fichier invalide.")
         return value
+    
+    def validate(self, attrs):
+        try:
+            UploadLimitService.check(attrs['file'], attrs['file_type'], attrs['candidature'].category)
+            MediaDurationService.check(attrs['file'], attrs['file_type'], attrs['candidature'].category)
+        except ValueError as e:
+            raise serializers.ValidationError({'file': str(e)})
+        return attrs
 
 
 class AdminCandidatureFileUpdateSerializer(serializers.ModelSerializer):
@@ -176,3 +201,13 @@ class AdminCandidatureFileUpdateSerializer(serializers.ModelSerializer):
         if value not in ['photo', 'video', 'portfolio', 'audio']:
             raise serializers.ValidationError("Type de fichier invalide.")
         return value
+    
+    def validate(self, attrs):
+        if 'file' in attrs:
+            file_type = attrs.get('file_type', self.instance.file_type)
+            try:
+                UploadLimitService.check(attrs['file'], file_type, self.instance.candidature.category)
+                MediaDurationService.check(attrs['file'], file_type, self.instance.candidature.category)
+            except ValueError as e:
+                raise serializers.ValidationError({'file': str(e)})
+        return attrs
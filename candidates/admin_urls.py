@@ -15,6 +15,7 @@ urlpatterns = [
     path('candidatures/<int:candidature_id>/reject/', admin_views.AdminCandidatureRejectView.as_view(), name='admin-candidature-reject'),
     
     # Gestion des fichiers de candidature
+    path('candidatures/export/', admin_views.AdminCandidatureExportView.as_view(), name='admin-candidatures-export'),
     path('candidatures/<int:candidature_id>/files/', admin_views.AdminCandidatureFilesView.as_view(), name='admin-candidature-files'),
     path('candidatures/<int:candidature_id>/files/<int:file_id>/', admin_views.AdminCandidatureFileDetailView.as_view(), name='admin-candidature-file-detail'),
     
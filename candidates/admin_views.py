@@ -7,6 +7,7 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.pagination import PageNumberPagination
 from django.db.models import Q, Count
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 
@@ -16,8 +17,13 @@ from .admin_serializers import (
     AdminCandidatureFileSerializer, AdminCandidatureFileCreateSerializer,
     AdminCandidatureFileUpdateSerializer
 )
+from .services import CandidatureExportService
+from .uploadhandlers import CandidatureUploadMixin
 from accounts.models import User
 from categories.models import Category
+from config.search import search_queryset
+from dashboard.services import DashboardStatsService
+from mediafiles.zipstream import stream_zip
 
 
 class AdminCandidaturePagination(PageNumberPagination):
@@ -56,26 +62,31 @@ class AdminCandidaturesView(APIView):
         
         search = request.query_params.get('search')
         if search:
-            candidatures = candidatures.filter(
-                Q(candidate__first_name__icontains=search) |
-                Q(candidate__last_name__icontains=search) |
-                Q(candidate__email__icontains=search) |
-                Q(category__name__icontains=search)
+            candidatures = search_queryset(
+                candidatures, search,
+                ['candidate__first_name', 'candidate__last_name', 'candidate__email', 'category__name'],
+                vector_field='search_vector'
             )
         
-        # Tri
-        sort_by = request.query_params.get('sort_by', '-submitted_at')
-        candidatures = candidatures.order_by(sort_by)
+        # Tri (par pertinence si une recherche est faite sans tri explicite)
+        sort_by = request.query_params.get('sort_by')
+        if sort_by:
+            candidatures = candidatures.order_by(sort_by)
+        elif not search:
+            candidatures = candidatures.order_by('-submitted_at')
+        
+        # Jointures limitées aux champs demandés (?fields= / ?expand=)
+        candidatures = AdminCandidatureSerializer.prune_queryset(candidatures, request)
         
         # Pagination
         paginator = AdminCandidaturePagination()
         page = paginator.paginate_queryset(candidatures, request)
         
         if page is not None:
-            serializer = AdminCandidatureSerializer(page, many=True)
+            serializer = AdminCandidatureSerializer(page, many=True, context={'request': request})
             return paginator.get_paginated_response(serializer.data)
         
-        serializer = AdminCandidatureSerializer(candidatures, many=True)
+        serializer = AdminCandidatureSerializer(candidatures, many=True, context={'request': request})
         return Response(serializer.data)
     
     def post(self, request):
@@ -189,9 +200,55 @@ class AdminCandidatureRejectView(APIView):
         return Response(serializer.data)
 
 
-class AdminCandidatureFilesView(APIView):
+class AdminCandidatureExportView(APIView):
+    """
+    Vue pour télécharger les fichiers de candidatures en une archive ZIP (admin)
+
+    Filtres : `category` (id), `ids` (liste d'ids séparés par des virgules), `status`.
+    L'archive est produite au fil de l'envoi, sans fichier temporaire.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get_permissions(self):
+        if not self.request.user.is_authenticated or not self.request.user.is_admin():
+            return [permissions.IsAdminUser()]
+        return super().get_permissions()
+    
+    def get(self, request):
+        """Télécharger l'archive"""
+        category_id = request.query_params.get('category')
+        ids = request.query_params.get('ids')
+        if not category_id and not ids:
+            return Response(
+                {"detail": "Préciser une catégorie (category) ou des candidatures (ids)"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        candidatures = Candidature.objects.all()
+        filename = 'candidatures'
+        if category_id:
+            category = get_object_or_404(Category, id=category_id)
+            candidatures = candidatures.filter(category=category)
+            filename = f'candidatures-{category.slug}'
+        if ids:
+            try:
+                candidatures = candidatures.filter(id__in=[int(pk) for pk in ids.split(',') if pk.strip()])
+            except ValueError:
+                return Response({"detail": "Liste d'ids invalide"}, status=status.HTTP_400_BAD_REQUEST)
+        status_filter = request.query_params.get('status')
+        if status_filter:
+            candidatures = candidatures.filter(status=status_filter)
+        
+        entries = CandidatureExportService.entries(candidatures)
+        response = StreamingHttpResponse(stream_zip(entries), content_type='application/zip')
+        response['Content-Disposition'] = f'attachment; filename="{filename}.zip"'
+        return response
+
+
+class AdminCandidatureFilesView(CandidatureUploadMixin, APIView):
     """Vue pour gérer les fichiers d'une candidature (admin)"""
     permission_classes = [permissions.IsAuthenticated]
+    upload_candidature_kwarg = 'candidature_id'
     
     def get_permissions(self):
         if not self.request.user.is_authenticated or not self.request.user.is_admin():
@@ -222,9 +279,10 @@ class AdminCandidatureFilesView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class AdminCandidatureFileDetailView(APIView):
+class AdminCandidatureFileDetailView(CandidatureUploadMixin, APIView):
     """Vue pour gérer un fichier de candidature spécifique (admin)"""
     permission_classes = [permissions.IsAuthenticated]
+    upload_candidature_kwarg = 'candidature_id'
     
     def get_permissions(self):
         if not self.request.user.is_authenticated or not self.request.user.is_admin():
@@ -275,23 +333,26 @@ def admin_candidature_stats(request):
             status=status.HTTP_403_FORBIDDEN
         )
     
+    candidatures = DashboardStatsService.get_stats()['candidatures']
+    
     stats = {
-        'total': Candidature.objects.count(),
-        'pending': Candidature.objects.filter(status='pending').count(),
-        'approved': Candidature.objects.filter(status='approved').count(),
-        'rejected': Candidature.objects.filter(status='rejected').count(),
-        'by_category': list(
-            Candidature.objects.values('category__name')
-            .annotate(count=Count('id'))
-            .order_by('-count')
-        ),
-        'by_status': list(
-            Candidature.objects.values('status')
-            .annotate(count=Count('id'))
+        'total': candidatures['total'],
+        'pending': candidatures['pending'],
+        'approved': candidatures['approved'],
+        'rejected': candidatures['rejected'],
+        'by_category': sorted(
+            (
+                {'category__name': category['name'], 'count': category['total']}
+                for category in candidatures['by_category']
+            ),
+            key=lambda item: -item['count']
         ),
-        'recent_submissions': Candidature.objects.filter(
-            submitted_at__gte=timezone.now() - timezone.timedelta(days=7)
-        ).count(),
+        'by_status': [
+            {'status': status_key, 'count': candidatures[status_key]}
+            for status_key in DashboardStatsService.STATUSES
+            if candidatures[status_key]
+        ],
+        'recent_submissions': candidatures['recent_submissions'],
     }
     
     return Response(stats)
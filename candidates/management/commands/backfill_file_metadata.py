@@ -0,0 +1,53 @@
+"""
+Commande Django pour renseigner les métadonnées des fichiers de candidature existants
+Usage: python manage.py backfill_file_metadata [--force] [--batch-size N]
+"""
+
+from django.core.management.base import BaseCommand
+
+from candidates.models import CandidatureFile
+from mediafiles.metadata import field_file_metadata
+
+METADATA_FIELDS = ['size', 'mime_type', 'width', 'height', 'duration']
+
+
+class Command(BaseCommand):
+    help = 'Renseigner taille, type MIME, dimensions et durée des fichiers de candidature'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Recalculer aussi les fichiers déjà renseignés',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='Nombre de fichiers enregistrés par requête',
+        )
+
+    def handle(self, *args, **options):
+        files = CandidatureFile.objects.exclude(file='').only('id', 'file', *METADATA_FIELDS)
+        if not options['force']:
+            files = files.filter(size__isnull=True)
+
+        batch = []
+        updated = missing = 0
+        for candidature_file in files.iterator(chunk_size=options['batch_size']):
+            try:
+                metadata = field_file_metadata(candidature_file.file)
+            except FileNotFoundError:
+                missing += 1
+                self.stdout.write(self.style.WARNING(f'⚠️  {candidature_file.file.name} introuvable'))
+                continue
+            for field, value in metadata.items():
+                setattr(candidature_file, field, value)
+            batch.append(candidature_file)
+            if len(batch) >= options['batch_size']:
+                updated += CandidatureFile.objects.bulk_update(batch, METADATA_FIELDS)
+                batch = []
+        if batch:
+            updated += CandidatureFile.objects.bulk_update(batch, METADATA_FIELDS)
+
+        self.stdout.write(self.style.SUCCESS(f'✅ {updated} fichiers renseignés, {missing} introuvables'))
@@ -0,0 +1,87 @@
+"""
+Commande Django pour comparer les renderers JSON sur la liste admin des candidatures
+Usage: python manage.py benchmark_json [--sizes 20 100 1000] [--repeat 50]
+"""
+
+import timeit
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from accounts.models import User
+from candidates.admin_serializers import AdminCandidatureSerializer
+from candidates.models import Candidature, CandidatureFile
+from categories.models import Category
+from config.renderers import FastJSONRenderer
+
+
+class Command(BaseCommand):
+    help = 'Comparer le temps de rendu et la taille JSON (DRF vs orjson) de la liste admin des candidatures'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            type=int,
+            nargs='+',
+            default=[20, 100, 1000],
+            help='Nombres de candidatures à rendre (défaut: 20 100 1000)',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=50,
+            help='Nombre de rendus mesurés par taille (défaut: 50)',
+        )
+
+    def handle(self, *args, **options):
+        renderers = [('DRF', JSONRenderer()), ('orjson', FastJSONRenderer())]
+
+        self.stdout.write('📊 Rendu JSON de la liste admin des candidatures')
+        self.stdout.write(f"{'lignes':>8} {'renderer':>10} {'ms/rendu':>10} {'octets':>10}")
+
+        for size in options['sizes']:
+            # Données sérialisées une fois : seul le rendu est mesuré
+            data = AdminCandidatureSerializer(self._build_candidatures(size), many=True).data
+            outputs = {}
+            for name, renderer in renderers:
+                outputs[name] = renderer.render(data)
+                seconds = timeit.timeit(lambda: renderer.render(data), number=options['repeat'])
+                self.stdout.write(
+                    f"{size:>8} {name:>10} {seconds * 1000 / options['repeat']:>10.3f} {len(outputs[name]):>10}"
+                )
+
+            if outputs['DRF'] != outputs['orjson']:
+                self.stdout.write(self.style.WARNING(f'⚠️  Sorties différentes pour {size} lignes'))
+
+        self.stdout.write(self.style.SUCCESS('✅ Benchmark terminé'))
+
+    def _build_candidatures(self, size):
+        """Candidatures en mémoire (sans base de données) avec leurs fichiers"""
+        now = timezone.now()
+        category = Category(id=1, name='Musique', slug='musique')
+        candidatures = []
+        for index in range(size):
+            candidate = User(
+                id=index + 1, email=f'candidat{index}@example.com',
+                first_name=f'Prénom{index}', last_name='Candidat',
+                phone='+224600000000', country='guinea'
+            )
+            candidature = Candidature(
+                id=index + 1, candidate=candidate, category=category,
+                status='pending', submitted_at=now,
+                description='Présentation du candidat et de son parcours artistique.'
+            )
+            files = [
+                CandidatureFile(
+                    id=index * 3 + order + 1, candidature=candidature, file_type=file_type,
+                    file=f'candidatures/{index + 1}/{file_type}/fichier{order}.{extension}',
+                    title=f'Fichier {order}', order=order, uploaded_at=now
+                )
+                for order, (file_type, extension) in enumerate(
+                    [('photo', 'jpg'), ('video', 'mp4'), ('audio', 'mp3')]
+                )
+            ]
+            candidature._prefetched_objects_cache = {'files': files}
+            candidatures.append(candidature)
+        return candidatures
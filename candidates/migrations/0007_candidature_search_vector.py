@@ -0,0 +1,46 @@
+# Generated by Django 5.2.7 on 2026-10-19 17:46
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+def create_search_indexes(apps, schema_editor):
+    """Index GIN sur le vecteur et remplissage initial, PostgreSQL uniquement"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS candidates_candidature_search_vector_gin "
+        "ON candidates_candidature USING gin (search_vector)"
+    )
+    schema_editor.execute(
+        "UPDATE candidates_candidature AS c SET search_vector = "
+        "setweight(to_tsvector('simple', coalesce(u.first_name, '') || ' ' || coalesce(u.last_name, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(u.email, '')), 'B') || "
+        "setweight(to_tsvector('simple', coalesce(cat.name, '')), 'C') "
+        "FROM accounts_user AS u, categories_category AS cat "
+        "WHERE u.id = c.candidate_id AND cat.id = c.category_id"
+    )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS candidates_candidature_search_vector_gin")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_user_search_vector'),
+        ('categories', '0009_category_name_trgm'),
+        ('candidates', '0006_candidature_published'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidature',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True, verbose_name='Vecteur de recherche'),
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-19 17:58
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0007_candidature_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadSession',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('file_type', models.CharField(choices=[('photo', 'Photo'), ('video', 'Vidéo'), ('portfolio', 'Portfolio'), ('audio', 'Audio')], max_length=20, verbose_name='Type de fichier')),
+                ('filename', models.CharField(max_length=255, verbose_name='Nom du fichier')),
+                ('title', models.CharField(blank=True, max_length=200, verbose_name='Titre')),
+                ('order', models.PositiveIntegerField(default=0, verbose_name='Ordre')),
+                ('size', models.PositiveBigIntegerField(verbose_name='Taille totale (octets)')),
+                ('offset', models.PositiveBigIntegerField(default=0, verbose_name='Octets reçus')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('candidature', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to='candidates.candidature', verbose_name='Candidature')),
+            ],
+            options={
+                'verbose_name': "Session d'upload",
+                'verbose_name_plural': "Sessions d'upload",
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
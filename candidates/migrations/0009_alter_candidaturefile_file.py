@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-19 18:09
+
+import candidates.models
+import django.core.validators
+import mediafiles.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0008_uploadsession'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='candidaturefile',
+            name='file',
+            field=mediafiles.fields.ContentAddressedFileField(upload_to=candidates.models.candidature_file_upload_path, validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['jpg', 'jpeg', 'png', 'gif', 'mp4', 'avi', 'mov', 'pdf', 'doc', 'docx', 'mp3', 'wav'])], verbose_name='Fichier'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.7 on 2026-10-19 18:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0009_alter_candidaturefile_file'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidaturefile',
+            name='duration',
+            field=models.FloatField(blank=True, null=True, verbose_name='Durée (secondes)'),
+        ),
+        migrations.AddField(
+            model_name='candidaturefile',
+            name='height',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='Hauteur'),
+        ),
+        migrations.AddField(
+            model_name='candidaturefile',
+            name='mime_type',
+            field=models.CharField(blank=True, max_length=100, verbose_name='Type MIME'),
+        ),
+        migrations.AddField(
+            model_name='candidaturefile',
+            name='size',
+            field=models.BigIntegerField(blank=True, null=True, verbose_name='Taille (octets)'),
+        ),
+        migrations.AddField(
+            model_name='candidaturefile',
+            name='width',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='Largeur'),
+        ),
+    ]
@@ -3,17 +3,20 @@ Modèles pour l'app candidates
 """
 import os
 import uuid
-from django.db import models
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models, transaction
 from django.core.validators import FileExtensionValidator
 from django.conf import settings
 
 from accounts.models import User
 from categories.models import Category
+from mediafiles.fields import ContentAddressedFileField
 
 
 def candidature_file_upload_path(instance, filename):
     """
     Génère le chemin d'upload pour les fichiers de candidature
+    (uploads directs uniquement : les autres sont stockés sous `blobs/`)
     """
     # Structure: media/candidatures/{candidature_id}/{file_type}/{filename}
     return f'candidatures/{instance.candidature.id}/{instance.file_type}/{filename}'
@@ -29,6 +32,13 @@ class Candidature(models.Model):
         ('rejected', 'Rejetée'),
     ]
     
+    # Couleurs CSS associées aux statuts
+    STATUS_COLORS = {
+        'pending': 'orange',
+        'approved': 'green',
+        'rejected': 'red',
+    }
+    
     candidate = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -81,6 +91,11 @@ class Candidature(models.Model):
         verbose_name="Raison du rejet",
         help_text="Raison du rejet (si applicable)"
     )
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        verbose_name="Vecteur de recherche"
+    )
     
     class Meta:
         verbose_name = "Candidature"
@@ -91,16 +106,27 @@ class Candidature(models.Model):
     def __str__(self):
         return f"{self.candidate.get_full_name()} - {self.category.name}"
     
+    def save(self, *args, **kwargs):
+        # Une seule transaction de pre_save à post_save : les compteurs du
+        # dashboard relisent l'état précédent sous verrou jusqu'à leur mise à jour
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+    
+    def get_search_document(self):
+        """
+        Retourne les textes indexés (texte, poids) pour la recherche plein texte
+        """
+        return [
+            (self.candidate.get_full_name(), 'A'),
+            (self.candidate.email, 'B'),
+            (self.category.name, 'C'),
+        ]
+    
     def get_status_display_color(self):
         """
         Retourne la couleur CSS pour le statut
         """
-        colors = {
-            'pending': 'orange',
-            'approved': 'green',
-            'rejected': 'red',
-        }
-        return colors.get(self.status, 'gray')
+        return self.STATUS_COLORS.get(self.status, 'gray')
     
     def can_be_modified(self):
         """
@@ -182,7 +208,7 @@ class CandidatureFile(models.Model):
         choices=FILE_TYPE_CHOICES,
         verbose_name="Type de fichier"
     )
-    file = models.FileField(
+    file = ContentAddressedFileField(
         upload_to=candidature_file_upload_path,
         validators=[
             FileExtensionValidator(
@@ -206,6 +232,32 @@ class CandidatureFile(models.Model):
         auto_now_add=True,
         verbose_name="Date d'upload"
     )
+    # Métadonnées calculées à l'enregistrement du fichier (voir mediafiles.metadata)
+    size = models.BigIntegerField(
+        null=True,
+        blank=True,
+        verbose_name="Taille (octets)"
+    )
+    mime_type = models.CharField(
+        max_length=100,
+        blank=True,
+        verbose_name="Type MIME"
+    )
+    width = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        verbose_name="Largeur"
+    )
+    height = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        verbose_name="Hauteur"
+    )
+    duration = models.FloatField(
+        null=True,
+        blank=True,
+        verbose_name="Durée (secondes)"
+    )
     
     class Meta:
         verbose_name = "Fichier de candidature"
@@ -220,7 +272,7 @@ class CandidatureFile(models.Model):
         Retourne la taille du fichier en MB
         """
         try:
-            size = self.file.size
+            size = self.size if self.size is not None else self.file.size
             return round(size / (1024 * 1024), 2)
         except:
             return 0
@@ -299,4 +351,67 @@ class Vote(models.Model):
         ordering = ['-created_at']
     
     def __str__(self):
-        return f"{self.voter.get_full_name()} a voté pour {self.candidature.candidate.get_full_name()}"
\ No newline at end of file
+        return f"{self.voter.get_full_name()} a voté pour {self.candidature.candidate.get_full_name()}"
+
+class UploadSession(models.Model):
+    """
+    Session d'upload par morceaux (protocole reprenable inspiré de tus)
+
+    Les morceaux sont écrits directement dans un fichier temporaire ; le
+    CandidatureFile n'est créé qu'à la finalisation, une fois tous les
+    octets reçus.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    candidature = models.ForeignKey(
+        Candidature,
+        on_delete=models.CASCADE,
+        related_name='upload_sessions',
+        verbose_name="Candidature"
+    )
+    file_type = models.CharField(
+        max_length=20,
+        choices=CandidatureFile.FILE_TYPE_CHOICES,
+        verbose_name="Type de fichier"
+    )
+    filename = models.CharField(
+        max_length=255,
+        verbose_name="Nom du fichier"
+    )
+    title = models.CharField(
+        max_length=200,
+        blank=True,
+        verbose_name="Titre"
+    )
+    order = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Ordre"
+    )
+    size = models.PositiveBigIntegerField(
+        verbose_name="Taille totale (octets)"
+    )
+    offset = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name="Octets reçus"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = "Session d'upload"
+        verbose_name_plural = "Sessions d'upload"
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.size})"
+    
+    def get_temp_path(self):
+        """
+        Chemin du fichier temporaire recevant les morceaux
+        """
+        return os.path.join(settings.CHUNKED_UPLOAD_TEMP_DIR, f'{self.id}.part')
+    
+    def is_complete(self):
+        """
+        Vérifie si tous les octets ont été reçus
+        """
+        return self.offset == self.size
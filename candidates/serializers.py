@@ -3,11 +3,17 @@ Serializers pour l'app candidates
 """
 from rest_framework import serializers
 from django.core.exceptions import ValidationError
+from django.db.models import Count
 from django.utils import timezone
 
-from .models import Candidature, CandidatureFile
+from django.conf import settings
+
+from .models import Candidature, CandidatureFile, UploadSession
+from .services import MediaDurationService, UploadLimitService
 from categories.models import Category
 from accounts.models import User
+from config.sparse import SparseFieldsMixin, requested_fields
+from mediafiles.serializers import ResponsiveImageField, ResponsiveImageListSerializer
 
 
 class CandidatureFileSerializer(serializers.ModelSerializer):
@@ -17,14 +23,20 @@ class CandidatureFileSerializer(serializers.ModelSerializer):
     file_size = serializers.SerializerMethodField()
     file_extension = serializers.SerializerMethodField()
     file_url = serializers.SerializerMethodField()
+    variants = ResponsiveImageField(source='file')
     
     class Meta:
         model = CandidatureFile
+        list_serializer_class = ResponsiveImageListSerializer
         fields = [
-            'id', 'file_type', 'file', 'file_url', 'title', 'order',
-            'file_size', 'file_extension', 'uploaded_at'
+            'id', 'file_type', 'file', 'file_url', 'variants', 'title', 'order',
+            'file_size', 'file_extension', 'mime_type', 'width', 'height', 'duration',
+            'uploaded_at'
+        ]
+        read_only_fields = [
+            'id', 'file_size', 'file_extension', 'file_url', 'mime_type', 'width', 'height',
+            'duration', 'uploaded_at'
         ]
-        read_only_fields = ['id', 'file_size', 'file_extension', 'file_url', 'uploaded_at']
     
     def get_file_size(self, obj):
         return obj.get_file_size()
@@ -49,6 +61,22 @@ class CandidatureFileSerializer(serializers.ModelSerializer):
         return value
 
 
+def validate_files_limits(files, category):
+    """
+    Vérifie la taille des fichiers envoyés et la durée des vidéos et audios
+    (en-têtes uniquement) selon les limites de la catégorie
+    """
+    for file_data in files:
+        file = file_data.get('file')
+        if not file:
+            continue
+        try:
+            UploadLimitService.check(file, file_data.get('file_type'), category)
+            MediaDurationService.check(file, file_data.get('file_type'), category)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+
+
 class CandidatureFileCreateSerializer(serializers.ModelSerializer):
     """
     Serializer pour créer des fichiers de candidature
@@ -81,7 +109,7 @@ class CandidatureFileCreateSerializer(serializers.ModelSerializer):
         return attrs
 
 
-class CandidatureSerializer(serializers.ModelSerializer):
+class CandidatureSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer pour les candidatures
     """
@@ -98,6 +126,7 @@ class CandidatureSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Candidature
+        list_serializer_class = ResponsiveImageListSerializer
         fields = [
             'id', 'candidate', 'candidate_name', 'candidate_email',
             'category', 'category_name', 'category_slug', 'status',
@@ -109,6 +138,15 @@ class CandidatureSerializer(serializers.ModelSerializer):
             'id', 'candidate', 'submitted_at', 'reviewed_at', 
             'reviewed_by', 'status'
         ]
+        expandable_fields = ['files']
+        select_related_fields = {
+            'candidate': ['candidate', 'candidate_name', 'candidate_email'],
+            'category': ['category_name', 'category_slug'],
+            'reviewed_by': ['reviewed_by_name'],
+        }
+        prefetch_related_fields = {
+            'files': ['files'],
+        }
 
 
 class CandidatureCreateSerializer(serializers.ModelSerializer):
@@ -147,6 +185,8 @@ class CandidatureCreateSerializer(serializers.ModelSerializer):
         if not is_valid:
             raise serializers.ValidationError(message)
         
+        validate_files_limits(files, category)
+        
         return attrs
     
     def create(self, validated_data):
@@ -195,6 +235,8 @@ class CandidatureUpdateSerializer(serializers.ModelSerializer):
             
             if not is_valid:
                 raise serializers.ValidationError(message)
+            
+            validate_files_limits(files, candidature.category)
         
         return attrs
     
@@ -218,7 +260,7 @@ class CandidatureUpdateSerializer(serializers.ModelSerializer):
         return instance
 
 
-class CandidatureListSerializer(serializers.ModelSerializer):
+class CandidatureListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer simplifié pour la liste des candidatures
     """
@@ -234,12 +276,78 @@ class CandidatureListSerializer(serializers.ModelSerializer):
             'id', 'candidate_name', 'category_name', 'category_slug',
             'status', 'status_color', 'submitted_at', 'files_count'
         ]
+        select_related_fields = {
+            'candidate': ['candidate_name'],
+            'category': ['category_name', 'category_slug'],
+        }
+        prefetch_related_fields = {
+            'files': ['files_count'],
+        }
     
     def get_files_count(self, obj):
         return obj.files.count()
 
 
-class CandidatureAdminSerializer(serializers.ModelSerializer):
+class CandidatureListValuesSerializer(SparseFieldsMixin, serializers.Serializer):
+    """
+    Équivalent en lecture seule de CandidatureListSerializer, construit à
+    partir d'une requête `.values()` : une seule requête, sans instancier de
+    modèles ni précharger les fichiers. La sortie JSON est identique.
+    """
+    id = serializers.IntegerField(read_only=True)
+    candidate_name = serializers.SerializerMethodField()
+    category_name = serializers.CharField(source='category__name', read_only=True)
+    category_slug = serializers.CharField(source='category__slug', read_only=True)
+    status = serializers.CharField(read_only=True)
+    status_color = serializers.SerializerMethodField()
+    submitted_at = serializers.DateTimeField(read_only=True)
+    files_count = serializers.IntegerField(read_only=True)
+    
+    class Meta:
+        fields = CandidatureListSerializer.Meta.fields
+        # Colonnes `.values()` nécessaires à chaque champ
+        values_fields = {
+            'id': ['id'],
+            'candidate_name': ['candidate__first_name', 'candidate__last_name'],
+            'category_name': ['category__name'],
+            'category_slug': ['category__slug'],
+            'status': ['status'],
+            'status_color': ['status'],
+            'submitted_at': ['submitted_at'],
+        }
+    
+    def get_candidate_name(self, obj):
+        # Même règle que User.get_full_name()
+        return f"{obj['candidate__first_name']} {obj['candidate__last_name']}".strip()
+    
+    def get_status_color(self, obj):
+        return Candidature.STATUS_COLORS.get(obj['status'], 'gray')
+    
+    @classmethod
+    def prune_queryset(cls, queryset, request):
+        """
+        Transforme le queryset en requête `.values()` limitée aux champs demandés
+        """
+        selected = requested_fields(request, cls.Meta.fields)
+        if selected is None:
+            selected = cls.Meta.fields
+        
+        # 'id' garde une ligne par candidature malgré le GROUP BY du Count
+        columns = ['id']
+        for name in cls.Meta.fields:
+            if name in selected:
+                columns.extend(
+                    column for column in cls.Meta.values_fields.get(name, [])
+                    if column not in columns
+                )
+        
+        queryset = queryset.select_related(None).prefetch_related(None).values(*columns)
+        if 'files_count' in selected:
+            queryset = queryset.annotate(files_count=Count('files'))
+        return queryset
+
+
+class CandidatureAdminSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer pour l'admin (avec plus de détails)
     """
@@ -257,6 +365,7 @@ class CandidatureAdminSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Candidature
+        list_serializer_class = ResponsiveImageListSerializer
         fields = [
             'id', 'candidate', 'candidate_name', 'candidate_email',
             'candidate_phone', 'candidate_country', 'category', 'category_name',
@@ -267,6 +376,18 @@ class CandidatureAdminSerializer(serializers.ModelSerializer):
         read_only_fields = [
             'id', 'candidate', 'category', 'submitted_at'
         ]
+        expandable_fields = ['files']
+        select_related_fields = {
+            'candidate': [
+                'candidate_name', 'candidate_email', 'candidate_phone', 'candidate_country'
+            ],
+            'category': ['category_name', 'category_class_name', 'ranking'],
+            'category__category_class': ['category_class_name'],
+            'reviewed_by': ['reviewed_by_name'],
+        }
+        prefetch_related_fields = {
+            'files': ['files'],
+        }
     
     def get_vote_count(self, obj):
         """Retourne le nombre de votes reçus"""
@@ -308,3 +429,56 @@ class CandidatureAdminCreateSerializer(serializers.ModelSerializer):
     def get_can_be_modified(self, obj):
         """Retourne si la candidature peut être modifiée"""
         return obj.can_be_modified()
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    """
+    Serializer pour l'état d'une session d'upload par morceaux
+    """
+    class Meta:
+        model = UploadSession
+        fields = [
+            'id', 'candidature', 'file_type', 'filename', 'title', 'order',
+            'size', 'offset', 'created_at', 'updated_at'
+        ]
+        read_only_fields = fields
+
+
+class UploadSessionCreateSerializer(serializers.ModelSerializer):
+    """
+    Serializer pour ouvrir une session d'upload par morceaux
+    """
+    class Meta:
+        model = UploadSession
+        fields = ['candidature', 'file_type', 'filename', 'size', 'title', 'order']
+    
+    def validate_candidature(self, value):
+        if value.candidate_id != self.context['request'].user.id:
+            raise serializers.ValidationError("Candidature non trouvée.")
+        if not value.can_be_modified():
+            raise serializers.ValidationError("Cette candidature ne peut plus être modifiée.")
+        return value
+    
+    def validate_size(self, value):
+        if value <= 0:
+            raise serializers.ValidationError("La taille doit être positive.")
+        if value > settings.CHUNKED_UPLOAD_MAX_SIZE:
+            max_mb = settings.CHUNKED_UPLOAD_MAX_SIZE // (1024 * 1024)
+            raise serializers.ValidationError(f"Le fichier ne peut pas dépasser {max_mb}MB.")
+        return value
+    
+    def validate(self, attrs):
+        # Même contrôle d'extension que pour un fichier envoyé en une fois
+        is_valid, message = CandidatureFile(
+            file_type=attrs['file_type'], file=attrs['filename']
+        ).validate_file_type()
+        if not is_valid:
+            raise serializers.ValidationError({'filename': message})
+        
+        # Limite propre à la catégorie (la limite par défaut ne vise que les envois en une fois)
+        max_size = attrs['candidature'].category.get_max_file_size(attrs['file_type'])
+        if max_size and attrs['size'] > max_size:
+            raise serializers.ValidationError(
+                {'size': f"Le fichier ne peut pas dépasser {max_size // (1024 * 1024)}MB."}
+            )
+        return attrs
@@ -0,0 +1,344 @@
+"""
+Services pour l'app candidates
+"""
+import os
+import re
+import shutil
+import uuid
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from categories.models import ALLOWED_EXTENSIONS, Category
+from mediafiles.probe import probe_duration
+from mediafiles.sniff import SNIFF_SIZE, matches_extension
+from .models import CandidatureFile, UploadSession
+
+
+class UploadError(Exception):
+    """
+    Erreur de protocole d'upload, avec le code HTTP à renvoyer
+    """
+
+    def __init__(self, message, status_code, offset=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.offset = offset
+
+
+class _UploadedPart(File):
+    """
+    Fichier temporaire complet : le stockage local le déplace au lieu de le copier
+    """
+
+    def temporary_file_path(self):
+        return self.file.name
+
+
+class MediaDurationService:
+    """
+    Contrôle de la durée des vidéos et audios selon les limites de la catégorie
+
+    La durée est lue dans les en-têtes du fichier, avant tout enregistrement.
+    Quand la catégorie limite la durée, un fichier dont la durée ne peut pas
+    être lue (format non pris en charge, en-têtes corrompus) est refusé.
+    """
+
+    @staticmethod
+    def check(content, file_type, category):
+        """
+        Lève ValueError si le média dépasse la durée autorisée
+        """
+        limit = category.get_max_duration(file_type)
+        if not limit:
+            return
+        duration = probe_duration(content)
+        if duration is None:
+            raise ValueError(
+                f"La durée du fichier {content.name} n'a pas pu être lue, "
+                f"la durée maximale pour cette catégorie est de {limit} secondes."
+            )
+        if duration > limit:
+            raise ValueError(
+                f"Le fichier {content.name} dure {round(duration)} secondes, "
+                f"la durée maximale pour cette catégorie est de {limit} secondes."
+            )
+
+
+class UploadLimitService:
+    """
+    Taille maximale des fichiers de candidature envoyés en une fois
+
+    Limite de la catégorie pour le type de fichier, sinon limite par défaut
+    du site (CANDIDATURE_MAX_FILE_SIZES).
+    """
+    # Champ de Category (en Mo) portant la limite de chaque type de fichier
+    CATEGORY_FIELDS = {
+        'photo': 'max_photo_size',
+        'video': 'max_video_size',
+        'audio': 'max_audio_size',
+        'portfolio': 'max_document_size',
+        'documents': 'max_document_size',
+    }
+
+    @staticmethod
+    def max_size(file_type, category=None):
+        """
+        Retourne la taille maximale (octets) d'un type de fichier, None si illimitée
+        """
+        if category is not None:
+            size = category.get_max_file_size(file_type)
+            if size:
+                return size
+        return settings.CANDIDATURE_MAX_FILE_SIZES.get(file_type)
+
+    @staticmethod
+    def largest_max_size(file_type):
+        """
+        Plus grande taille autorisée d'un type de fichier parmi les catégories
+        actives (catégorie encore inconnue), None si illimitée
+        """
+        default = settings.CANDIDATURE_MAX_FILE_SIZES.get(file_type)
+        field = UploadLimitService.CATEGORY_FIELDS.get(file_type)
+        if default is None or field is None:
+            return default
+        largest = Category.objects.filter(is_active=True).aggregate(size=Max(field))['size']
+        return max(default, largest * 1024 * 1024) if largest else default
+
+    @staticmethod
+    def file_types(extension):
+        """
+        Retourne les types de fichiers acceptant l'extension (sans le point)
+        """
+        extension = extension.lower()
+        return [file_type for file_type, extensions in ALLOWED_EXTENSIONS.items() if extension in extensions]
+
+    @staticmethod
+    def check(content, file_type, category):
+        """
+        Lève ValueError si le fichier dépasse la taille autorisée
+        """
+        limit = UploadLimitService.max_size(file_type, category)
+        if limit and content.size > limit:
+            raise ValueError(
+                f"Le fichier {content.name} ne peut pas dépasser {limit // (1024 * 1024)}MB."
+            )
+
+
+class ChunkedUploadService:
+    """
+    Service d'upload reprenable par morceaux
+
+    Protocole : création de la session (taille totale annoncée), envoi des
+    morceaux avec leur offset, puis finalisation qui crée le CandidatureFile.
+    """
+
+    READ_SIZE = 64 * 1024
+
+    @staticmethod
+    def create_session(candidature, file_type, filename, size, title='', order=0):
+        """
+        Crée une session et son fichier temporaire vide
+        """
+        session = UploadSession.objects.create(
+            candidature=candidature, file_type=file_type, filename=filename,
+            size=size, title=title, order=order
+        )
+        os.makedirs(settings.CHUNKED_UPLOAD_TEMP_DIR, exist_ok=True)
+        open(session.get_temp_path(), 'wb').close()
+        return session
+
+    @staticmethod
+    def is_expired(session):
+        """
+        Vérifie si la session n'a plus reçu de morceau depuis trop longtemps
+        """
+        expiry = timezone.timedelta(hours=settings.CHUNKED_UPLOAD_EXPIRY_HOURS)
+        return session.updated_at < timezone.now() - expiry
+
+    @staticmethod
+    def append_chunk(session, offset, stream, length=None):
+        """
+        Écrit un morceau à la position `offset` en lisant le flux par blocs
+
+        Le morceau est d'abord reçu dans un fichier à part, puis recopié dans
+        le fichier de la session seulement si l'avancée conditionnelle de
+        l'offset réussit : un envoi concurrent au même offset échoue sans
+        toucher aux octets déjà acceptés. Les octets reçus avant une coupure
+        de connexion sont conservés ; le client reprend à l'offset renvoyé.
+        Retourne le nouvel offset.
+        """
+        if offset != session.offset:
+            raise UploadError("Offset invalide", 409, offset=session.offset)
+
+        remaining = session.size - offset
+        if length is not None and length > remaining:
+            raise UploadError("Le morceau dépasse la taille annoncée", 413, offset=session.offset)
+        if length is not None and length > settings.CHUNKED_UPLOAD_MAX_CHUNK_SIZE:
+            raise UploadError("Morceau trop volumineux", 413, offset=session.offset)
+
+        limit = min(remaining, settings.CHUNKED_UPLOAD_MAX_CHUNK_SIZE)
+        received = 0
+        # Fichier propre à cette requête (purgé avec les temporaires orphelins)
+        chunk_path = f'{session.get_temp_path()}.{uuid.uuid4().hex}'
+        try:
+            with open(chunk_path, 'w+b') as chunk:
+                try:
+                    while received < limit:
+                        data = stream.read(min(ChunkedUploadService.READ_SIZE, limit - received))
+                        if not data:
+                            break
+                        chunk.write(data)
+                        received += len(data)
+                except OSError:
+                    # Connexion interrompue : on garde ce qui a été reçu
+                    pass
+
+                new_offset = offset + received
+                with transaction.atomic():
+                    # Mise à jour conditionnelle : la ligne reste verrouillée
+                    # jusqu'à la recopie, un envoi concurrent au même offset échoue
+                    updated = UploadSession.objects.filter(pk=session.pk, offset=offset).update(
+                        offset=new_offset, updated_at=timezone.now()
+                    )
+                    if not updated:
+                        session.refresh_from_db(fields=['offset'])
+                        raise UploadError("Offset invalide", 409, offset=session.offset)
+                    chunk.seek(0)
+                    with open(session.get_temp_path(), 'r+b') as part:
+                        part.seek(offset)
+                        shutil.copyfileobj(chunk, part, ChunkedUploadService.READ_SIZE)
+                        part.truncate(new_offset)
+        finally:
+            try:
+                os.remove(chunk_path)
+            except OSError:
+                pass
+
+        session.offset = new_offset
+        return new_offset
+
+    @staticmethod
+    def finalize(session):
+        """
+        Crée le CandidatureFile à partir du fichier reçu et clôt la session
+        """
+        if not session.is_complete():
+            raise UploadError("Upload incomplet", 409, offset=session.offset)
+
+        with open(session.get_temp_path(), 'rb') as part:
+            # Même contrôle de signature que pour un fichier envoyé en une fois
+            extension = os.path.splitext(session.filename)[1].lstrip('.')
+            if not matches_extension(part.read(SNIFF_SIZE), extension):
+                raise UploadError(
+                    f"Le contenu du fichier {session.filename} ne correspond pas à son extension.",
+                    415, offset=session.offset
+                )
+            part.seek(0)
+            try:
+                MediaDurationService.check(
+                    File(part, name=session.filename), session.file_type, session.candidature.category
+                )
+            except ValueError as e:
+                raise UploadError(str(e), 400, offset=session.offset)
+
+        candidature_file = CandidatureFile(
+            candidature=session.candidature, file_type=session.file_type,
+            title=session.title, order=session.order
+        )
+        with transaction.atomic():
+            with open(session.get_temp_path(), 'rb') as part:
+                candidature_file.file.save(session.filename, _UploadedPart(part), save=True)
+            # Le fichier temporaire restant éventuel est supprimé par signal
+            session.delete()
+        return candidature_file
+
+    @staticmethod
+    def abort(session):
+        """
+        Abandonne la session (le fichier temporaire est supprimé par signal)
+        """
+        session.delete()
+
+    @staticmethod
+    def purge_expired(dry_run=False):
+        """
+        Supprime les sessions expirées et les fichiers temporaires sans session
+
+        Retourne le nombre de sessions et de fichiers supprimés.
+        """
+        cutoff = timezone.now() - timezone.timedelta(hours=settings.CHUNKED_UPLOAD_EXPIRY_HOURS)
+        expired = UploadSession.objects.filter(updated_at__lt=cutoff)
+        sessions = expired.count()
+        if not dry_run:
+            # Les fichiers temporaires sont supprimés par signal
+            expired.delete()
+
+        files = 0
+        if os.path.isdir(settings.CHUNKED_UPLOAD_TEMP_DIR):
+            live = {f'{pk}.part' for pk in UploadSession.objects.values_list('pk', flat=True)}
+            with os.scandir(settings.CHUNKED_UPLOAD_TEMP_DIR) as entries:
+                for entry in entries:
+                    if entry.name in live or not entry.is_file():
+                        continue
+                    if entry.stat().st_mtime >= cutoff.timestamp():
+                        continue
+                    files += 1
+                    if not dry_run:
+                        os.remove(entry.path)
+        return sessions, files
+
+
+class CandidatureExportService:
+    """
+    Export des fichiers de candidature pour le jury
+
+    Arborescence de l'archive : `<catégorie>/<candidat> (<id>)/<type>-<ordre> <titre>.<ext>`
+    """
+
+    UNSAFE_CHARACTERS = re.compile(r'[\x00-\x1f/\\:*?"<>|]+')
+
+    @staticmethod
+    def safe_name(value, max_length=80):
+        """
+        Nom utilisable comme dossier ou fichier sur tous les systèmes
+        """
+        value = CandidatureExportService.UNSAFE_CHARACTERS.sub('_', value or '')
+        return value.strip(' .')[:max_length].strip(' .')
+
+    @staticmethod
+    def entries(candidatures):
+        """
+        Retourne la liste des (chemin dans l'archive, nom dans le stockage)
+        des fichiers des candidatures
+        """
+        safe_name = CandidatureExportService.safe_name
+        rows = CandidatureFile.objects.filter(candidature__in=candidatures).exclude(file='').order_by(
+            'candidature__category__name', 'candidature__candidate__last_name',
+            'candidature__candidate__first_name', 'candidature_id', 'file_type', 'order', 'id'
+        ).values_list(
+            'file', 'file_type', 'title', 'order', 'candidature_id', 'candidature__category__name',
+            'candidature__candidate__first_name', 'candidature__candidate__last_name',
+        )
+
+        entries = []
+        used = set()
+        for name, file_type, title, order, candidature_id, category, first_name, last_name in rows:
+            candidate = safe_name(f'{first_name} {last_name}') or 'Candidat'
+            folder = f'{safe_name(category) or "Catégorie"}/{candidate} ({candidature_id})'
+            stem = f'{file_type}-{order + 1}'
+            if safe_name(title):
+                stem = f'{stem} {safe_name(title)}'
+            extension = os.path.splitext(name)[1].lower()
+
+            arcname = f'{folder}/{stem}{extension}'
+            suffix = 2
+            while arcname in used:
+                arcname = f'{folder}/{stem} ({suffix}){extension}'
+                suffix += 1
+            used.add(arcname)
+            entries.append((arcname, name))
+        return entries
@@ -0,0 +1,63 @@
+"""
+Signaux pour l'app candidates
+"""
+import os
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from accounts.models import User
+from accounts.signals import USER_SEARCH_FIELDS
+from categories.models import Category
+from config.search import is_postgres, refresh_search_vector, search_fields_changed
+from mediafiles.metadata import field_file_metadata
+from .models import Candidature, CandidatureFile, UploadSession
+
+
+@receiver(post_save, sender=Candidature)
+def update_candidature_search_vector(sender, instance, update_fields=None, **kwargs):
+    """Maintient le vecteur de recherche de la candidature à jour"""
+    if search_fields_changed(update_fields, {'candidate', 'category'}):
+        refresh_search_vector(instance)
+
+
+@receiver(post_save, sender=User)
+def update_candidate_candidatures_search_vector(sender, instance, created, update_fields=None, **kwargs):
+    """Réindexe les candidatures quand le nom ou l'email du candidat change"""
+    if created or not is_postgres() or not search_fields_changed(update_fields, USER_SEARCH_FIELDS):
+        return
+    for candidature in instance.candidatures.select_related('candidate', 'category'):
+        refresh_search_vector(candidature)
+
+
+@receiver(post_save, sender=Category)
+def update_category_candidatures_search_vector(sender, instance, created, update_fields=None, **kwargs):
+    """Réindexe les candidatures quand le nom de la catégorie change"""
+    if created or not is_postgres() or not search_fields_changed(update_fields, {'name'}):
+        return
+    for candidature in instance.candidatures.select_related('candidate', 'category'):
+        refresh_search_vector(candidature)
+
+
+@receiver(post_delete, sender=UploadSession)
+def delete_upload_session_temp_file(sender, instance, **kwargs):
+    """Supprime le fichier temporaire d'une session d'upload supprimée"""
+    path = instance.get_temp_path()
+    if os.path.exists(path):
+        os.remove(path)
+
+
+@receiver(pre_save, sender=CandidatureFile)
+def capture_candidature_file_metadata(sender, instance, raw=False, **kwargs):
+    """Enregistre taille, type MIME, dimensions et durée du fichier à l'upload"""
+    if raw or not instance.file:
+        return
+    # Fichier inchangé dont les métadonnées sont déjà connues
+    if instance.file._committed and instance.size is not None:
+        return
+    try:
+        metadata = field_file_metadata(instance.file)
+    except FileNotFoundError:
+        return
+    for field, value in metadata.items():
+        setattr(instance, field, value)
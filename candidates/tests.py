@@ -1,3 +1,598 @@
-from django.test import TestCase
+import datetime
+import io
+import os
+import shutil
+import tempfile
+import wave
+import zipfile
+from collections import OrderedDict
+from decimal import Decimal
 
-# Create your tests here.
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from PIL import Image
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from categories.models import Category
+from config.renderers import FastJSONRenderer
+from config.sparse import requested_fields
+from .models import Candidature, CandidatureFile, UploadSession
+from .serializers import CandidatureAdminSerializer, CandidatureListSerializer, CandidatureListValuesSerializer
+from .services import ChunkedUploadService, MediaDurationService, UploadError
+from .uploadhandlers import CandidatureUploadHandler
+
+
+@override_settings(MEDIA_ROOT='/tmp/makona-tests-media')
+class CandidatureListValuesParityTest(TestCase):
+    """
+    Le chemin rapide `.values()` doit produire exactement le même JSON que
+    CandidatureListSerializer sur les listes publiques.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.musique = Category.objects.create(name='Musique', description='d')
+        cls.danse = Category.objects.create(name='Danse', description='d')
+        now = timezone.now()
+        for index in range(6):
+            candidate = User.objects.create_user(
+                email=f'candidat{index}@example.com', username=f'candidat{index}',
+                password='x', first_name=f'Aïssatou{index}', last_name='' if index == 2 else 'Camara',
+                user_type='candidate'
+            )
+            candidature = Candidature.objects.create(
+                candidate=candidate,
+                category=cls.musique if index % 2 else cls.danse,
+                status='rejected' if index == 5 else 'approved',
+            )
+            Candidature.objects.filter(pk=candidature.pk).update(
+                submitted_at=now - timezone.timedelta(days=index, microseconds=index * 137)
+            )
+            for order in range(index % 3):
+                CandidatureFile.objects.create(
+                    candidature=candidature, file_type='photo', order=order,
+                    file=SimpleUploadedFile(f'photo{order}.jpg', b'x')
+                )
+
+    def legacy_results(self, queryset):
+        queryset = queryset.select_related('candidate', 'category').prefetch_related('files')
+        return CandidatureListSerializer(queryset, many=True).data
+
+    def assertParity(self, url, queryset):
+        response = APIClient().get(url)
+        self.assertEqual(response.status_code, 200)
+
+        results = self.legacy_results(queryset)
+        expected = OrderedDict([
+            ('count', len(results)), ('next', None), ('previous', None), ('results', results)
+        ])
+        self.assertEqual(response.content, response.accepted_renderer.render(expected))
+
+    def test_list_view(self):
+        self.assertParity(
+            '/api/candidatures/',
+            Candidature.objects.filter(status='approved').order_by('-submitted_at')
+        )
+
+    def test_list_view_filtered(self):
+        self.assertParity(
+            f'/api/candidatures/?category={self.musique.pk}&ordering=submitted_at',
+            Candidature.objects.filter(status='approved', category=self.musique).order_by('submitted_at')
+        )
+
+    def test_by_category_view(self):
+        self.assertParity(
+            '/api/candidatures/by-category/danse/',
+            Candidature.objects.filter(status='approved', category=self.danse).order_by('-submitted_at')
+        )
+
+    def test_serializers_render_identically(self):
+        queryset = Candidature.objects.order_by('id')
+        values = CandidatureListValuesSerializer.prune_queryset(queryset, None)
+        for renderer in (JSONRenderer(), FastJSONRenderer()):
+            self.assertEqual(
+                renderer.render(CandidatureListValuesSerializer(values, many=True).data),
+                renderer.render(self.legacy_results(queryset))
+            )
+
+
+class FastJSONRendererParityTest(SimpleTestCase):
+    """
+    FastJSONRenderer produit exactement la sortie (ou l'erreur) de JSONRenderer.
+    """
+
+    VALUES = [
+        1.5, 0.0001, 123456789.125, 1e16, -1e16, 1e-05, 2.5e-300, 1e300,
+        2 ** 63 - 1, -2 ** 63, 2 ** 64 - 1, 2 ** 64, -2 ** 63 - 1, 10 ** 30,
+        Decimal('1.10'), datetime.datetime(2026, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc),
+        'ligne\u2028séparée', {'nombres': [1e16, {'profond': 10 ** 30}], 1: None},
+    ]
+
+    def test_values(self):
+        for value in self.VALUES:
+            with self.subTest(value=value):
+                data = {'value': value}
+                self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+                self.assertEqual(
+                    FastJSONRenderer().render(data, 'application/json; indent=4'),
+                    JSONRenderer().render(data, 'application/json; indent=4')
+                )
+
+    def test_non_finite_floats_rejected(self):
+        for value in (float('nan'), float('inf'), -float('inf')):
+            with self.subTest(value=value):
+                for renderer in (JSONRenderer(), FastJSONRenderer()):
+                    with self.assertRaises(ValueError):
+                        renderer.render({'value': [value]})
+
+
+@override_settings(MEDIA_ROOT='/tmp/makona-tests-media')
+class SparseFieldsTest(TestCase):
+    """
+    `?fields=` / `?expand=` réduisent à la fois la réponse et les jointures
+    du queryset ; les champs inconnus sont ignorés.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            email='admin@example.com', username='admin', password='x', user_type='admin'
+        )
+        category = Category.objects.create(name='Musique', description='d')
+        for index in range(2):
+            candidate = User.objects.create_user(
+                email=f'candidat{index}@example.com', username=f'candidat{index}',
+                password='x', user_type='candidate'
+            )
+            candidature = Candidature.objects.create(candidate=candidate, category=category)
+            CandidatureFile.objects.create(
+                candidature=candidature, file_type='photo',
+                file=SimpleUploadedFile('photo.jpg', b'x')
+            )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def get_results(self, query):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/api/candidatures/admin/{query}')
+        self.assertEqual(response.status_code, 200)
+        return response.json()['results'], [query['sql'] for query in queries.captured_queries]
+
+    def prune(self, query):
+        queryset = Candidature.objects.select_related(
+            'candidate', 'category', 'category__category_class', 'reviewed_by'
+        ).prefetch_related('files')
+        return CandidatureAdminSerializer.prune_queryset(queryset, RequestFactory().get('/', query))
+
+    def test_fields_prune_output(self):
+        results, queries = self.get_results('?fields=id,status')
+        self.assertEqual(len(results), 2)
+        for result in results:
+            self.assertEqual(set(result), {'id', 'status'})
+        for model in (User, Category, CandidatureFile):
+            self.assertFalse(any(model._meta.db_table in sql for sql in queries), model)
+
+    def test_expand_adds_nested_field(self):
+        results, queries = self.get_results('?fields=id&expand=files')
+        self.assertEqual(set(results[0]), {'id', 'files'})
+        self.assertEqual(len(results[0]['files']), 1)
+        self.assertEqual(sum(CandidatureFile._meta.db_table in sql for sql in queries), 1)
+
+    def test_without_params_representation_is_full(self):
+        results, queries = self.get_results('')
+        # Les champs dont la relation est vide (reviewed_by, category_class) sont omis par DRF
+        self.assertEqual(
+            set(results[0]),
+            set(CandidatureAdminSerializer.Meta.fields) - {'reviewed_by_name', 'category_class_name'}
+        )
+        self.assertTrue(any(Category._meta.db_table in sql for sql in queries))
+
+    def test_unknown_fields_are_ignored(self):
+        results, _ = self.get_results('?fields=id,inconnu')
+        self.assertEqual(set(results[0]), {'id'})
+        results, _ = self.get_results('?fields=inconnu')
+        self.assertEqual(results, [{}, {}])
+
+    def test_prune_queryset(self):
+        queryset = self.prune({'fields': 'id,status'})
+        self.assertFalse(queryset.query.select_related)
+        self.assertEqual(queryset._prefetch_related_lookups, ())
+
+        queryset = self.prune({'fields': 'id,category_class_name'})
+        self.assertEqual(queryset.query.select_related, {'category': {'category_class': {}}})
+        self.assertEqual(queryset._prefetch_related_lookups, ())
+
+        queryset = self.prune({'fields': 'candidate_email', 'expand': 'files'})
+        self.assertEqual(queryset.query.select_related, {'candidate': {}})
+        self.assertEqual(queryset._prefetch_related_lookups, ('files',))
+
+    def test_prune_queryset_keeps_joins_without_params(self):
+        queryset = self.prune({})
+        self.assertEqual(set(queryset.query.select_related), {'candidate', 'category', 'reviewed_by'})
+        self.assertEqual(queryset._prefetch_related_lookups, ('files',))
+
+    def test_writes_keep_all_fields(self):
+        request = RequestFactory().post('/?fields=id')
+        self.assertIsNone(requested_fields(request, ['id', 'status']))
+
+
+class CandidatureExportTest(TestCase):
+    """
+    Archive ZIP des fichiers de candidature : entrées stockées ou compressées
+    selon l'extension, dossiers assainis et dédoublonnés, fichiers manquants
+    ignorés, réservée aux administrateurs.
+    """
+
+    URL = '/api/admin/candidates/candidatures/export/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            email='admin@example.com', username='admin', password='x', user_type='admin'
+        )
+        cls.category = Category.objects.create(name='Arts/Visuels: "2026"', description='d')
+        cls.candidate = User.objects.create_user(
+            email='candidat@example.com', username='candidat', password='x',
+            first_name='Awa', last_name='Diallo?', user_type='candidate'
+        )
+        cls.candidature = Candidature.objects.create(candidate=cls.candidate, category=cls.category)
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def add_file(self, file_type, filename, content, title=''):
+        return CandidatureFile.objects.create(
+            candidature=self.candidature, file_type=file_type, title=title,
+            file=SimpleUploadedFile(filename, content)
+        )
+
+    def download(self, query):
+        response = self.client.get(self.URL, query)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/zip')
+        return zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+
+    def test_archive_entries(self):
+        portfolio = b'%PDF-1.7\n' + b'portfolio ' * 500
+        self.add_file('photo', 'scene.jpg', b'\xff\xd8\xff premiere')
+        self.add_file('photo', 'scene2.jpg', b'\xff\xd8\xff seconde')
+        self.add_file('portfolio', 'dossier.pdf', portfolio, title='Dossier: final')
+        missing = self.add_file('audio', 'extrait.mp3', b'ID3 extrait')
+        default_storage.delete(missing.file.name)
+
+        archive = self.download({'category': self.category.pk})
+        folder = f'Arts_Visuels_ _2026_/Awa Diallo_ ({self.candidature.pk})'
+        infos = {info.filename: info for info in archive.infolist()}
+        self.assertEqual(set(infos), {
+            f'{folder}/photo-1.jpg',
+            f'{folder}/photo-1 (2).jpg',
+            f'{folder}/portfolio-1 Dossier_ final.pdf',
+        })
+        self.assertIsNone(archive.testzip())
+        self.assertEqual(infos[f'{folder}/photo-1.jpg'].compress_type, zipfile.ZIP_STORED)
+        pdf = infos[f'{folder}/portfolio-1 Dossier_ final.pdf']
+        self.assertEqual(pdf.compress_type, zipfile.ZIP_DEFLATED)
+        self.assertLess(pdf.compress_size, pdf.file_size)
+        self.assertEqual(archive.read(pdf), portfolio)
+
+    def test_filter_by_ids(self):
+        self.add_file('photo', 'scene.jpg', b'\xff\xd8\xff premiere')
+        archive = self.download({'ids': f'{self.candidature.pk + 1}'})
+        self.assertEqual(archive.namelist(), [])
+
+    def test_requires_filter(self):
+        self.assertEqual(self.client.get(self.URL).status_code, 400)
+        self.assertEqual(self.client.get(self.URL, {'ids': 'a,b'}).status_code, 400)
+
+    def test_admin_only(self):
+        self.client.force_authenticate(self.candidate)
+        response = self.client.get(self.URL, {'category': self.category.pk})
+        self.assertEqual(response.status_code, 403)
+
+
+class CandidatureFileMetadataTest(TestCase):
+    """
+    Les métadonnées sont lues à l'enregistrement du fichier, puis servies
+    depuis la base ; la commande `backfill_file_metadata` renseigne les
+    fichiers existants.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        category = Category.objects.create(name='Musique', description='d')
+        candidate = User.objects.create_user(
+            email='candidat@example.com', username='candidat', password='x', user_type='candidate'
+        )
+        cls.candidature = Candidature.objects.create(candidate=candidate, category=category)
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    @staticmethod
+    def png(width, height):
+        buffer = io.BytesIO()
+        Image.new('RGB', (width, height), 'red').save(buffer, 'PNG')
+        return buffer.getvalue()
+
+    @staticmethod
+    def wav(seconds, rate=8000):
+        buffer = io.BytesIO()
+        with wave.open(buffer, 'wb') as writer:
+            writer.setnchannels(1)
+            writer.setsampwidth(2)
+            writer.setframerate(rate)
+            writer.writeframes(b'\0\0' * rate * seconds)
+        return buffer.getvalue()
+
+    def add_file(self, file_type, filename, content):
+        return CandidatureFile.objects.create(
+            candidature=self.candidature, file_type=file_type,
+            file=SimpleUploadedFile(filename, content)
+        )
+
+    def backfill(self, *args):
+        out = io.StringIO()
+        call_command('backfill_file_metadata', *args, stdout=out)
+        return out.getvalue()
+
+    def test_image_dimensions_captured_on_upload(self):
+        content = self.png(40, 30)
+        photo = self.add_file('photo', 'scene.png', content)
+        photo.refresh_from_db()
+        self.assertEqual(
+            (photo.size, photo.mime_type, photo.width, photo.height, photo.duration),
+            (len(content), 'image/png', 40, 30, None)
+        )
+
+    def test_wav_duration_captured_on_upload(self):
+        audio = self.add_file('audio', 'extrait.wav', self.wav(2))
+        audio.refresh_from_db()
+        self.assertTrue(audio.mime_type.startswith('audio/'))
+        self.assertEqual(audio.duration, 2.0)
+        self.assertIsNone(audio.width)
+
+    def test_file_size_read_from_database(self):
+        photo = self.add_file('photo', 'scene.png', self.png(4, 4))
+        CandidatureFile.objects.filter(pk=photo.pk).update(size=3 * 1024 * 1024)
+        default_storage.delete(photo.file.name)
+        photo.refresh_from_db()
+        self.assertEqual(photo.get_file_size(), 3.0)
+
+    def test_file_size_falls_back_to_storage(self):
+        photo = self.add_file('photo', 'scene.png', b'\0' * (512 * 1024))
+        CandidatureFile.objects.filter(pk=photo.pk).update(size=None)
+        photo.refresh_from_db()
+        self.assertEqual(photo.get_file_size(), 0.5)
+
+    def test_backfill(self):
+        photo = self.add_file('photo', 'scene.png', self.png(40, 30))
+        known = self.add_file('audio', 'extrait.wav', self.wav(1))
+        CandidatureFile.objects.filter(pk=photo.pk).update(size=None, mime_type='', width=None, height=None)
+        CandidatureFile.objects.filter(pk=known.pk).update(duration=99)
+
+        output = self.backfill()
+        self.assertIn('1 fichiers renseignés, 0 introuvables', output)
+        photo.refresh_from_db()
+        self.assertEqual((photo.mime_type, photo.width, photo.height), ('image/png', 40, 30))
+        known.refresh_from_db()
+        self.assertEqual(known.duration, 99)
+
+        output = self.backfill('--force', '--batch-size', '1')
+        self.assertIn('2 fichiers renseignés, 0 introuvables', output)
+        known.refresh_from_db()
+        self.assertEqual(known.duration, 1.0)
+
+    def test_backfill_missing_file(self):
+        photo = self.add_file('photo', 'scene.png', self.png(4, 4))
+        CandidatureFile.objects.filter(pk=photo.pk).update(size=None)
+        default_storage.delete(photo.file.name)
+
+        output = self.backfill()
+        self.assertIn(f'{photo.file.name} introuvable', output)
+        self.assertIn('0 fichiers renseignés, 1 introuvables', output)
+        photo.refresh_from_db()
+        self.assertIsNone(photo.size)
+
+
+class MediaDurationServiceTest(TestCase):
+    """
+    Une durée illisible est refusée quand la catégorie limite la durée.
+    """
+
+    def test_unmeasurable_media(self):
+        content = SimpleUploadedFile('clip.avi', b'RIFF\0\0\0\0AVI ' + b'\0' * 64)
+        limited = Category(name='Vidéo', description='d', max_video_duration=60)
+        with self.assertRaises(ValueError):
+            MediaDurationService.check(content, 'video', limited)
+        MediaDurationService.check(content, 'video', Category(name='Libre', description='d'))
+
+
+@override_settings(MEDIA_ROOT='/tmp/makona-tests-media', JOBS_EAGER=True)
+class CandidatureUploadHandlerTest(TestCase):
+    """
+    Les fichiers trop volumineux ou dont le contenu ne correspond pas à
+    l'extension sont refusés pendant la réception, sans être enregistrés.
+    """
+
+    JPEG = b'\xff\xd8\xff\xe0\x00\x10JFIF\x00\x01\x01\x00\x00\x01'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name='Musique', description='d', max_photo_size=1)
+        cls.candidate = User.objects.create_user(
+            email='candidat@example.com', username='candidat', password='x', user_type='candidate'
+        )
+        cls.candidature = Candidature.objects.create(candidate=cls.candidate, category=cls.category)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_login(self.candidate)
+        self.url = f'/api/candidatures/my-candidatures/{self.candidature.pk}/update/'
+
+    def put_photo(self, content, name='photo.jpg'):
+        return self.client.put(
+            self.url, {'photo_files': SimpleUploadedFile(name, content)}, format='multipart'
+        )
+
+    def test_category_size_limit(self):
+        response = self.put_photo(self.JPEG + b'\0' * (1024 * 1024))
+        self.assertEqual(response.status_code, 413)
+        self.assertFalse(self.candidature.files.exists())
+
+    def test_signature_mismatch(self):
+        response = self.put_photo(b'%PDF-1.7\n' + b'\0' * 64)
+        self.assertEqual(response.status_code, 415)
+        self.assertFalse(self.candidature.files.exists())
+
+    def test_valid_upload(self):
+        response = self.put_photo(self.JPEG + b'\0' * 1024)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.candidature.files.count(), 1)
+
+    def test_unknown_category_uses_largest_limit(self):
+        # Création : la catégorie n'est connue qu'après la réception
+        Category.objects.create(name='Photo', description='d', max_photo_size=50)
+        handler = CandidatureUploadHandler()
+        handler.extension = 'jpg'
+        self.assertEqual(handler._max_size('photo_files'), 50 * 1024 * 1024)
+
+
+@override_settings(MEDIA_ROOT='/tmp/makona-tests-media', JOBS_EAGER=True, CHUNKED_UPLOAD_MAX_CHUNK_SIZE=2048)
+class ChunkedUploadTest(TestCase):
+    """
+    Upload reprenable : chaque morceau doit être envoyé à l'offset courant,
+    un envoi concurrent au même offset échoue, les sessions abandonnées
+    expirent et sont purgées avec leur fichier temporaire.
+    """
+
+    CONTENT = b'%PDF-1.7\n' + bytes(range(256)) * 8
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name='Musique', description='d')
+        cls.candidate = User.objects.create_user(
+            email='candidat@example.com', username='candidat', password='x', user_type='candidate'
+        )
+        cls.candidature = Candidature.objects.create(candidate=cls.candidate, category=cls.category)
+
+    def setUp(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, ignore_errors=True)
+        settings_override = override_settings(CHUNKED_UPLOAD_TEMP_DIR=temp_dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.temp_dir = temp_dir
+        self.client = APIClient()
+        self.client.force_login(self.candidate)
+
+    def create_session(self, size=None):
+        response = self.client.post('/api/candidatures/uploads/', {
+            'candidature': self.candidature.pk, 'file_type': 'portfolio',
+            'filename': 'dossier.pdf', 'size': size or len(self.CONTENT),
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        return f"/api/candidatures/uploads/{response.data['id']}/"
+
+    def patch(self, url, offset, data):
+        return self.client.generic(
+            'PATCH', url, data, content_type='application/offset+octet-stream',
+            HTTP_UPLOAD_OFFSET=str(offset)
+        )
+
+    def test_resumable_upload(self):
+        url = self.create_session()
+        response = self.patch(url, 0, self.CONTENT[:1000])
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(response['Upload-Offset'], '1000')
+
+        # Morceau renvoyé à un offset périmé : 409 avec l'offset à reprendre
+        response = self.patch(url, 0, self.CONTENT[:1000])
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response['Upload-Offset'], '1000')
+        self.assertEqual(self.client.head(url)['Upload-Offset'], '1000')
+
+        response = self.client.post(f'{url}finalize/')
+        self.assertEqual(response.status_code, 409)
+
+        self.assertEqual(self.patch(url, 1000, self.CONTENT[1000:]).status_code, 204)
+        response = self.client.post(f'{url}finalize/')
+        self.assertEqual(response.status_code, 201)
+
+        candidature_file = self.candidature.files.get()
+        with candidature_file.file.open('rb') as fh:
+            self.assertEqual(fh.read(), self.CONTENT)
+        self.assertFalse(UploadSession.objects.exists())
+        self.assertEqual(os.listdir(self.temp_dir), [])
+
+    def test_finalize_signature_mismatch(self):
+        content = b'PK\x03\x04' + b'\0' * 100
+        url = self.create_session(size=len(content))
+        self.assertEqual(self.patch(url, 0, content).status_code, 204)
+        response = self.client.post(f'{url}finalize/')
+        self.assertEqual(response.status_code, 415)
+        self.assertFalse(self.candidature.files.exists())
+
+    def test_chunk_limits(self):
+        url = self.create_session(size=100)
+        response = self.patch(url, 0, self.CONTENT[:101])
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(response['Upload-Offset'], '0')
+
+    def test_concurrent_chunk_same_offset(self):
+        session = ChunkedUploadService.create_session(self.candidature, 'portfolio', 'dossier.pdf', 2000)
+        stale = UploadSession.objects.get(pk=session.pk)
+
+        self.assertEqual(ChunkedUploadService.append_chunk(session, 0, io.BytesIO(b'A' * 700)), 700)
+        with self.assertRaises(UploadError) as raised:
+            ChunkedUploadService.append_chunk(stale, 0, io.BytesIO(b'B' * 500))
+        self.assertEqual((raised.exception.status_code, raised.exception.offset), (409, 700))
+        session.refresh_from_db()
+        self.assertEqual(session.offset, 700)
+        # Les octets acceptés ne sont pas écrasés par l'envoi perdant
+        with open(session.get_temp_path(), 'rb') as part:
+            self.assertEqual(part.read(), b'A' * 700)
+        self.assertEqual(os.listdir(self.temp_dir), [os.path.basename(session.get_temp_path())])
+
+    def test_expired_session(self):
+        url = self.create_session()
+        UploadSession.objects.update(updated_at=timezone.now() - timezone.timedelta(hours=25))
+        self.assertEqual(self.patch(url, 0, self.CONTENT[:10]).status_code, 410)
+        self.assertFalse(UploadSession.objects.exists())
+        self.assertEqual(os.listdir(self.temp_dir), [])
+
+    def test_purge_expired(self):
+        old = timezone.now() - timezone.timedelta(hours=25)
+        expired = ChunkedUploadService.create_session(self.candidature, 'portfolio', 'a.pdf', 10)
+        live = ChunkedUploadService.create_session(self.candidature, 'portfolio', 'b.pdf', 10)
+        UploadSession.objects.filter(pk=expired.pk).update(updated_at=old)
+        for name, mtime in (('orphan.part', old.timestamp()), ('recent.part', None)):
+            path = os.path.join(self.temp_dir, name)
+            open(path, 'wb').close()
+            if mtime:
+                os.utime(path, (mtime, mtime))
+
+        self.assertEqual(ChunkedUploadService.purge_expired(dry_run=True), (1, 1))
+        self.assertEqual(UploadSession.objects.count(), 2)
+
+        self.assertEqual(ChunkedUploadService.purge_expired(), (1, 1))
+        self.assertEqual(list(UploadSession.objects.all()), [live])
+        self.assertEqual(sorted(os.listdir(self.temp_dir)), sorted([f'{live.pk}.part', 'recent.part']))
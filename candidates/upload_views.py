@@ -0,0 +1,137 @@
+"""
+Vues pour l'upload reprenable par morceaux des fichiers de candidature
+
+Protocole (inspiré de tus) :
+    POST   /uploads/                 ouvre une session (taille totale annoncée)
+    HEAD   /uploads/<id>/            offset courant (en-tête Upload-Offset)
+    PATCH  /uploads/<id>/            envoie un morceau (Content-Type
+                                     application/offset+octet-stream, en-tête
+                                     Upload-Offset = position du morceau)
+    POST   /uploads/<id>/finalize/   crée le fichier de candidature
+    DELETE /uploads/<id>/            abandonne la session
+"""
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from accounts.permissions import IsCandidateUser
+from .models import UploadSession
+from .serializers import (
+    CandidatureFileSerializer, UploadSessionCreateSerializer, UploadSessionSerializer
+)
+from .services import ChunkedUploadService, UploadError
+
+CHUNK_CONTENT_TYPE = 'application/offset+octet-stream'
+
+
+def _upload_headers(session):
+    return {
+        'Upload-Offset': str(session.offset),
+        'Upload-Length': str(session.size),
+        'Cache-Control': 'no-store',
+    }
+
+
+def _error_response(error):
+    headers = {'Upload-Offset': str(error.offset)} if error.offset is not None else None
+    return Response({'detail': str(error)}, status=error.status_code, headers=headers)
+
+
+class UploadSessionCreateView(APIView):
+    """
+    Vue pour ouvrir une session d'upload par morceaux
+    """
+    permission_classes = [permissions.IsAuthenticated, IsCandidateUser]
+    
+    def post(self, request):
+        serializer = UploadSessionCreateSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        session = ChunkedUploadService.create_session(**serializer.validated_data)
+        
+        headers = _upload_headers(session)
+        headers['Location'] = request.build_absolute_uri(
+            reverse('candidates:upload_session_detail', args=[session.id])
+        )
+        return Response(
+            UploadSessionSerializer(session).data,
+            status=status.HTTP_201_CREATED,
+            headers=headers
+        )
+
+
+class UploadSessionMixin:
+    """
+    Récupère la session d'upload du candidat connecté (410 si expirée)
+    """
+    permission_classes = [permissions.IsAuthenticated, IsCandidateUser]
+    
+    def get_session(self, request, session_id):
+        session = get_object_or_404(
+            UploadSession.objects.select_related('candidature'),
+            id=session_id,
+            candidature__candidate=request.user
+        )
+        if ChunkedUploadService.is_expired(session):
+            ChunkedUploadService.abort(session)
+            raise UploadError("Session d'upload expirée", status.HTTP_410_GONE)
+        return session
+    
+    def handle_exception(self, exc):
+        if isinstance(exc, UploadError):
+            return _error_response(exc)
+        return super().handle_exception(exc)
+
+
+class UploadSessionDetailView(UploadSessionMixin, APIView):
+    """
+    Vue pour consulter, alimenter ou abandonner une session d'upload
+    """
+    
+    def get(self, request, session_id):
+        """État de la session (HEAD renvoie seulement les en-têtes)"""
+        session = self.get_session(request, session_id)
+        return Response(UploadSessionSerializer(session).data, headers=_upload_headers(session))
+    
+    def patch(self, request, session_id):
+        """Écrit un morceau, lu en flux directement depuis le corps de la requête"""
+        session = self.get_session(request, session_id)
+        
+        if request.content_type.split(';')[0].strip() != CHUNK_CONTENT_TYPE:
+            return Response(
+                {'detail': f"Content-Type attendu : {CHUNK_CONTENT_TYPE}"},
+                status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+            )
+        try:
+            offset = int(request.headers['Upload-Offset'])
+            length = int(request.headers.get('Content-Length') or 0) or None
+        except (KeyError, ValueError):
+            return Response(
+                {'detail': "En-tête Upload-Offset manquant ou invalide"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # Flux brut de Django : le corps n'est jamais chargé en mémoire
+        ChunkedUploadService.append_chunk(session, offset, request._request, length)
+        return Response(status=status.HTTP_204_NO_CONTENT, headers=_upload_headers(session))
+    
+    def delete(self, request, session_id):
+        """Abandonne la session"""
+        session = self.get_session(request, session_id)
+        ChunkedUploadService.abort(session)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class UploadSessionFinalizeView(UploadSessionMixin, APIView):
+    """
+    Vue pour finaliser une session complète et créer le fichier de candidature
+    """
+    
+    def post(self, request, session_id):
+        session = self.get_session(request, session_id)
+        candidature_file = ChunkedUploadService.finalize(session)
+        return Response(
+            CandidatureFileSerializer(candidature_file, context={'request': request}).data,
+            status=status.HTTP_201_CREATED
+        )
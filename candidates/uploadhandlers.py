@@ -0,0 +1,130 @@
+"""
+Gestionnaire d'upload des fichiers de candidature
+
+La taille (limite de la catégorie et du type de fichier) et la signature du
+format sont contrôlées au fil de la réception : un fichier refusé interrompt
+la lecture de la requête, sans être reçu en entier ni écrit sur disque.
+"""
+import os
+import re
+
+from django.conf import settings
+from django.core.files.uploadhandler import FileUploadHandler, StopUpload
+from rest_framework import exceptions
+
+from categories.models import Category
+from mediafiles.sniff import SNIFF_SIZE, matches_extension
+from .services import UploadLimitService
+
+# Champs `<type>_files` des vues de mise à jour
+FILE_TYPE_FIELD = re.compile(r'^(?P<file_type>[a-z]+)_files$')
+
+
+class FileTooLarge(exceptions.APIException):
+    status_code = 413
+    default_detail = "Fichier trop volumineux."
+    default_code = 'file_too_large'
+
+
+class CandidatureUploadHandler(FileUploadHandler):
+    """
+    Contrôle chaque fichier reçu avant de le passer aux gestionnaires suivants
+
+    Le type de fichier est déduit du nom du champ (`photo_files`...) ou, à
+    défaut, de l'extension. En cas de refus, la réception s'arrête
+    (StopUpload) et l'erreur est levée à la fin de l'analyse de la requête.
+    """
+
+    def __init__(self, request=None, category=None):
+        super().__init__(request)
+        self.category = category
+        self.error = None
+
+    def new_file(self, field_name, file_name, *args, **kwargs):
+        super().new_file(field_name, file_name, *args, **kwargs)
+        self.extension = os.path.splitext(file_name)[1].lstrip('.').lower()
+        self.max_size = self._max_size(field_name)
+        self.head = b''
+        self.sniffed = False
+        if self.max_size and self.content_length and self.content_length > self.max_size:
+            self._reject(self._too_large())
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.max_size and start + len(raw_data) > self.max_size:
+            self._reject(self._too_large())
+        if not self.sniffed:
+            self.head += raw_data[:SNIFF_SIZE - len(self.head)]
+            if len(self.head) >= SNIFF_SIZE:
+                self._sniff()
+        return raw_data
+
+    def file_complete(self, file_size):
+        if not self.sniffed:
+            # Fichier plus court que la signature : déjà reçu en entier
+            try:
+                self._sniff()
+            except StopUpload:
+                pass
+        return None
+
+    def upload_complete(self):
+        if self.error is not None:
+            raise self.error
+
+    def _max_size(self, field_name):
+        match = FILE_TYPE_FIELD.match(field_name)
+        if match and match.group('file_type') in settings.CANDIDATURE_MAX_FILE_SIZES:
+            file_types = [match.group('file_type')]
+        else:
+            # Extension inconnue : plafond le plus large, l'extension sera refusée ensuite
+            file_types = UploadLimitService.file_types(self.extension) or list(settings.CANDIDATURE_MAX_FILE_SIZES)
+        if self.category is None:
+            # Catégorie inconnue (création) : plafond le plus large, la limite
+            # exacte est vérifiée ensuite par le serializer
+            sizes = [UploadLimitService.largest_max_size(file_type) for file_type in file_types]
+        else:
+            sizes = [UploadLimitService.max_size(file_type, self.category) for file_type in file_types]
+        if None in sizes:
+            return None
+        return max(sizes)
+
+    def _sniff(self):
+        self.sniffed = True
+        if not matches_extension(self.head, self.extension):
+            self._reject(exceptions.UnsupportedMediaType(
+                self.content_type,
+                detail=f"Le contenu du fichier {self.file_name} ne correspond pas à son extension."
+            ))
+
+    def _too_large(self):
+        return FileTooLarge(
+            f"Le fichier {self.file_name} ne peut pas dépasser {self.max_size // (1024 * 1024)}MB."
+        )
+
+    def _reject(self, error):
+        if self.error is None:
+            self.error = error
+        raise StopUpload(connection_reset=True)
+
+
+class CandidatureUploadMixin:
+    """
+    Mixin de vue DRF : installe CandidatureUploadHandler avant la lecture du corps
+
+    Les limites sont celles de la catégorie de la candidature désignée par
+    `upload_candidature_kwarg` dans l'URL ; sans candidature, la plus large
+    des limites des catégories actives s'applique (la limite de la catégorie
+    choisie est vérifiée ensuite par le serializer).
+    """
+    upload_candidature_kwarg = 'pk'
+
+    def get_upload_category(self):
+        candidature_id = self.kwargs.get(self.upload_candidature_kwarg)
+        if candidature_id is None:
+            return None
+        return Category.objects.filter(candidatures__id=candidature_id).first()
+
+    def initialize_request(self, request, *args, **kwargs):
+        if request.method in ('POST', 'PUT', 'PATCH') and request.content_type == 'multipart/form-data':
+            request.upload_handlers.insert(0, CandidatureUploadHandler(request, self.get_upload_category()))
+        return super().initialize_request(request, *args, **kwargs)
@@ -2,7 +2,7 @@
 URLs pour l'app candidates
 """
 from django.urls import path
-from . import views
+from . import upload_views, views
 
 app_name = 'candidates'
 
@@ -17,6 +17,11 @@ urlpatterns = [
     path('my-candidatures/<int:pk>/', views.MyCandidatureDetailView.as_view(), name='my_candidature_detail'),
     path('my-candidatures/<int:pk>/update/', views.MyCandidatureUpdateView.as_view(), name='my_candidature_update'),
     
+    # Upload reprenable par morceaux
+    path('uploads/', upload_views.UploadSessionCreateView.as_view(), name='upload_session_create'),
+    path('uploads/<uuid:session_id>/', upload_views.UploadSessionDetailView.as_view(), name='upload_session_detail'),
+    path('uploads/<uuid:session_id>/finalize/', upload_views.UploadSessionFinalizeView.as_view(), name='upload_session_finalize'),
+    
     # Vues admin
     path('admin/', views.AdminCandidatureListView.as_view(), name='admin_candidature_list'),
     path('admin/create/', views.AdminCandidatureCreateView.as_view(), name='admin_candidature_create'),
@@ -1,7 +1,7 @@
 """
 Vues pour l'app candidates
 """
-from rest_framework import generics, status, permissions, filters
+from rest_framework import generics, status, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
@@ -10,24 +10,29 @@ from django.db import models
 from django.utils import timezone
 
 from .models import Candidature, CandidatureFile, Vote
+from .services import MediaDurationService, UploadLimitService
+from .uploadhandlers import CandidatureUploadMixin
 from .serializers import (
     CandidatureSerializer, CandidatureCreateSerializer, CandidatureUpdateSerializer,
-    CandidatureListSerializer, CandidatureAdminSerializer, CandidatureAdminCreateSerializer, CandidatureFileSerializer
+    CandidatureListSerializer, CandidatureListValuesSerializer, CandidatureAdminSerializer, CandidatureAdminCreateSerializer, CandidatureFileSerializer
 )
 from accounts.permissions import IsAdminUser, IsCandidateUser, IsOwnerOrAdmin
 from categories.models import Category
+from accounts.models import User
+from config.search import RankedOrderingFilter, RankedSearchFilter
+from config.sparse import SparseFieldsViewMixin
+from dashboard.services import DashboardStatsService
 
 
-class CandidatureListView(generics.ListAPIView):
+class CandidatureListView(SparseFieldsViewMixin, generics.ListAPIView):
     """
     Vue pour lister les candidatures approuvées (publique)
     """
-    queryset = Candidature.objects.filter(status='approved').select_related(
-        'candidate', 'category'
-    ).prefetch_related('files')
-    serializer_class = CandidatureListSerializer
+    queryset = Candidature.objects.filter(status='approved')
+    # Chemin rapide : liste construite depuis .values() (cf. prune_queryset)
+    serializer_class = CandidatureListValuesSerializer
     permission_classes = [permissions.AllowAny]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, RankedSearchFilter, RankedOrderingFilter]
     filterset_fields = ['category']
     search_fields = ['candidate__first_name', 'candidate__last_name', 'category__name']
     ordering_fields = ['submitted_at']
@@ -45,13 +50,14 @@ class CandidatureDetailView(generics.RetrieveAPIView):
     permission_classes = [permissions.AllowAny]
 
 
-class CandidatureByCategoryView(generics.ListAPIView):
+class CandidatureByCategoryView(SparseFieldsViewMixin, generics.ListAPIView):
     """
     Vue pour lister les candidatures d'une catégorie spécifique
     """
-    serializer_class = CandidatureListSerializer
+    # Chemin rapide : liste construite depuis .values() (cf. prune_queryset)
+    serializer_class = CandidatureListValuesSerializer
     permission_classes = [permissions.AllowAny]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [RankedSearchFilter, RankedOrderingFilter]
     search_fields = ['candidate__first_name', 'candidate__last_name']
     ordering_fields = ['submitted_at']
     ordering = ['-submitted_at']
@@ -62,10 +68,10 @@ class CandidatureByCategoryView(generics.ListAPIView):
         return Candidature.objects.filter(
             category=category,
             status='approved'
-        ).select_related('candidate', 'category').prefetch_related('files')
+        )
 
 
-class MyCandidaturesView(generics.ListCreateAPIView):
+class MyCandidaturesView(CandidatureUploadMixin, SparseFieldsViewMixin, generics.ListCreateAPIView):
     """
     Vue pour gérer les candidatures de l'utilisateur connecté
     """
@@ -85,7 +91,7 @@ class MyCandidaturesView(generics.ListCreateAPIView):
         serializer.save(candidate=self.request.user)
 
 
-class MyCandidatureDetailView(generics.RetrieveUpdateDestroyAPIView):
+class MyCandidatureDetailView(CandidatureUploadMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     Vue pour gérer une candidature spécifique de l'utilisateur
     """
@@ -107,7 +113,7 @@ class MyCandidatureDetailView(generics.RetrieveUpdateDestroyAPIView):
         instance.delete()
 
 
-class MyCandidatureUpdateView(generics.UpdateAPIView):
+class MyCandidatureUpdateView(CandidatureUploadMixin, generics.UpdateAPIView):
     """
     Vue spécialisée pour la mise à jour des candidatures avec fichiers
     """
@@ -128,13 +134,22 @@ class MyCandidatureUpdateView(generics.UpdateAPIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        # Vérifier la taille et la durée des médias avant tout enregistrement
+        file_types = ['photo', 'video', 'audio', 'portfolio', 'documents']
+        for file_type in file_types:
+            for file in request.FILES.getlist(f'{file_type}_files'):
+                try:
+                    UploadLimitService.check(file, file_type, candidature.category)
+                    MediaDurationService.check(file, file_type, candidature.category)
+                except ValueError as e:
+                    return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
         # Mettre à jour la description si fournie
         if 'description' in request.data:
             candidature.description = request.data['description']
             candidature.save()
         
         # Traiter les nouveaux fichiers
-        file_types = ['photo', 'video', 'audio', 'portfolio', 'documents']
         for file_type in file_types:
             files_key = f'{file_type}_files'
             if files_key in request.FILES:
@@ -151,7 +166,7 @@ class MyCandidatureUpdateView(generics.UpdateAPIView):
         return Response(serializer.data)
 
 
-class CandidatureAdminListView(generics.ListAPIView):
+class CandidatureAdminListView(SparseFieldsViewMixin, generics.ListAPIView):
     """
     Vue admin pour lister toutes les candidatures
     """
@@ -160,9 +175,10 @@ class CandidatureAdminListView(generics.ListAPIView):
     ).prefetch_related('files')
     serializer_class = CandidatureAdminSerializer
     permission_classes = [permissions.IsAuthenticated, IsAdminUser]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, RankedSearchFilter, RankedOrderingFilter]
     filterset_fields = ['status', 'category', 'candidate__country']
     search_fields = ['candidate__first_name', 'candidate__last_name', 'candidate__email']
+    search_vector_field = 'search_vector'
     ordering_fields = ['submitted_at', 'reviewed_at']
     ordering = ['-submitted_at']
 
@@ -228,26 +244,21 @@ def candidature_stats_view(request):
     """
     Vue pour récupérer les statistiques des candidatures
     """
+    candidatures = DashboardStatsService.get_stats()['candidatures']
+    country_names = dict(User.COUNTRY_CHOICES)
+    
     stats = {
-        'total': Candidature.objects.count(),
-        'pending': Candidature.objects.filter(status='pending').count(),
-        'approved': Candidature.objects.filter(status='approved').count(),
-        'rejected': Candidature.objects.filter(status='rejected').count(),
+        'total': candidatures['total'],
+        'pending': candidatures['pending'],
+        'approved': candidatures['approved'],
+        'rejected': candidatures['rejected'],
         'by_category': {},
         'by_country': {}
     }
     
     # Statistiques par catégorie
-    from django.db.models import Count
-    category_stats = Candidature.objects.values('category__name').annotate(
-        total=Count('id'),
-        pending=Count('id', filter=models.Q(status='pending')),
-        approved=Count('id', filter=models.Q(status='approved')),
-        rejected=Count('id', filter=models.Q(status='rejected'))
-    )
-    
-    for stat in category_stats:
-        stats['by_category'][stat['category__name']] = {
+    for stat in candidatures['by_category']:
+        stats['by_category'][stat['name']] = {
             'total': stat['total'],
             'pending': stat['pending'],
             'approved': stat['approved'],
@@ -255,14 +266,8 @@ def candidature_stats_view(request):
         }
     
     # Statistiques par pays
-    country_stats = Candidature.objects.values('candidate__country').annotate(
-        total=Count('id')
-    )
-    
-    for stat in country_stats:
-        country_name = dict(Candidature._meta.get_field('candidate').related_model.COUNTRY_CHOICES).get(
-            stat['candidate__country'], stat['candidate__country']
-        )
+    for stat in candidatures['by_country']:
+        country_name = country_names.get(stat['country'], stat['country'])
         stats['by_country'][country_name] = stat['total']
     
     return Response(stats, status=status.HTTP_200_OK)
@@ -270,18 +275,19 @@ def candidature_stats_view(request):
 
 # ===== VUES ADMIN POUR LA GESTION DES CANDIDATURES =====
 
-class AdminCandidatureListView(generics.ListAPIView):
+class AdminCandidatureListView(SparseFieldsViewMixin, generics.ListAPIView):
     """
     Vue admin pour lister toutes les candidatures avec filtres
     """
     serializer_class = CandidatureAdminSerializer
     permission_classes = [permissions.IsAuthenticated, IsAdminUser]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, RankedSearchFilter, RankedOrderingFilter]
     filterset_fields = ['status', 'category', 'candidate', 'published']
     search_fields = [
         'candidate__first_name', 'candidate__last_name', 'candidate__email',
         'category__name', 'description'
     ]
+    search_vector_field = 'search_vector'
     ordering_fields = ['submitted_at', 'reviewed_at', 'status']
     ordering = ['-submitted_at']
 
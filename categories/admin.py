@@ -74,6 +74,10 @@ class CategoryAdmin(admin.ModelAdmin):
             'fields': ('max_video_duration', 'max_audio_duration'),
             'classes': ('collapse',)
         }),
+        ('Limites de taille', {
+            'fields': ('max_photo_size', 'max_video_size', 'max_audio_size', 'max_document_size'),
+            'classes': ('collapse',)
+        }),
         ('Statut', {
             'fields': ('is_active',)
         }),
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-19 17:46
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+def create_trigram_index(apps, schema_editor):
+    """Index trigramme sur le nom (recherche admin), PostgreSQL uniquement"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS categories_category_name_trgm "
+        "ON categories_category USING gin (UPPER(name::text) gin_trgm_ops)"
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS categories_category_name_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('categories', '0008_category_awards_plaque'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-19 18:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('categories', '0009_category_name_trgm'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='max_audio_size',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='Taille max audio (Mo)'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='max_document_size',
+            field=models.PositiveIntegerField(blank=True, help_text="S'applique aux portfolios et aux documents", null=True, verbose_name='Taille max document (Mo)'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='max_photo_size',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='Taille max photo (Mo)'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='max_video_size',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='Taille max vidéo (Mo)'),
+        ),
+    ]
@@ -62,6 +62,16 @@ class CategoryClass(models.Model):
         return self.categories.filter(is_active=True).count()
 
 
+# Extensions autorisées par type de média
+ALLOWED_EXTENSIONS = {
+    'photo': ('jpg', 'jpeg', 'png', 'gif', 'webp', 'bmp', 'tiff'),
+    'video': ('mp4', 'avi', 'mov', 'wmv', 'flv', 'webm', 'mkv', 'm4v'),
+    'audio': ('mp3', 'wav', 'flac', 'aac', 'ogg', 'wma', 'm4a'),
+    'portfolio': ('pdf', 'doc', 'docx', 'ppt', 'pptx', 'zip', 'rar', '7z'),
+    'documents': ('pdf', 'doc', 'docx', 'txt', 'rtf', 'odt', 'xls', 'xlsx', 'ppt', 'pptx'),
+}
+
+
 def validate_photo_extensions(value):
     """Valide les extensions de fichiers pour les photos"""
     allowed_extensions = ['jpg', 'jpeg', 'png', 'gif', 'webp', 'bmp', 'tiff']
@@ -210,6 +220,32 @@ class Category(models.Model):
         validators=[validate_audio_duration]
     )
     
+    # Tailles maximales des fichiers (Mo) ; vide = limite par défaut du site
+    max_photo_size = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        verbose_name="Taille max photo (Mo)"
+    )
+    
+    max_video_size = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        verbose_name="Taille max vidéo (Mo)"
+    )
+    
+    max_audio_size = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        verbose_name="Taille max audio (Mo)"
+    )
+    
+    max_document_size = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        verbose_name="Taille max document (Mo)",
+        help_text="S'applique aux portfolios et aux documents"
+    )
+    
     # Configuration des prix
     awards_trophy = models.BooleanField(
         default=False,
@@ -293,6 +329,28 @@ class Category(models.Model):
         
         return True, "Tous les fichiers requis sont présents"
     
+    def get_max_duration(self, file_type):
+        """
+        Retourne la durée maximale (secondes) d'un type de média, None si illimitée
+        """
+        return {
+            'video': self.max_video_duration,
+            'audio': self.max_audio_duration,
+        }.get(file_type)
+    
+    def get_max_file_size(self, file_type):
+        """
+        Retourne la taille maximale (octets) d'un type de fichier, None si non définie
+        """
+        size = {
+            'photo': self.max_photo_size,
+            'video': self.max_video_size,
+            'audio': self.max_audio_size,
+            'portfolio': self.max_document_size,
+            'documents': self.max_document_size,
+        }.get(file_type)
+        return size * 1024 * 1024 if size else None
+    
     def get_file_validators(self):
         """
         Retourne un dictionnaire des validateurs d'extensions par type de média
@@ -309,13 +367,7 @@ class Category(models.Model):
         """
         Retourne un dictionnaire des extensions autorisées par type de média
         """
-        return {
-            'photo': ['jpg', 'jpeg', 'png', 'gif', 'webp', 'bmp', 'tiff'],
-            'video': ['mp4', 'avi', 'mov', 'wmv', 'flv', 'webm', 'mkv', 'm4v'],
-            'audio': ['mp3', 'wav', 'flac', 'aac', 'ogg', 'wma', 'm4a'],
-            'portfolio': ['pdf', 'doc', 'docx', 'ppt', 'pptx', 'zip', 'rar', '7z'],
-            'documents': ['pdf', 'doc', 'docx', 'txt', 'rtf', 'odt', 'xls', 'xlsx', 'ppt', 'pptx'],
-        }
+        return {file_type: list(extensions) for file_type, extensions in ALLOWED_EXTENSIONS.items()}
     
     def get_duration_limits(self):
         """
@@ -3,6 +3,7 @@ Serializers pour l'app categories
 """
 from rest_framework import serializers
 from .models import Category, CategoryClass
+from config.sparse import SparseFieldsMixin
 
 
 class CategoryClassSerializer(serializers.ModelSerializer):
@@ -69,7 +70,7 @@ class CategoryClassCreateUpdateSerializer(serializers.ModelSerializer):
         return value
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer pour les catégories
     """
@@ -83,10 +84,14 @@ class CategorySerializer(serializers.ModelSerializer):
             'id', 'category_class', 'category_class_name', 'name', 'slug', 'description',
             'is_active', 'requires_photo', 'requires_video', 'requires_portfolio',
             'requires_audio', 'requires_documents', 'max_video_duration', 'max_audio_duration',
+            'max_photo_size', 'max_video_size', 'max_audio_size', 'max_document_size',
             'awards_trophy', 'awards_certificate', 'awards_monetary', 'awards_plaque',
             'file_requirements', 'required_file_types', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'slug', 'category_class_name', 'created_at', 'updated_at']
+        select_related_fields = {
+            'category_class': ['category_class_name'],
+        }
     
     def get_file_requirements(self, obj):
         return obj.get_file_requirements()
@@ -95,7 +100,7 @@ class CategorySerializer(serializers.ModelSerializer):
         return obj.get_required_file_types()
 
 
-class CategoryListSerializer(serializers.ModelSerializer):
+class CategoryListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer simplifié pour la liste des catégories
     """
@@ -106,6 +111,7 @@ class CategoryListSerializer(serializers.ModelSerializer):
             'is_active', 'requires_photo', 
             'requires_video', 'requires_portfolio', 'requires_audio', 
             'requires_documents', 'max_video_duration', 'max_audio_duration',
+            'max_photo_size', 'max_video_size', 'max_audio_size', 'max_document_size',
             'awards_trophy', 'awards_certificate', 'awards_monetary', 'awards_plaque'
         ]
 
@@ -124,6 +130,7 @@ class CategoryDetailSerializer(serializers.ModelSerializer):
             'id', 'category_class', 'name', 'slug', 'description',
             'is_active', 'requires_photo', 'requires_video', 'requires_portfolio',
             'requires_audio', 'requires_documents', 'max_video_duration', 'max_audio_duration',
+            'max_photo_size', 'max_video_size', 'max_audio_size', 'max_document_size',
             'awards_trophy', 'awards_certificate', 'awards_monetary', 'awards_plaque',
             'file_requirements', 'required_file_types', 'candidatures_count', 'created_at', 'updated_at'
         ]
@@ -149,6 +156,7 @@ class CategoryCreateUpdateSerializer(serializers.ModelSerializer):
             'category_class', 'name', 'description', 'is_active',
             'requires_photo', 'requires_video', 'requires_portfolio',
             'requires_audio', 'requires_documents', 'max_video_duration', 'max_audio_duration',
+            'max_photo_size', 'max_video_size', 'max_audio_size', 'max_document_size',
             'awards_trophy', 'awards_certificate', 'awards_monetary', 'awards_plaque'
         ]
     
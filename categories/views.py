@@ -13,9 +13,10 @@ from .serializers import (
     CategoryClassSerializer, CategoryClassDetailSerializer, CategoryClassCreateUpdateSerializer
 )
 from accounts.permissions import IsAdminUser, IsPublicOrAuthenticated
+from config.sparse import SparseFieldsViewMixin
 
 
-class CategoryListView(generics.ListAPIView):
+class CategoryListView(SparseFieldsViewMixin, generics.ListAPIView):
     """
     Vue pour lister toutes les catégories actives
     """
@@ -35,7 +36,7 @@ class CategoryDetailView(generics.RetrieveAPIView):
     lookup_field = 'slug'
 
 
-class CategoryAdminListView(generics.ListCreateAPIView):
+class CategoryAdminListView(SparseFieldsViewMixin, generics.ListCreateAPIView):
     """
     Vue admin pour lister et créer des catégories
     """
@@ -1,7 +1,20 @@
 """
-Middleware personnalisé pour désactiver CSRF sur les endpoints API
+Middlewares personnalisés (CSRF des endpoints API, compression des réponses)
 """
+from gzip import compress as gzip_compress
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import cache
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
 from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError:  # brotli est optionnel : repli sur gzip
+    brotli = None
 
 
 class DisableCSRFForAPI(MiddlewareMixin):
@@ -13,3 +26,104 @@ class DisableCSRFForAPI(MiddlewareMixin):
         # Désactiver CSRF pour tous les endpoints API
         if request.path.startswith('/api/'):
             setattr(request, '_dont_enforce_csrf_checks', True)
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Compression des réponses (brotli si disponible et accepté, sinon gzip)
+
+    Les petites réponses, les réponses partielles (`Range`) et les types déjà
+    compressés (images, vidéos, archives...) sont ignorés, en flux ou non.
+    Les variantes compressées des réponses publiques (GET anonyme, sans
+    cookie ni `Cache-Control: private`) sont mises en cache par ETag :
+    un même contenu n'est compressé qu'une fois par encodage. Les réponses
+    privées sont compressées à chaque requête, avec l'atténuation BREACH de
+    Django pour gzip. Doit être placé avant `ConditionalGetMiddleware`, qui
+    calcule l'ETag.
+    """
+    COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/javascript', 'application/xml', 'image/svg+xml')
+    CACHE_PREFIX = 'compression'
+
+    def process_response(self, request, response):
+        if (
+            # Réponse partielle : Content-Range porte sur le contenu non compressé
+            response.status_code == 206
+            or response.has_header('Content-Range')
+            or response.has_header('Content-Encoding')
+            or not response.get('Content-Type', '').startswith(self.COMPRESSIBLE_TYPES)
+        ):
+            return response
+
+        if response.streaming:
+            return super().process_response(request, response)
+
+        if len(response.content) < settings.COMPRESSION_MIN_LENGTH:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        encoding = self._negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        etag = response.get('ETag')
+        if etag and self._is_public(request, response):
+            cache_key = f"{self.CACHE_PREFIX}:{encoding}:{md5(etag.encode()).hexdigest()}"
+            compressed = cache.get(cache_key)
+            if compressed is None:
+                compressed = self._compress(response.content, encoding, cached=True)
+                cache.set(cache_key, compressed, timeout=settings.COMPRESSION_CACHE_TTL)
+        else:
+            compressed = self._compress(response.content, encoding, cached=False)
+
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response.headers['Content-Length'] = str(len(compressed))
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    @staticmethod
+    def _negotiate(accept_encoding):
+        """Choisit l'encodage accepté par le client (brotli en priorité)"""
+        accepted = set()
+        for item in accept_encoding.lower().split(','):
+            coding, _, params = item.partition(';')
+            params = params.strip()
+            try:
+                quality = float(params[2:]) if params.startswith('q=') else 1.0
+            except ValueError:
+                quality = 0.0
+            if quality > 0:
+                accepted.add(coding.strip())
+
+        if brotli is not None and 'br' in accepted:
+            return 'br'
+        if 'gzip' in accepted:
+            return 'gzip'
+        return None
+
+    @staticmethod
+    def _is_public(request, response):
+        """Réponse identique pour tous les clients, donc partageable"""
+        cache_control = response.get('Cache-Control', '')
+        return (
+            request.method in ('GET', 'HEAD')
+            and response.status_code == 200
+            and not request.COOKIES
+            and 'HTTP_AUTHORIZATION' not in request.META
+            and not response.cookies
+            and 'private' not in cache_control
+            and 'no-store' not in cache_control
+        )
+
+    def _compress(self, content, encoding, cached):
+        # Les variantes en cache ne sont compressées qu'une fois : niveau maximal
+        if encoding == 'br':
+            return brotli.compress(content, quality=11 if cached else 5)
+        if cached:
+            return gzip_compress(content, compresslevel=9, mtime=0)
+        return compress_string(content, max_random_bytes=self.max_random_bytes)
@@ -0,0 +1,89 @@
+"""
+Renderer et parser JSON rapides pour l'API (orjson)
+
+Alternative aux classes JSON de DRF, sélectionnable dans `REST_FRAMEWORK`.
+orjson sérialise nativement datetime, date, time et UUID ; les autres types
+(Decimal, timedelta, chaînes paresseuses, QuerySet...) passent par l'encodeur
+de DRF, ce qui garde une sortie identique à `JSONRenderer`. Les valeurs que
+orjson rendrait autrement (flottants en notation exponentielle, NaN et
+infinis, entiers hors 64 bits) font repasser la réponse par `JSONRenderer`.
+"""
+import math
+
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+_fallback_encoder = JSONEncoder()
+
+# UTC rendu avec le suffixe 'Z', comme l'encodeur de DRF
+OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj):
+    return _fallback_encoder.default(obj)
+
+
+def _has_unportable_float(data):
+    """
+    Indique si `data` contient un flottant que orjson ne rend pas comme
+    json.dumps : notation exponentielle (1e+16, 1e-05) ou NaN/infini
+    """
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            stack.extend(value.values())
+            stack.extend(key for key in value if type(key) is float)
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+        elif type(value) is float:
+            if not math.isfinite(value) or (value and not 1e-4 <= abs(value) < 1e16):
+                return True
+    return False
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    Renderer JSON basé sur orjson
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        # Indentation demandée (débogage) : orjson ne sait indenter que de 2 espaces
+        if self.get_indent(accepted_media_type, renderer_context) or _has_unportable_float(data):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=_default, option=OPTIONS)
+        except TypeError:
+            # orjson.JSONEncodeError (entier hors 64 bits, profondeur...) :
+            # même résultat ou même erreur que JSONRenderer
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Caractères valides en JSON mais pas en JavaScript (cf. JSONRenderer)
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class FastJSONParser(JSONParser):
+    """
+    Parser JSON basé sur orjson
+    """
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+
+        try:
+            content = stream.read()
+            if encoding.lower().replace('-', '') != 'utf8':
+                content = content.decode(encoding).encode('utf-8')
+            return orjson.loads(content)
+        except (ValueError, UnicodeError) as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -0,0 +1,181 @@
+"""
+Moteur de recherche pour les champs de recherche de l'administration
+
+Sur PostgreSQL, la recherche s'appuie sur un SearchVectorField maintenu par
+signaux (index GIN) et sur des index trigrammes (pg_trgm) pour les recherches
+partielles. Sur SQLite (développement), on retombe sur des `icontains`.
+Dans les deux cas, les résultats sont annotés d'un score `search_rank`.
+"""
+import operator
+from functools import reduce
+
+from django.contrib.postgres.search import (
+    SearchQuery, SearchRank, SearchVector, TrigramSimilarity
+)
+from django.db import connection
+from django.db.models import Case, F, FloatField, IntegerField, Q, Value, When
+from django.db.models.functions import Cast, Greatest
+from rest_framework import filters
+
+# Configuration textuelle PostgreSQL : 'simple' évite la racinisation des noms propres
+SEARCH_CONFIG = 'simple'
+
+
+def is_postgres():
+    """Indique si la base courante supporte la recherche plein texte PostgreSQL"""
+    return connection.vendor == 'postgresql'
+
+
+def build_search_vector(document):
+    """
+    Construit l'expression SearchVector à partir d'une liste (texte, poids)
+    """
+    vectors = [
+        SearchVector(Value(text or ''), weight=weight, config=SEARCH_CONFIG)
+        for text, weight in document
+    ]
+    return reduce(operator.add, vectors)
+
+
+def refresh_search_vector(instance):
+    """
+    Met à jour le vecteur de recherche d'une instance (PostgreSQL uniquement)
+    Le modèle doit exposer `get_search_document()`.
+    """
+    if not is_postgres():
+        return
+    type(instance).objects.filter(pk=instance.pk).update(
+        search_vector=build_search_vector(instance.get_search_document())
+    )
+
+
+def search_fields_changed(update_fields, fields):
+    """
+    Indique si une sauvegarde peut avoir modifié les champs indexés
+    (`update_fields` vaut None pour une sauvegarde complète)
+    """
+    return update_fields is None or not fields.isdisjoint(update_fields)
+
+
+def search_queryset(queryset, terms, fields, vector_field=None, lookups=()):
+    """
+    Filtre et classe un queryset selon les termes de recherche
+
+    Args:
+        queryset: QuerySet à filtrer
+        terms: chaîne ou liste de termes (tous doivent correspondre)
+        fields: champs texte interrogés (lookups Django, ex: 'candidate__email')
+        vector_field: nom du SearchVectorField du modèle (optionnel)
+        lookups: lookups complets (ex: 'email__iexact') acceptés comme
+            correspondances sans participer au score
+
+    Returns:
+        QuerySet annoté de `search_rank` et trié par pertinence décroissante
+    """
+    if isinstance(terms, str):
+        terms = terms.split()
+    terms = [term for term in terms if term]
+    if not terms or not fields:
+        return queryset
+
+    if is_postgres():
+        return _search_postgres(queryset, terms, fields, vector_field, lookups)
+    return _search_fallback(queryset, terms, fields, lookups)
+
+
+def _term_condition(term, fields, lookups):
+    """Condition satisfaite si l'un des champs (ou des lookups) correspond au terme"""
+    conditions = [Q(**{f'{field}__icontains': term}) for field in fields]
+    conditions += [Q(**{lookup: term}) for lookup in lookups]
+    return reduce(operator.or_, conditions)
+
+
+def _search_postgres(queryset, terms, fields, vector_field, lookups):
+    """Recherche plein texte + trigrammes (index GIN)"""
+    text = ' '.join(terms)
+    conditions = Q()
+    for term in terms:
+        # `icontains` est servi par les index GIN trigrammes sur UPPER(col)
+        conditions &= _term_condition(term, fields, lookups)
+
+    similarity = TrigramSimilarity(fields[0], text) if len(fields) == 1 else Greatest(
+        *[TrigramSimilarity(field, text) for field in fields]
+    )
+    rank = similarity
+    if vector_field:
+        query = SearchQuery(text, config=SEARCH_CONFIG)
+        conditions = Q(**{vector_field: query}) | conditions
+        rank = SearchRank(F(vector_field), query) + similarity
+
+    return queryset.filter(conditions).annotate(
+        search_rank=rank
+    ).order_by('-search_rank')
+
+
+def _search_fallback(queryset, terms, fields, lookups):
+    """Recherche par `icontains` (SQLite), classée par nombre de correspondances"""
+    conditions = Q()
+    scores = []
+    for term in terms:
+        conditions &= _term_condition(term, fields, lookups)
+        for field in fields:
+            scores.append(Case(
+                When(**{f'{field}__istartswith': term}, then=Value(2)),
+                When(**{f'{field}__icontains': term}, then=Value(1)),
+                default=Value(0),
+                output_field=IntegerField(),
+            ))
+
+    return queryset.filter(conditions).annotate(
+        search_rank=Cast(reduce(operator.add, scores), FloatField())
+    ).order_by('-search_rank')
+
+
+class RankedSearchFilter(filters.SearchFilter):
+    """
+    SearchFilter DRF utilisant le moteur de recherche classé
+
+    La vue peut définir `search_vector_field` pour activer le vecteur plein texte.
+    Les champs préfixés (`^`, `=`, `@`, `$`) gardent le lookup DRF
+    correspondant et ne participent pas au score.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        search_fields = self.get_search_fields(view, request)
+        search_terms = self.get_search_terms(request)
+
+        if not search_fields or not search_terms:
+            return queryset
+
+        fields = [field for field in search_fields if field[0] not in self.lookup_prefixes]
+        if not fields:
+            return super().filter_queryset(request, queryset, view)
+        lookups = [
+            self.construct_search(str(field), queryset)
+            for field in search_fields if field[0] in self.lookup_prefixes
+        ]
+        queryset = search_queryset(
+            queryset, search_terms, fields,
+            vector_field=getattr(view, 'search_vector_field', None),
+            lookups=lookups
+        )
+        if self.must_call_distinct(queryset, search_fields):
+            queryset = queryset.distinct()
+        return queryset
+
+
+class RankedOrderingFilter(filters.OrderingFilter):
+    """
+    OrderingFilter qui conserve le classement par pertinence d'une recherche
+
+    Le tri par défaut de la vue n'est appliqué que si aucune recherche n'a eu
+    lieu ; un tri explicite (`?ordering=`) reste toujours prioritaire.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if (
+            'search_rank' in queryset.query.annotations
+            and not request.query_params.get(self.ordering_param)
+        ):
+            return queryset
+        return super().filter_queryset(request, queryset, view)
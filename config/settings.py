@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 from decouple import config
+from django.core.exceptions import ImproperlyConfigured
 from datetime import timedelta
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -43,6 +44,7 @@ INSTALLED_APPS = [
     # Third party apps
     "rest_framework",
     "rest_framework_simplejwt",
+    "rest_framework_simplejwt.token_blacklist",
     "corsheaders",
     "django_filters",
     "drf_spectacular",
@@ -54,10 +56,15 @@ INSTALLED_APPS = [
     "votes",
     "dashboard",
     "settings",
+    "mediafiles",
+    "jobs",
+    "mailer",
 ]
 
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
+    "config.middleware.CompressionMiddleware",  # gzip / brotli
+    "django.middleware.http.ConditionalGetMiddleware",  # ETag et 304
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -152,6 +159,58 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Stockage des médias : 'local' (MEDIA_ROOT) ou 's3' (stockage objet compatible S3,
+# ex. MinIO en local) via django-storages
+MEDIA_STORAGE = config('MEDIA_STORAGE', default='local')
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+if MEDIA_STORAGE == 's3':
+    STORAGES["default"] = {
+        "BACKEND": "storages.backends.s3.S3Storage",
+        "OPTIONS": {
+            "bucket_name": config('S3_BUCKET_NAME', default='makona-media'),
+            "endpoint_url": config('S3_ENDPOINT_URL', default=None),
+            "access_key": config('S3_ACCESS_KEY_ID', default=None),
+            "secret_key": config('S3_SECRET_ACCESS_KEY', default=None),
+            "region_name": config('S3_REGION_NAME', default=None),
+            "custom_domain": config('S3_CUSTOM_DOMAIN', default=None),
+            "default_acl": None,
+            "file_overwrite": False,
+            "querystring_auth": True,
+        },
+    }
+
+# Uploads directs (URLs présignées) : durée de validité et tailles maximales
+DIRECT_UPLOAD_EXPIRY_SECONDS = config('DIRECT_UPLOAD_EXPIRY_SECONDS', default=900, cast=int)
+DIRECT_UPLOAD_MAX_IMAGE_SIZE = config('DIRECT_UPLOAD_MAX_IMAGE_SIZE', default=10 * 1024 * 1024, cast=int)  # 10MB
+DIRECT_UPLOAD_MAX_SIZE = config('DIRECT_UPLOAD_MAX_SIZE', default=500 * 1024 * 1024, cast=int)  # 500MB
+
+# Livraison des médias : '' (Django, avec Range), 'nginx' (X-Accel-Redirect vers
+# MEDIA_ACCEL_PREFIX, location `internal` pointant sur MEDIA_ROOT) ou 'sendfile' (X-Sendfile)
+MEDIA_ACCEL_REDIRECT = config('MEDIA_ACCEL_REDIRECT', default='')
+MEDIA_ACCEL_PREFIX = config('MEDIA_ACCEL_PREFIX', default='/protected-media/')
+MEDIA_CACHE_MAX_AGE = config('MEDIA_CACHE_MAX_AGE', default=86400, cast=int)  # médias publics
+
+# Ramasse-miettes des médias (commande `collect_media_garbage`) : âge minimal
+# d'un fichier orphelin et répertoire de quarantaine (hors MEDIA_ROOT)
+MEDIA_GC_MIN_AGE_HOURS = config('MEDIA_GC_MIN_AGE_HOURS', default=24, cast=int)
+MEDIA_GC_QUARANTINE_DIR = config('MEDIA_GC_QUARANTINE_DIR', default=str(BASE_DIR / 'tmp' / 'quarantine'))
+
+# Cache de lecture des déclinaisons d'images
+RESPONSIVE_IMAGE_CACHE_TTL = config('RESPONSIVE_IMAGE_CACHE_TTL', default=3600, cast=int)
+
+# File d'attente des tâches (commande `runworker`)
+# JOBS_EAGER=True exécute les tâches au commit, sans worker (développement, tests) ;
+# les tâches différées (nouvelles tentatives) restent enregistrées pour le worker
+JOBS_EAGER = config('JOBS_EAGER', default=False, cast=bool)
+JOBS_WORKER_PROCESSES = config('JOBS_WORKER_PROCESSES', default=2, cast=int)
+JOBS_POLL_INTERVAL = config('JOBS_POLL_INTERVAL', default=1.0, cast=float)
+JOBS_VISIBILITY_TIMEOUT = config('JOBS_VISIBILITY_TIMEOUT', default=300, cast=int)  # secondes
+JOBS_RETRY_BACKOFF = config('JOBS_RETRY_BACKOFF', default=30, cast=int)  # secondes, doublé à chaque échec
+JOBS_RETRY_BACKOFF_MAX = config('JOBS_RETRY_BACKOFF_MAX', default=3600, cast=int)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -163,6 +222,7 @@ AUTH_USER_MODEL = "accounts.User"
 # Django REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
+        'accounts.authentication.ClaimsJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
@@ -172,8 +232,12 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 20,
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
-        'rest_framework.filters.SearchFilter',
-        'rest_framework.filters.OrderingFilter',
+        'config.search.RankedSearchFilter',
+        'config.search.RankedOrderingFilter',
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'rest_framework.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
     ],
     'DEFAULT_PARSER_CLASSES': [
         'rest_framework.parsers.JSONParser',
@@ -183,8 +247,70 @@ REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
 }
 
+# Renderer/parser JSON rapides (orjson) à la place de ceux de DRF
+API_FAST_JSON = config('API_FAST_JSON', default=True, cast=bool)
+if API_FAST_JSON:
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'][0] = 'config.renderers.FastJSONRenderer'
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'][0] = 'config.renderers.FastJSONParser'
+
+# Jetons JWT : le jeton d'accès (court) porte le type et l'état de vérification
+# de l'utilisateur et est vérifié sans requête ; le jeton de rafraîchissement
+# est renouvelé à chaque usage et l'ancien révoqué (liste noire)
+SIMPLE_JWT = {
+    'ACCESS_TOKEN_LIFETIME': timedelta(minutes=config('JWT_ACCESS_TOKEN_MINUTES', default=15, cast=int)),
+    'REFRESH_TOKEN_LIFETIME': timedelta(days=config('JWT_REFRESH_TOKEN_DAYS', default=7, cast=int)),
+    'ROTATE_REFRESH_TOKENS': True,
+    'BLACKLIST_AFTER_ROTATION': True,
+    'UPDATE_LAST_LOGIN': False,
+    'AUTH_HEADER_TYPES': ('Bearer',),
+}
+
+# Durée de cache des statistiques des dashboards admin (secondes)
+DASHBOARD_STATS_CACHE_TTL = config('DASHBOARD_STATS_CACHE_TTL', default=30, cast=int)
+
+# Durées de cache du dashboard candidat (secondes)
+CANDIDATE_DASHBOARD_CACHE_TTL = config('CANDIDATE_DASHBOARD_CACHE_TTL', default=60, cast=int)
+CANDIDATE_CATEGORIES_CACHE_TTL = config('CANDIDATE_CATEGORIES_CACHE_TTL', default=300, cast=int)
+
+# Compression des réponses : taille minimale (octets) et durée de cache des variantes
+COMPRESSION_MIN_LENGTH = config('COMPRESSION_MIN_LENGTH', default=512, cast=int)
+COMPRESSION_CACHE_TTL = config('COMPRESSION_CACHE_TTL', default=3600, cast=int)
+
+# Cache : LocMemCache par défaut (propre à chaque processus, développement).
+# Les caches applicatifs (dashboards, variantes d'images, fingerprints) sont
+# invalidés par le processus qui modifie les données : en production, le cache
+# doit être partagé entre les workers gunicorn et le worker de tâches, ex.
+# CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+# CACHE_LOCATION=redis://redis:6379/1
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default=''),
+    }
+}
+if not DEBUG and CACHES['default']['BACKEND'].endswith('.LocMemCache'):
+    raise ImproperlyConfigured(
+        "CACHE_BACKEND doit désigner un cache partagé (Redis, Memcached) quand DEBUG=False"
+    )
+
 # Session Configuration
+# Sessions lues depuis le cache et écrites en base seulement si elles changent
+SESSION_ENGINE = 'accounts.sessions'
 SESSION_COOKIE_AGE = 86400  # 24 heures
+# Avance minimale de l'expiration (secondes) justifiant la réécriture d'une session inchangée
+SESSION_SAVE_INTERVAL = config('SESSION_SAVE_INTERVAL', default=300, cast=int)
+# Purge des sessions expirées par le worker : fréquence (secondes) et taille des lots
+SESSION_PURGE_INTERVAL = config('SESSION_PURGE_INTERVAL', default=3600, cast=int)
+SESSION_PURGE_BATCH_SIZE = config('SESSION_PURGE_BATCH_SIZE', default=1000, cast=int)
+# Purge des codes OTP utilisés ou expirés : fréquence (secondes) et taille des lots
+OTP_PURGE_INTERVAL = config('OTP_PURGE_INTERVAL', default=3600, cast=int)
+OTP_PURGE_BATCH_SIZE = config('OTP_PURGE_BATCH_SIZE', default=1000, cast=int)
+# Fingerprints de devices : cache hash → id (secondes) et écriture groupée de
+# `last_used` (intervalle en secondes, ou dès N devices en attente). Durée courte :
+# une entrée périmée (fingerprint supprimé hors ORM) disparaît d'elle-même
+FINGERPRINT_CACHE_TTL = config('FINGERPRINT_CACHE_TTL', default=3600, cast=int)
+FINGERPRINT_TOUCH_FLUSH_INTERVAL = config('FINGERPRINT_TOUCH_FLUSH_INTERVAL', default=30, cast=int)
+FINGERPRINT_TOUCH_BATCH_SIZE = config('FINGERPRINT_TOUCH_BATCH_SIZE', default=500, cast=int)
 SESSION_COOKIE_SECURE = False  # True en production avec HTTPS
 SESSION_COOKIE_HTTPONLY = True
 SESSION_COOKIE_SAMESITE = 'Lax'
@@ -278,11 +404,37 @@ EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='kdvp ivts wpef ejnv
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='<etiro2005@gmail.com')
 EMAIL_SUBJECT_PREFIX = config('EMAIL_SUBJECT_PREFIX', default='[Makona Awards]')
 
+# File d'attente des emails (app mailer) : taille des lots envoyés sur une même
+# connexion, durée de vie de la connexion, tentatives et délai entre tentatives
+MAILER_BATCH_SIZE = config('MAILER_BATCH_SIZE', default=100, cast=int)
+MAILER_CONNECTION_MAX_AGE = config('MAILER_CONNECTION_MAX_AGE', default=60, cast=int)  # secondes
+MAILER_MAX_ATTEMPTS = config('MAILER_MAX_ATTEMPTS', default=5, cast=int)
+MAILER_RETRY_BACKOFF = config('MAILER_RETRY_BACKOFF', default=60, cast=int)  # secondes, doublé à chaque échec
+# Débit par défaut des campagnes d'emails (emails/seconde), à régler selon les quotas du serveur SMTP
+MAILER_CAMPAIGN_RATE = config('MAILER_CAMPAIGN_RATE', default=5.0, cast=float)
+
 # File Upload Settings
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
 FILE_UPLOAD_PERMISSIONS = 0o644
 
+# Taille maximale par défaut d'un fichier de candidature envoyé en une fois,
+# par type (une catégorie peut la remplacer) ; contrôlée pendant la réception
+CANDIDATURE_MAX_FILE_SIZES = {
+    'photo': config('CANDIDATURE_MAX_PHOTO_SIZE', default=10 * 1024 * 1024, cast=int),  # 10MB
+    'video': config('CANDIDATURE_MAX_VIDEO_SIZE', default=100 * 1024 * 1024, cast=int),  # 100MB
+    'audio': config('CANDIDATURE_MAX_AUDIO_SIZE', default=20 * 1024 * 1024, cast=int),  # 20MB
+    'portfolio': config('CANDIDATURE_MAX_DOCUMENT_SIZE', default=20 * 1024 * 1024, cast=int),  # 20MB
+    'documents': config('CANDIDATURE_MAX_DOCUMENT_SIZE', default=20 * 1024 * 1024, cast=int),  # 20MB
+}
+
+# Uploads par morceaux (vidéos, audios) : répertoire temporaire hors MEDIA_ROOT,
+# taille maximale d'un fichier, d'un morceau, et durée de vie d'une session
+CHUNKED_UPLOAD_TEMP_DIR = config('CHUNKED_UPLOAD_TEMP_DIR', default=str(BASE_DIR / 'tmp' / 'uploads'))
+CHUNKED_UPLOAD_MAX_SIZE = config('CHUNKED_UPLOAD_MAX_SIZE', default=500 * 1024 * 1024, cast=int)  # 500MB
+CHUNKED_UPLOAD_MAX_CHUNK_SIZE = config('CHUNKED_UPLOAD_MAX_CHUNK_SIZE', default=10 * 1024 * 1024, cast=int)  # 10MB
+CHUNKED_UPLOAD_EXPIRY_HOURS = config('CHUNKED_UPLOAD_EXPIRY_HOURS', default=24, cast=int)
+
 # Security Settings
 SECURE_BROWSER_XSS_FILTER = True
 SECURE_CONTENT_TYPE_NOSNIFF = True
@@ -0,0 +1,155 @@
+"""
+Sélection partielle des champs des réponses de l'API
+
+- `?fields=id,status,category_name` : seuls les champs listés sont renvoyés ;
+- `?expand=files` : les champs imbriqués déclarés dans `Meta.expandable_fields`
+  ne sont renvoyés que s'ils sont demandés (via `expand` ou `fields`).
+
+Sans aucun de ces paramètres, la représentation est inchangée. Les jointures
+associées aux champs écartés sont retirées du queryset grâce aux déclarations
+`Meta.select_related_fields` / `Meta.prefetch_related_fields`
+(chemin de relation -> champs du serializer qui l'utilisent).
+"""
+from rest_framework import permissions, serializers
+
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+
+
+def _parse_list(value):
+    return {item.strip() for item in value.split(',') if item.strip()}
+
+
+def requested_fields(request, field_names, expandable=()):
+    """
+    Retourne l'ensemble des champs à renvoyer, ou None si aucune restriction
+
+    Seules les requêtes en lecture sont concernées : les écritures conservent
+    la totalité des champs du serializer.
+    """
+    if request is None or request.method not in permissions.SAFE_METHODS:
+        return None
+
+    params = getattr(request, 'query_params', request.GET)
+    fields = params.get(FIELDS_PARAM)
+    expand = params.get(EXPAND_PARAM)
+    if fields is None and expand is None:
+        return None
+
+    only = _parse_list(fields) if fields is not None else None
+    expanded = _parse_list(expand or '')
+
+    selected = set()
+    for name in field_names:
+        if name in expandable:
+            if name in expanded or (only is not None and name in only):
+                selected.add(name)
+        elif only is None or name in only:
+            selected.add(name)
+    return selected
+
+
+def _select_related_paths(tree, prefix=''):
+    """Aplatit l'arbre `query.select_related` en chemins `a__b`"""
+    for name, subtree in tree.items():
+        path = f'{prefix}{name}'
+        if subtree:
+            yield from _select_related_paths(subtree, f'{path}__')
+        else:
+            yield path
+
+
+def _is_dropped(path, dropped):
+    return any(path == item or path.startswith(f'{item}__') for item in dropped)
+
+
+def _kept_prefix(path, dropped):
+    """Plus long préfixe de `path` qui n'est pas écarté ('' si aucun)"""
+    parts = path.split('__')
+    while parts and _is_dropped('__'.join(parts), dropped):
+        parts.pop()
+    return '__'.join(parts)
+
+
+class SparseFieldsMixin:
+    """
+    Mixin de serializer honorant `?fields=` et `?expand=`
+
+    Déclarations optionnelles dans `Meta` :
+        expandable_fields: champs imbriqués renvoyés uniquement sur demande
+            lorsqu'un des paramètres est présent
+        select_related_fields: {chemin select_related: [champs]}
+        prefetch_related_fields: {chemin prefetch_related: [champs]}
+
+    Seul le serializer racine est filtré ; les serializers imbriqués gardent
+    leur représentation complète.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if not self._is_root_serializer():
+            return fields
+
+        selected = requested_fields(
+            self.context.get('request'), fields,
+            getattr(self.Meta, 'expandable_fields', ())
+        )
+        if selected is None:
+            return fields
+        return {name: field for name, field in fields.items() if name in selected}
+
+    def _is_root_serializer(self):
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+    @classmethod
+    def prune_queryset(cls, queryset, request):
+        """
+        Retire du queryset les jointures inutiles aux champs demandés
+        """
+        meta = cls.Meta
+        selected = requested_fields(
+            request, meta.fields, getattr(meta, 'expandable_fields', ())
+        )
+        if selected is None:
+            return queryset
+
+        select_map = getattr(meta, 'select_related_fields', {})
+        dropped = [path for path, names in select_map.items() if not selected.intersection(names)]
+        if dropped and isinstance(queryset.query.select_related, dict):
+            kept = {
+                _kept_prefix(path, dropped)
+                for path in _select_related_paths(queryset.query.select_related)
+            } - {''}
+            queryset = queryset.select_related(None)
+            if kept:
+                queryset = queryset.select_related(*kept)
+
+        prefetch_map = getattr(meta, 'prefetch_related_fields', {})
+        dropped = [path for path, names in prefetch_map.items() if not selected.intersection(names)]
+        lookups = queryset._prefetch_related_lookups
+        if dropped and lookups:
+            kept = [
+                lookup for lookup in lookups
+                if not _is_dropped(getattr(lookup, 'prefetch_to', lookup), dropped)
+            ]
+            queryset = queryset.prefetch_related(None)
+            if kept:
+                queryset = queryset.prefetch_related(*kept)
+
+        return queryset
+
+
+class SparseFieldsViewMixin:
+    """
+    Mixin de vue générique : applique `prune_queryset` du serializer
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        serializer_class = self.get_serializer_class()
+        if issubclass(serializer_class, SparseFieldsMixin):
+            queryset = serializer_class.prune_queryset(queryset, self.request)
+        return queryset
@@ -0,0 +1,24 @@
+"""
+Limitation du débit des traitements par lots (suppressions de fichiers,
+envois de campagnes...)
+"""
+import time
+
+
+class Throttle:
+    """
+    Limite le nombre d'opérations par seconde (0 = illimité)
+    """
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0
+        self.next_at = time.monotonic()
+
+    def wait(self):
+        if not self.interval:
+            return
+        now = time.monotonic()
+        if now < self.next_at:
+            time.sleep(self.next_at - now)
+            now = self.next_at
+        self.next_at = now + self.interval
@@ -9,6 +9,8 @@ from django.conf import settings
 from django.conf.urls.static import static
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
 
+from mediafiles.views import ProtectedMediaView
+
 urlpatterns = [
     # Admin
     path("admin/", admin.site.urls),
@@ -36,11 +38,16 @@ urlpatterns = [
     
     # Settings API Endpoints
     path("api/settings/", include("settings.urls")),
+    
+    # Media API Endpoints
+    path("api/media/", include("mediafiles.urls")),
 ]
 
-# Servir les fichiers média en développement et production
-# En production, les médias sont servis par Django via Traefik
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+# Fichiers média : contrôle d'accès par Django, octets délégués au proxy
+# (X-Accel-Redirect / X-Sendfile) ou servis par blocs avec prise en charge de Range
+urlpatterns += [
+    path(f"{settings.MEDIA_URL.lstrip('/')}<path:path>", ProtectedMediaView.as_view(), name="media"),
+]
 
 # Servir les fichiers statiques uniquement en développement
 if settings.DEBUG:
@@ -1,3 +1,16 @@
+"""
+Admin pour l'app dashboard
+"""
 from django.contrib import admin
 
-# Register your models here.
+from .models import StatCounter
+
+
+@admin.register(StatCounter)
+class StatCounterAdmin(admin.ModelAdmin):
+    """
+    Admin en lecture seule pour les compteurs statistiques
+    """
+    list_display = ['dimension', 'key', 'value', 'updated_at']
+    list_filter = ['dimension']
+    readonly_fields = ['dimension', 'key', 'value', 'updated_at']
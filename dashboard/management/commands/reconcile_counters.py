@@ -0,0 +1,20 @@
+"""
+Commande Django pour reconstruire les compteurs statistiques du dashboard
+Usage: python manage.py reconcile_counters
+"""
+
+from django.core.management.base import BaseCommand
+
+from dashboard.services import CounterService, DashboardStatsService
+
+
+class Command(BaseCommand):
+    help = 'Reconstruire les compteurs statistiques du dashboard à partir des tables sources'
+
+    def handle(self, *args, **options):
+        self.stdout.write('🔄 Reconstruction des compteurs...')
+        count = CounterService.rebuild()
+        DashboardStatsService.invalidate()
+        self.stdout.write(
+            self.style.SUCCESS(f'✅ {count} compteurs reconstruits')
+        )
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-19 17:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(max_length=50, verbose_name='Dimension')),
+                ('key', models.CharField(blank=True, max_length=100, verbose_name='Clé')),
+                ('value', models.BigIntegerField(default=0, verbose_name='Valeur')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Date de modification')),
+            ],
+            options={
+                'verbose_name': 'Compteur statistique',
+                'verbose_name_plural': 'Compteurs statistiques',
+                'ordering': ['dimension', 'key'],
+                'unique_together': {('dimension', 'key')},
+            },
+        ),
+    ]
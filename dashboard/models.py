@@ -1,3 +1,37 @@
+"""
+Modèles pour l'app dashboard
+"""
 from django.db import models
 
-# Create your models here.
+
+class StatCounter(models.Model):
+    """
+    Compteur maintenu incrémentalement pour les statistiques des dashboards
+
+    Chaque ligne correspond à une dimension (ex: 'candidature_status') et une
+    clé (ex: 'pending'). Les compteurs sont mis à jour par signaux et peuvent
+    être reconstruits avec la commande `reconcile_counters`.
+    """
+    dimension = models.CharField(
+        max_length=50,
+        verbose_name="Dimension"
+    )
+    key = models.CharField(
+        max_length=100,
+        blank=True,
+        verbose_name="Clé"
+    )
+    value = models.BigIntegerField(
+        default=0,
+        verbose_name="Valeur"
+    )
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Date de modification")
+    
+    class Meta:
+        verbose_name = "Compteur statistique"
+        verbose_name_plural = "Compteurs statistiques"
+        ordering = ['dimension', 'key']
+        unique_together = ('dimension', 'key')
+    
+    def __str__(self):
+        return f"{self.dimension}[{self.key}] = {self.value}"
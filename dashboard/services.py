@@ -0,0 +1,230 @@
+"""
+Services pour l'app dashboard
+"""
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from accounts.models import User, CandidateProfile
+from candidates.models import Candidature
+from categories.models import Category
+from .models import StatCounter
+
+
+SOCIAL_FIELDS = ('facebook_url', 'instagram_url', 'youtube_url', 'website_url')
+
+
+class CounterService:
+    """
+    Service de maintenance des compteurs statistiques (StatCounter)
+
+    Chaque objet suivi est projeté sur une liste de clés (dimension, clé) ;
+    une modification applique la différence entre l'ancienne et la nouvelle
+    projection, dans une transaction, puis invalide les statistiques en cache.
+    """
+
+    @staticmethod
+    def user_keys(user_type, is_verified, is_active):
+        """Clés de compteurs d'un utilisateur"""
+        return [
+            ('user', 'total'),
+            ('user_type', user_type),
+            ('user_verified', 'true' if is_verified else 'false'),
+            ('user_active', 'true' if is_active else 'false'),
+        ]
+
+    @staticmethod
+    def candidature_keys(status, category_id, country):
+        """Clés de compteurs d'une candidature"""
+        return [
+            ('candidature', 'total'),
+            ('candidature_status', status),
+            ('candidature_category', f'{category_id}:{status}'),
+            ('candidature_country', country or ''),
+        ]
+
+    @staticmethod
+    def profile_keys(has_social):
+        """Clés de compteurs d'un profil candidat"""
+        keys = [('profile', 'total')]
+        if has_social:
+            keys.append(('profile', 'with_social'))
+        return keys
+
+    @staticmethod
+    def apply(old_keys, new_keys, weight=1):
+        """
+        Applique la différence entre deux projections aux compteurs
+        """
+        delta = Counter()
+        for key in new_keys:
+            delta[key] += weight
+        for key in old_keys:
+            delta[key] -= weight
+
+        changes = sorted((key, change) for key, change in delta.items() if change)
+        if not changes:
+            return
+        with transaction.atomic():
+            for (dimension, key), change in changes:
+                CounterService._increment(dimension, key, change)
+            # Invalidé après le commit : une lecture concurrente ne remet pas
+            # en cache les compteurs d'avant la modification
+            transaction.on_commit(DashboardStatsService.invalidate)
+
+    @staticmethod
+    def _increment(dimension, key, change):
+        updated = StatCounter.objects.filter(dimension=dimension, key=key).update(
+            value=F('value') + change
+        )
+        if updated:
+            return
+        try:
+            with transaction.atomic():
+                StatCounter.objects.create(dimension=dimension, key=key, value=change)
+        except IntegrityError:
+            # Créé entre-temps par une autre transaction
+            StatCounter.objects.filter(dimension=dimension, key=key).update(
+                value=F('value') + change
+            )
+
+    @staticmethod
+    def rebuild():
+        """
+        Reconstruit tous les compteurs à partir des tables sources
+        Retourne le nombre de compteurs écrits.
+        """
+        totals = Counter()
+
+        users = User.objects.order_by().values(
+            'user_type', 'is_verified', 'is_active'
+        ).annotate(count=Count('id'))
+        for row in users:
+            for key in CounterService.user_keys(row['user_type'], row['is_verified'], row['is_active']):
+                totals[key] += row['count']
+
+        candidatures = Candidature.objects.order_by().values(
+            'status', 'category_id', 'candidate__country'
+        ).annotate(count=Count('id'))
+        for row in candidatures:
+            keys = CounterService.candidature_keys(
+                row['status'], row['category_id'], row['candidate__country']
+            )
+            for key in keys:
+                totals[key] += row['count']
+
+        profiles = CandidateProfile.objects.aggregate(
+            total=Count('id'),
+            with_social=Count('id', filter=~Q(**{field: '' for field in SOCIAL_FIELDS})),
+        )
+        totals[('profile', 'total')] += profiles['total']
+        totals[('profile', 'with_social')] += profiles['with_social']
+
+        with transaction.atomic():
+            StatCounter.objects.all().delete()
+            StatCounter.objects.bulk_create([
+                StatCounter(dimension=dimension, key=key, value=value)
+                for (dimension, key), value in totals.items()
+            ])
+        return len(totals)
+
+
+class DashboardStatsService:
+    """
+    Service de calcul des statistiques des dashboards admin
+
+    Les statistiques sont lues dans la table des compteurs (StatCounter),
+    maintenue par signaux, sans parcourir les tables sources. Le résultat
+    est partagé entre les endpoints via le cache, invalidé à chaque
+    modification des compteurs ou des catégories.
+    """
+
+    CACHE_KEY = 'dashboard:stats'
+    STATUSES = ('pending', 'approved', 'rejected')
+
+    @staticmethod
+    def get_stats():
+        """
+        Retourne les statistiques (depuis le cache si disponibles)
+        """
+        return cache.get_or_set(
+            DashboardStatsService.CACHE_KEY,
+            DashboardStatsService.compute_stats,
+            timeout=settings.DASHBOARD_STATS_CACHE_TTL
+        )
+
+    @staticmethod
+    def invalidate():
+        """
+        Invalide les statistiques en cache
+        """
+        cache.delete(DashboardStatsService.CACHE_KEY)
+
+    @staticmethod
+    def compute_stats():
+        """
+        Construit les statistiques à partir des compteurs (StatCounter)
+        """
+        counters = {
+            (dimension, key): value
+            for dimension, key, value in StatCounter.objects.values_list('dimension', 'key', 'value')
+        }
+        if not counters:
+            CounterService.rebuild()
+            counters = {
+                (dimension, key): value
+                for dimension, key, value in StatCounter.objects.values_list('dimension', 'key', 'value')
+            }
+
+        return {
+            'users': {
+                'total': counters.get(('user', 'total'), 0),
+                'candidates': counters.get(('user_type', 'candidate'), 0),
+                'admins': counters.get(('user_type', 'admin'), 0),
+                'verified': counters.get(('user_verified', 'true'), 0),
+                'active': counters.get(('user_active', 'true'), 0),
+            },
+            'candidatures': DashboardStatsService._candidature_stats(counters),
+            'profiles': {
+                'total': counters.get(('profile', 'total'), 0),
+                'with_social': counters.get(('profile', 'with_social'), 0),
+            },
+        }
+
+    @staticmethod
+    def _candidature_stats(counters):
+        counter_keys = ('total',) + DashboardStatsService.STATUSES
+        stats = {
+            'total': counters.get(('candidature', 'total'), 0),
+        }
+        for status in DashboardStatsService.STATUSES:
+            stats[status] = counters.get(('candidature_status', status), 0)
+
+        by_category = {}
+        for (dimension, key), value in counters.items():
+            if dimension != 'candidature_category' or not value:
+                continue
+            category_id, status = key.split(':', 1)
+            category = by_category.setdefault(int(category_id), {name: 0 for name in counter_keys})
+            category['total'] += value
+            if status in category:
+                category[status] += value
+
+        names = dict(Category.objects.filter(id__in=by_category).values_list('id', 'name'))
+        stats['by_category'] = [
+            {'name': names.get(category_id, ''), **counts}
+            for category_id, counts in by_category.items()
+        ]
+        stats['by_country'] = [
+            {'country': key, 'total': value}
+            for (dimension, key), value in counters.items()
+            if dimension == 'candidature_country' and value
+        ]
+        stats['recent_submissions'] = Candidature.objects.filter(
+            submitted_at__gte=timezone.now() - timezone.timedelta(days=7)
+        ).count()
+        return stats
@@ -0,0 +1,152 @@
+"""
+Signaux pour l'app dashboard
+
+Maintiennent les compteurs statistiques (StatCounter) à chaque création,
+modification ou suppression d'utilisateur, de candidature ou de profil.
+L'état précédent est relu en base dans `pre_save` (sous verrou pour les
+candidatures) ; les sauvegardes `raw` (fixtures) sont ignorées et corrigées
+par `reconcile_counters`.
+
+Les statistiques en cache sont invalidées par `CounterService.apply`, et
+lorsqu'une catégorie (dont le nom figure dans les statistiques) change.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from accounts.models import User, CandidateProfile
+from candidates.models import Candidature
+from categories.models import Category
+from .services import CounterService, DashboardStatsService, SOCIAL_FIELDS
+
+
+USER_FIELDS = ('user_type', 'is_verified', 'is_active', 'country')
+CANDIDATURE_FIELDS = ('status', 'category', 'category_id', 'candidate', 'candidate_id')
+
+
+def _tracks(update_fields, tracked_fields):
+    """Indique si une sauvegarde peut modifier les champs suivis"""
+    return update_fields is None or bool(set(update_fields) & set(tracked_fields))
+
+
+# ===== UTILISATEURS =====
+
+@receiver(pre_save, sender=User)
+def snapshot_user(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._counter_previous = None
+    if raw or not instance.pk or not _tracks(update_fields, USER_FIELDS):
+        return
+    instance._counter_previous = User.objects.filter(pk=instance.pk).values(*USER_FIELDS).first()
+
+
+@receiver(post_save, sender=User)
+def count_user(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or not _tracks(update_fields, USER_FIELDS):
+        return
+    previous = getattr(instance, '_counter_previous', None)
+    old_keys = CounterService.user_keys(
+        previous['user_type'], previous['is_verified'], previous['is_active']
+    ) if previous else []
+    CounterService.apply(
+        old_keys,
+        CounterService.user_keys(instance.user_type, instance.is_verified, instance.is_active)
+    )
+
+    # Le pays du candidat est une dimension de ses candidatures
+    if previous and previous['country'] != instance.country:
+        count = instance.candidatures.count()
+        if count:
+            CounterService.apply(
+                [('candidature_country', previous['country'] or '')],
+                [('candidature_country', instance.country or '')],
+                weight=count
+            )
+
+
+@receiver(post_delete, sender=User)
+def uncount_user(sender, instance, **kwargs):
+    CounterService.apply(
+        CounterService.user_keys(instance.user_type, instance.is_verified, instance.is_active), []
+    )
+
+
+# ===== CANDIDATURES =====
+
+@receiver(pre_save, sender=Candidature)
+def snapshot_candidature(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._counter_previous = None
+    if raw or not instance.pk or not _tracks(update_fields, CANDIDATURE_FIELDS):
+        return
+    # Ligne verrouillée jusqu'à la fin de la sauvegarde (Candidature.save est
+    # atomique) : deux changements de statut concurrents ne partent pas du
+    # même état précédent
+    instance._counter_previous = Candidature.objects.select_for_update(of=('self',)).filter(
+        pk=instance.pk
+    ).values('status', 'category_id', 'candidate__country').first()
+
+
+@receiver(post_save, sender=Candidature)
+def count_candidature(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or not _tracks(update_fields, CANDIDATURE_FIELDS):
+        return
+    previous = getattr(instance, '_counter_previous', None)
+    old_keys = CounterService.candidature_keys(
+        previous['status'], previous['category_id'], previous['candidate__country']
+    ) if previous else []
+    CounterService.apply(
+        old_keys,
+        CounterService.candidature_keys(
+            instance.status, instance.category_id, instance.candidate.country
+        )
+    )
+
+
+@receiver(post_delete, sender=Candidature)
+def uncount_candidature(sender, instance, **kwargs):
+    # Lors d'une suppression en cascade, les candidatures sont supprimées
+    # avant le candidat : sa ligne est encore lisible dans la transaction.
+    country = User.objects.filter(pk=instance.candidate_id).values_list('country', flat=True).first()
+    CounterService.apply(
+        CounterService.candidature_keys(instance.status, instance.category_id, country), []
+    )
+
+
+# ===== PROFILS CANDIDATS =====
+
+def _has_social(values):
+    return any(values[field] for field in SOCIAL_FIELDS)
+
+
+@receiver(pre_save, sender=CandidateProfile)
+def snapshot_profile(sender, instance, raw=False, **kwargs):
+    instance._counter_previous = None
+    if raw or not instance.pk:
+        return
+    instance._counter_previous = CandidateProfile.objects.filter(pk=instance.pk).values(
+        *SOCIAL_FIELDS
+    ).first()
+
+
+@receiver(post_save, sender=CandidateProfile)
+def count_profile(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_counter_previous', None)
+    old_keys = CounterService.profile_keys(_has_social(previous)) if previous else []
+    current = {field: getattr(instance, field) for field in SOCIAL_FIELDS}
+    CounterService.apply(old_keys, CounterService.profile_keys(_has_social(current)))
+
+
+@receiver(post_delete, sender=CandidateProfile)
+def uncount_profile(sender, instance, **kwargs):
+    current = {field: getattr(instance, field) for field in SOCIAL_FIELDS}
+    CounterService.apply(CounterService.profile_keys(_has_social(current)), [])
+
+
+# ===== CATÉGORIES =====
+
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_category_stats(sender, raw=False, **kwargs):
+    if raw:
+        return
+    transaction.on_commit(DashboardStatsService.invalidate)
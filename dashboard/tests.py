@@ -1,3 +1,184 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db.models import QuerySet
 from django.test import TestCase
 
-# Create your tests here.
+from accounts.models import CandidateProfile, User
+from candidates.models import Candidature
+from categories.models import Category
+from .models import StatCounter
+from .services import CounterService, DashboardStatsService
+
+
+class CounterServiceTest(TestCase):
+    """
+    Les compteurs maintenus par signaux restent égaux à un recalcul complet
+    après créations, changements de statut et suppressions.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.musique = Category.objects.create(name='Musique', description='d')
+        cls.danse = Category.objects.create(name='Danse', description='d')
+
+    def create_candidate(self, index, country='SN', **kwargs):
+        return User.objects.create_user(
+            email=f'candidat{index}@example.com', username=f'candidat{index}', password='x',
+            first_name='Aminata', last_name=f'Sow{index}', user_type='candidate',
+            country=country, **kwargs
+        )
+
+    def counters(self):
+        return {
+            (dimension, key): value
+            for dimension, key, value in StatCounter.objects.values_list('dimension', 'key', 'value')
+            if value
+        }
+
+    def assertCountersFresh(self):
+        incremental = self.counters()
+        CounterService.rebuild()
+        self.assertEqual(incremental, self.counters())
+
+    def test_creates(self):
+        for index in range(3):
+            candidate = self.create_candidate(index, is_verified=index % 2 == 0)
+            Candidature.objects.create(candidate=candidate, category=self.musique)
+        CandidateProfile.objects.create(user=candidate, bio='Bio', instagram_url='https://instagram.com/a')
+        User.objects.create_user(
+            email='admin@example.com', username='admin', password='x', user_type='admin'
+        )
+        self.assertEqual(self.counters()[('candidature_status', 'pending')], 3)
+        self.assertEqual(self.counters()[('profile', 'with_social')], 1)
+        self.assertCountersFresh()
+
+    def test_status_and_field_changes(self):
+        candidate = self.create_candidate(1)
+        candidature = Candidature.objects.create(candidate=candidate, category=self.musique)
+        profile = CandidateProfile.objects.create(user=candidate, bio='Bio')
+
+        candidature.status = 'approved'
+        candidature.save()
+        candidature.category = self.danse
+        candidature.save(update_fields=['category'])
+        candidate.country = 'ML'
+        candidate.is_verified = True
+        candidate.save()
+        profile.website_url = 'https://example.com'
+        profile.save()
+
+        counters = self.counters()
+        self.assertNotIn(('candidature_status', 'pending'), counters)
+        self.assertEqual(counters[('candidature_category', f'{self.danse.pk}:approved')], 1)
+        self.assertEqual(counters[('candidature_country', 'ML')], 1)
+        self.assertCountersFresh()
+
+    def test_stale_instances_count_each_transition_once(self):
+        candidature = Candidature.objects.create(candidate=self.create_candidate(1), category=self.musique)
+        first = Candidature.objects.get(pk=candidature.pk)
+        second = Candidature.objects.get(pk=candidature.pk)
+        first.status = 'approved'
+        first.save()
+        # L'état précédent est relu en base, pas sur l'instance périmée
+        second.status = 'rejected'
+        second.save()
+
+        counters = self.counters()
+        self.assertNotIn(('candidature_status', 'approved'), counters)
+        self.assertEqual(counters[('candidature_status', 'rejected')], 1)
+        self.assertCountersFresh()
+
+    def test_previous_candidature_read_under_lock(self):
+        candidature = Candidature.objects.create(candidate=self.create_candidate(1), category=self.musique)
+        candidature.status = 'approved'
+        with mock.patch.object(QuerySet, 'select_for_update', autospec=True,
+                               side_effect=QuerySet.select_for_update) as select_for_update:
+            candidature.save()
+        select_for_update.assert_called_once()
+
+    def test_untracked_save_does_not_touch_counters(self):
+        candidate = self.create_candidate(1)
+        Candidature.objects.create(candidate=candidate, category=self.musique)
+        with self.assertNumQueries(1):
+            candidate.save(update_fields=['first_name'])
+
+    def test_deletes(self):
+        first = self.create_candidate(1)
+        second = self.create_candidate(2, country='CI')
+        Candidature.objects.create(candidate=first, category=self.musique, status='rejected')
+        Candidature.objects.create(candidate=second, category=self.musique)
+        Candidature.objects.create(candidate=second, category=self.danse)
+        CandidateProfile.objects.create(user=second, bio='Bio', youtube_url='https://youtube.com/b')
+
+        Candidature.objects.get(candidate=first).delete()
+        # Suppression en cascade des candidatures et du profil
+        second.delete()
+
+        counters = self.counters()
+        self.assertEqual(counters[('user', 'total')], 1)
+        self.assertNotIn(('candidature', 'total'), counters)
+        self.assertNotIn(('profile', 'total'), counters)
+        self.assertCountersFresh()
+
+    def test_stats_rebuilt_when_table_empty(self):
+        candidate = self.create_candidate(1)
+        Candidature.objects.create(candidate=candidate, category=self.musique, status='approved')
+        StatCounter.objects.all().delete()
+
+        stats = DashboardStatsService.compute_stats()
+        self.assertEqual(stats['users']['candidates'], 1)
+        self.assertEqual(stats['candidatures']['approved'], 1)
+        self.assertEqual(stats['candidatures']['by_category'][0]['name'], 'Musique')
+        self.assertEqual(stats['candidatures']['by_country'], [{'country': 'SN', 'total': 1}])
+        self.assertTrue(StatCounter.objects.exists())
+
+
+class DashboardStatsCacheTest(TestCase):
+    """
+    Les statistiques en cache sont invalidées après le commit de toute
+    modification des compteurs ou d'une catégorie.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.musique = Category.objects.create(name='Musique', description='d')
+        candidate = User.objects.create_user(
+            email='candidat@example.com', username='candidat', password='x',
+            user_type='candidate', country='GN'
+        )
+        cls.candidature = Candidature.objects.create(candidate=candidate, category=cls.musique)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_stats_served_from_cache(self):
+        stats = DashboardStatsService.get_stats()
+        self.assertEqual(stats['candidatures']['pending'], 1)
+        self.assertEqual(stats['users']['candidates'], 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(DashboardStatsService.get_stats(), stats)
+
+    def test_status_change_invalidates_stats(self):
+        DashboardStatsService.get_stats()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.candidature.status = 'approved'
+            self.candidature.save()
+        stats = DashboardStatsService.get_stats()['candidatures']
+        self.assertEqual((stats['pending'], stats['approved']), (0, 1))
+        self.assertEqual(stats['by_category'][0]['approved'], 1)
+
+    def test_unchanged_counters_keep_cache(self):
+        DashboardStatsService.get_stats()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.candidature.description = 'Nouvelle description'
+            self.candidature.save()
+        self.assertIsNotNone(cache.get(DashboardStatsService.CACHE_KEY))
+
+    def test_category_edit_invalidates_stats(self):
+        DashboardStatsService.get_stats()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.musique.name = 'Musique urbaine'
+            self.musique.save()
+        stats = DashboardStatsService.get_stats()['candidatures']
+        self.assertEqual(stats['by_category'][0]['name'], 'Musique urbaine')
@@ -0,0 +1,27 @@
+"""
+Admin pour l'app jobs
+"""
+from django.contrib import admin
+
+from .models import Job
+from .services import JobService
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    """
+    Admin de la file d'attente des tâches
+    """
+    list_display = ['name', 'status', 'priority', 'attempts', 'run_at', 'locked_by', 'updated_at']
+    list_filter = ['status', 'name']
+    search_fields = ['name', 'last_error']
+    readonly_fields = [
+        'name', 'args', 'kwargs', 'attempts', 'locked_by', 'locked_until',
+        'last_error', 'created_at', 'updated_at'
+    ]
+    actions = ['retry_jobs']
+
+    @admin.action(description="Relancer les tâches en échec sélectionnées")
+    def retry_jobs(self, request, queryset):
+        count = JobService.retry(queryset.values_list('pk', flat=True))
+        self.message_user(request, f"{count} tâche(s) remise(s) en attente.")
@@ -0,0 +1,38 @@
+"""
+Commande Django pour exécuter les tâches en file d'attente
+Usage: python manage.py runworker [--processes N] [--burst]
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from jobs.worker import Worker
+
+
+class Command(BaseCommand):
+    help = 'Exécuter les tâches en arrière-plan (emails, médias, nettoyage)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=settings.JOBS_WORKER_PROCESSES,
+            help='Nombre de processus d\'exécution',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=settings.JOBS_POLL_INTERVAL,
+            help='Intervalle d\'interrogation de la file (secondes)',
+        )
+        parser.add_argument(
+            '--burst',
+            action='store_true',
+            help='S\'arrêter quand la file est vide',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'🚀 Worker démarré ({options["processes"]} processus)')
+        worker = Worker(options['processes'], options['poll_interval'], burst=options['burst'])
+        processed = worker.run()
+        self.stdout.write(self.style.SUCCESS(f'✅ Worker arrêté, {processed} tâches traitées'))
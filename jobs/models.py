@@ -0,0 +1,67 @@
+"""
+Modèles pour l'app jobs
+"""
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """
+    Tâche en file d'attente, exécutée par la commande `runworker`
+
+    Une tâche réservée par un worker reste invisible aux autres jusqu'à
+    `locked_until` (délai de visibilité) : si le worker disparaît, elle est
+    reprise par un autre à l'expiration du délai.
+
+    Une tâche périodique n'a qu'une exécution en attente ou en cours à la
+    fois : la contrainte d'unicité partielle écarte les doublons créés par
+    des workers démarrés simultanément.
+    """
+    STATUS_CHOICES = [
+        ('queued', 'En attente'),
+        ('running', 'En cours'),
+        ('failed', 'En échec'),
+    ]
+
+    name = models.CharField(max_length=200, verbose_name="Tâche")
+    args = models.JSONField(default=list, blank=True, verbose_name="Arguments")
+    kwargs = models.JSONField(default=dict, blank=True, verbose_name="Arguments nommés")
+    priority = models.SmallIntegerField(
+        default=0,
+        verbose_name="Priorité",
+        help_text="Les tâches de priorité la plus élevée sont exécutées en premier"
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='queued',
+        verbose_name="Statut"
+    )
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name="Tentatives")
+    max_attempts = models.PositiveSmallIntegerField(default=5, verbose_name="Tentatives maximum")
+    run_at = models.DateTimeField(default=timezone.now, verbose_name="Exécutable à partir de")
+    locked_by = models.CharField(max_length=100, blank=True, verbose_name="Worker")
+    locked_until = models.DateTimeField(null=True, blank=True, verbose_name="Réservée jusqu'à")
+    periodic = models.BooleanField(default=False, editable=False, verbose_name="Périodique")
+    last_error = models.TextField(blank=True, verbose_name="Dernière erreur")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Date de création")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Date de modification")
+
+    class Meta:
+        verbose_name = "Tâche"
+        verbose_name_plural = "Tâches"
+        ordering = ['-priority', 'run_at', 'id']
+        indexes = [
+            models.Index(fields=['status', 'run_at'], name='job_status_run_at_idx'),
+            models.Index(fields=['status', 'locked_until'], name='job_status_locked_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['name'],
+                condition=models.Q(periodic=True, status__in=['queued', 'running']),
+                name='job_unique_active_periodic'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.get_status_display()})"
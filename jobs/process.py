@@ -0,0 +1,29 @@
+"""
+Point d'entrée des processus du pool d'exécution
+
+Ce module est importé par les processus `spawn` avant l'initialisation de
+Django : il ne doit importer aucun modèle au niveau du module.
+"""
+import signal
+
+import django
+from django.apps import apps
+
+
+def init_process():
+    """Initialise Django dans un processus du pool"""
+    # L'arrêt (Ctrl+C) est piloté par le processus principal
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if not apps.ready:
+        django.setup()
+
+
+def execute(name, args, kwargs):
+    """Exécute une tâche dans un processus du pool"""
+    from django.db import close_old_connections
+
+    from .registry import get_task
+    try:
+        get_task(name)(*args, **kwargs)
+    finally:
+        close_old_connections()
@@ -0,0 +1,79 @@
+"""
+Registre des tâches exécutables par le worker
+
+    from jobs.registry import task
+
+    @task(priority=10, max_attempts=5)
+    def send_otp_email(otp_id):
+        ...
+
+    send_otp_email.enqueue(otp.id)
+
+Les arguments sont stockés en JSON : on passe des identifiants plutôt que
+des instances de modèles.
+
+Une tâche déclarée avec `every=<secondes>` est périodique : le worker la
+planifie à son démarrage, puis chaque exécution planifie la suivante.
+"""
+from .services import JobService
+
+_tasks = {}
+
+
+class Task:
+    """
+    Fonction enregistrée comme tâche, avec ses options par défaut
+    """
+
+    def __init__(self, func, name, priority, max_attempts, every=None):
+        self.func = func
+        self.name = name
+        self.priority = priority
+        self.max_attempts = max_attempts
+        self.every = every
+        self.__doc__ = func.__doc__
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def enqueue(self, *args, priority=None, delay=None, **kwargs):
+        """
+        Met la tâche en file d'attente (dans la transaction courante)
+        """
+        return JobService.enqueue(
+            self.name, args, kwargs,
+            priority=self.priority if priority is None else priority,
+            max_attempts=self.max_attempts,
+            delay=delay,
+            periodic=bool(self.every)
+        )
+
+
+def task(name=None, priority=0, max_attempts=5, every=None):
+    """
+    Décorateur enregistrant une fonction comme tâche
+    Le nom par défaut est `<module>.<fonction>`.
+    """
+    def decorator(func):
+        task_name = name or f'{func.__module__}.{func.__name__}'
+        registered = Task(func, task_name, priority, max_attempts, every)
+        _tasks[task_name] = registered
+        return registered
+    return decorator
+
+
+def get_task(name):
+    """
+    Retourne la tâche enregistrée sous ce nom (ValueError si inconnue)
+    """
+    try:
+        return _tasks[name]
+    except KeyError:
+        raise ValueError(f"Tâche inconnue: {name}")
+
+
+def periodic_tasks():
+    """
+    Retourne les tâches périodiques enregistrées
+    """
+    return [registered for registered in _tasks.values() if registered.every]
@@ -0,0 +1,171 @@
+"""
+Services pour l'app jobs
+"""
+import logging
+import random
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+
+class JobService:
+    """
+    Service de gestion de la file d'attente des tâches
+
+    La réservation se fait par UPDATE conditionnel sur l'état lu : deux
+    workers ne peuvent pas réserver la même tâche, quelle que soit la base.
+    """
+
+    @staticmethod
+    def enqueue(name, args=(), kwargs=None, priority=0, max_attempts=5, delay=None, periodic=False):
+        """
+        Crée une tâche en attente (ou l'exécute au commit si JOBS_EAGER)
+        Les tâches différées sont toujours enregistrées, même avec JOBS_EAGER :
+        une nouvelle tentative exécutée aussitôt échouerait de nouveau.
+        Une tâche périodique déjà planifiée n'est pas dupliquée (retourne None).
+        """
+        if settings.JOBS_EAGER and not delay:
+            transaction.on_commit(lambda: JobService.run_eager(name, args, kwargs or {}))
+            return None
+
+        run_at = timezone.now()
+        if delay:
+            run_at += timezone.timedelta(seconds=delay)
+        fields = {
+            'name': name, 'args': list(args), 'kwargs': kwargs or {},
+            'priority': priority, 'max_attempts': max_attempts, 'run_at': run_at
+        }
+        if not periodic:
+            return Job.objects.create(**fields)
+        try:
+            with transaction.atomic():
+                return Job.objects.create(periodic=True, **fields)
+        except IntegrityError:
+            return None
+
+    @staticmethod
+    def run_eager(name, args, kwargs):
+        """
+        Exécute immédiatement une tâche (développement, tests)
+        """
+        from .registry import get_task
+        try:
+            get_task(name)(*args, **kwargs)
+        except Exception:
+            logger.exception("Échec de la tâche %s", name)
+
+    @staticmethod
+    def claim(worker_id, limit):
+        """
+        Réserve jusqu'à `limit` tâches exécutables, par priorité décroissante
+        Les tâches en cours dont le délai de visibilité a expiré sont reprises.
+        """
+        now = timezone.now()
+        candidates = Job.objects.filter(
+            Q(status='queued', run_at__lte=now) |
+            Q(status='running', locked_until__lt=now)
+        ).order_by('-priority', 'run_at', 'id').values('id', 'status', 'locked_until')[:limit * 2]
+
+        locked_until = now + timezone.timedelta(seconds=settings.JOBS_VISIBILITY_TIMEOUT)
+        claimed = []
+        for candidate in candidates:
+            updated = Job.objects.filter(
+                pk=candidate['id'], status=candidate['status'],
+                locked_until=candidate['locked_until']
+            ).update(
+                status='running', locked_by=worker_id, locked_until=locked_until,
+                attempts=F('attempts') + 1, updated_at=now
+            )
+            if updated:
+                claimed.append(candidate['id'])
+                if len(claimed) == limit:
+                    break
+        return list(Job.objects.filter(pk__in=claimed).order_by('-priority', 'run_at', 'id'))
+
+    @staticmethod
+    def extend(job_ids, worker_id):
+        """
+        Prolonge la réservation des tâches en cours d'exécution par ce worker
+        """
+        locked_until = timezone.now() + timezone.timedelta(seconds=settings.JOBS_VISIBILITY_TIMEOUT)
+        Job.objects.filter(pk__in=job_ids, locked_by=worker_id, status='running').update(
+            locked_until=locked_until
+        )
+
+    @staticmethod
+    def complete(job):
+        """
+        Supprime une tâche terminée avec succès
+        """
+        deleted, _ = Job.objects.filter(pk=job.pk, locked_by=job.locked_by).delete()
+        if deleted:
+            JobService.schedule_next(job)
+
+    @staticmethod
+    def backoff(attempts):
+        """
+        Délai avant nouvelle tentative : exponentiel, plafonné, avec dispersion
+        """
+        delay = min(settings.JOBS_RETRY_BACKOFF * 2 ** (attempts - 1), settings.JOBS_RETRY_BACKOFF_MAX)
+        return delay * random.uniform(0.8, 1.2)
+
+    @staticmethod
+    def fail(job, error):
+        """
+        Replanifie une tâche en échec, ou la marque en échec définitif
+        """
+        updates = {'last_error': error, 'locked_by': '', 'locked_until': None}
+        if job.attempts >= job.max_attempts:
+            updates['status'] = 'failed'
+            logger.error("Tâche %s #%s abandonnée après %s tentatives", job.name, job.pk, job.attempts)
+        else:
+            updates['status'] = 'queued'
+            updates['run_at'] = timezone.now() + timezone.timedelta(seconds=JobService.backoff(job.attempts))
+        updated = Job.objects.filter(pk=job.pk, locked_by=job.locked_by).update(updated_at=timezone.now(), **updates)
+        if updated and updates['status'] == 'failed':
+            # Une tâche périodique abandonnée reste planifiée pour la période suivante
+            JobService.schedule_next(job)
+
+    @staticmethod
+    def retry(job_ids):
+        """
+        Remet en attente des tâches en échec définitif
+        Une tâche périodique dont l'exécution suivante est déjà planifiée
+        n'est pas remise en attente.
+        """
+        active = Job.objects.filter(periodic=True, status__in=['queued', 'running']).values('name')
+        return Job.objects.filter(pk__in=job_ids, status='failed').exclude(
+            periodic=True, name__in=active
+        ).update(
+            status='queued', attempts=0, run_at=timezone.now(), updated_at=timezone.now()
+        )
+
+    @staticmethod
+    def schedule_periodic():
+        """
+        Planifie les tâches périodiques qui n'ont pas d'exécution en attente
+        La contrainte d'unicité du modèle départage les workers concurrents.
+        """
+        from .registry import periodic_tasks
+        for registered in periodic_tasks():
+            if not Job.objects.filter(name=registered.name, status__in=['queued', 'running']).exists():
+                registered.enqueue()
+
+    @staticmethod
+    def schedule_next(job):
+        """
+        Planifie l'exécution suivante d'une tâche périodique
+        """
+        from .registry import get_task
+        try:
+            registered = get_task(job.name)
+        except ValueError:
+            return
+        if registered.every:
+            registered.enqueue(delay=registered.every)
@@ -0,0 +1,133 @@
+from unittest import mock
+
+from django.db.models import QuerySet
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .models import Job
+from .registry import task
+from .services import JobService
+
+
+@task(name='jobs.tests.periodic', every=600)
+def periodic():
+    """Tâche périodique de test"""
+
+
+@override_settings(JOBS_EAGER=False, JOBS_VISIBILITY_TIMEOUT=300, JOBS_RETRY_BACKOFF=10, JOBS_RETRY_BACKOFF_MAX=100)
+class JobServiceTest(TestCase):
+    """
+    Réservation exclusive par priorité, reprise des réservations expirées
+    et nouvelles tentatives espacées de façon exponentielle.
+    """
+
+    def enqueue(self, name='jobs.tests.job', **kwargs):
+        return JobService.enqueue(name, **kwargs)
+
+    def test_claim_by_priority_and_limit(self):
+        low = self.enqueue(priority=0)
+        high = self.enqueue(priority=10)
+        later = self.enqueue(priority=5, delay=60)
+        self.assertEqual(JobService.claim('w1', 1), [high])
+        self.assertEqual(JobService.claim('w2', 5), [low])
+        self.assertEqual(JobService.claim('w3', 5), [])
+
+        job = Job.objects.get(pk=high.pk)
+        self.assertEqual((job.status, job.locked_by, job.attempts), ('running', 'w1', 1))
+        self.assertEqual(Job.objects.get(pk=later.pk).status, 'queued')
+
+    def test_expired_lock_is_reclaimed(self):
+        job = self.enqueue()
+        JobService.claim('w1', 1)
+        Job.objects.filter(pk=job.pk).update(locked_until=timezone.now() - timezone.timedelta(seconds=1))
+        [reclaimed] = JobService.claim('w2', 1)
+        self.assertEqual((reclaimed.locked_by, reclaimed.attempts), ('w2', 2))
+
+        # Le worker d'origine ne peut plus terminer la tâche reprise
+        stale = Job.objects.get(pk=job.pk)
+        stale.locked_by = 'w1'
+        JobService.complete(stale)
+        self.assertTrue(Job.objects.filter(pk=job.pk).exists())
+        JobService.complete(reclaimed)
+        self.assertFalse(Job.objects.filter(pk=job.pk).exists())
+
+    def test_backoff_is_exponential_and_capped(self):
+        for attempts, expected in [(1, 10), (2, 20), (3, 40), (10, 100)]:
+            delay = JobService.backoff(attempts)
+            self.assertTrue(expected * 0.8 <= delay <= expected * 1.2, (attempts, delay))
+
+    def test_failure_is_retried_then_abandoned(self):
+        job = self.enqueue(max_attempts=2)
+        [claimed] = JobService.claim('w1', 1)
+        JobService.fail(claimed, 'Erreur 1')
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.last_error, job.locked_by), ('queued', 'Erreur 1', ''))
+        delay = (job.run_at - timezone.now()).total_seconds()
+        self.assertTrue(7 <= delay <= 12, delay)
+        self.assertEqual(JobService.claim('w1', 1), [])
+
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        [claimed] = JobService.claim('w1', 1)
+        JobService.fail(claimed, 'Erreur 2')
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('failed', 2))
+
+        self.assertEqual(JobService.retry([job.pk]), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('queued', 0))
+
+    @override_settings(JOBS_EAGER=True)
+    def test_delayed_job_is_stored_in_eager_mode(self):
+        job = self.enqueue(delay=30)
+        self.assertEqual(job.status, 'queued')
+        self.assertGreater(job.run_at, timezone.now())
+
+
+class PeriodicTaskTest(TestCase):
+    """
+    Une tâche périodique est planifiée une seule fois au démarrage du
+    worker, puis chaque exécution planifie la suivante.
+    """
+
+    def test_schedule_periodic_once(self):
+        JobService.schedule_periodic()
+        JobService.schedule_periodic()
+        self.assertEqual(Job.objects.filter(name='jobs.tests.periodic').count(), 1)
+
+    def test_concurrent_schedule_creates_one_run(self):
+        # Deux workers démarrés ensemble : aucun ne voit l'exécution de l'autre
+        with mock.patch.object(QuerySet, 'exists', return_value=False):
+            JobService.schedule_periodic()
+            JobService.schedule_periodic()
+        self.assertEqual(Job.objects.filter(name='jobs.tests.periodic').count(), 1)
+
+    def test_duplicate_next_run_is_ignored(self):
+        JobService.schedule_periodic()
+        job = Job.objects.get(name='jobs.tests.periodic')
+        JobService.schedule_next(job)
+        self.assertEqual(Job.objects.filter(name='jobs.tests.periodic').count(), 1)
+        self.assertIsNone(JobService.enqueue('jobs.tests.periodic', periodic=True))
+
+    def test_retry_keeps_single_periodic_run(self):
+        JobService.schedule_periodic()
+        failed = Job.objects.create(name='jobs.tests.periodic', periodic=True, status='failed')
+        self.assertEqual(JobService.retry([failed.pk]), 0)
+        Job.objects.filter(status='queued').delete()
+        self.assertEqual(JobService.retry([failed.pk]), 1)
+
+    def test_completion_schedules_next_run(self):
+        JobService.schedule_periodic()
+        job = next(job for job in JobService.claim('test', 10) if job.name == 'jobs.tests.periodic')
+        JobService.complete(job)
+        next_run = Job.objects.get(name='jobs.tests.periodic')
+        self.assertEqual(next_run.status, 'queued')
+        self.assertGreater((next_run.run_at - job.run_at).total_seconds(), 590)
+
+    def test_abandoned_run_schedules_next(self):
+        JobService.schedule_periodic()
+        job = Job.objects.get(name='jobs.tests.periodic')
+        Job.objects.filter(pk=job.pk).update(max_attempts=1, run_at=timezone.now())
+        [claimed] = JobService.claim('test', 1)
+        JobService.fail(claimed, 'Erreur')
+        statuses = sorted(Job.objects.filter(name='jobs.tests.periodic').values_list('status', flat=True))
+        self.assertEqual(statuses, ['failed', 'queued'])
@@ -0,0 +1,98 @@
+"""
+Worker exécutant les tâches de la file dans un pool de processus
+"""
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.db import connections
+
+from .process import execute, init_process
+from .services import JobService
+
+logger = logging.getLogger(__name__)
+
+
+class Worker:
+    """
+    Boucle de réservation / exécution des tâches
+
+    Le processus principal réserve les tâches et enregistre leur résultat ;
+    les tâches s'exécutent dans des processus `spawn` (sans connexion héritée).
+    """
+
+    def __init__(self, processes, poll_interval, burst=False):
+        self.processes = processes
+        self.poll_interval = poll_interval
+        self.burst = burst
+        self.worker_id = f'{socket.gethostname()}:{os.getpid()}'
+        self.running = True
+        self.inflight = {}
+
+    def stop(self, *args):
+        """Arrêt propre : plus de réservation, attente des tâches en cours"""
+        self.running = False
+
+    def _new_pool(self):
+        return ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=init_process
+        )
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        pool = self._new_pool()
+        JobService.schedule_periodic()
+        last_heartbeat = time.monotonic()
+        processed = 0
+        try:
+            while self.running or self.inflight:
+                free = self.processes - len(self.inflight)
+                claimed = []
+                if self.running and free > 0:
+                    claimed = JobService.claim(self.worker_id, free)
+                    for job in claimed:
+                        future = pool.submit(execute, job.name, job.args, job.kwargs)
+                        self.inflight[future] = job
+
+                if self.inflight:
+                    done, _ = wait(self.inflight, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+                    broken = False
+                    for future in done:
+                        job = self.inflight.pop(future)
+                        error = future.exception()
+                        if error is None:
+                            JobService.complete(job)
+                        else:
+                            broken = broken or isinstance(error, BrokenProcessPool)
+                            JobService.fail(job, ''.join(traceback.format_exception(error)))
+                        processed += 1
+                    if broken:
+                        # Un processus a été tué (mémoire, signal) : pool à recréer
+                        logger.error("Pool de processus interrompu, redémarrage")
+                        for job in self.inflight.values():
+                            JobService.fail(job, "Pool de processus interrompu")
+                        self.inflight.clear()
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        pool = self._new_pool()
+                elif not claimed:
+                    if self.burst:
+                        break
+                    time.sleep(self.poll_interval)
+
+                if self.inflight and time.monotonic() - last_heartbeat > settings.JOBS_VISIBILITY_TIMEOUT / 3:
+                    JobService.extend([job.pk for job in self.inflight.values()], self.worker_id)
+                    last_heartbeat = time.monotonic()
+        finally:
+            pool.shutdown(wait=True)
+            connections.close_all()
+        return processed
@@ -0,0 +1,97 @@
+"""
+Admin pour l'app mailer
+"""
+from django.contrib import admin, messages
+
+from .models import CampaignRecipient, EmailCampaign, OutgoingEmail
+from .services import CampaignService, MailService
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    """
+    Admin de la file d'attente des emails
+    """
+    list_display = ['subject', 'to', 'status', 'priority', 'attempts', 'send_after', 'created_at']
+    list_filter = ['status']
+    search_fields = ['to', 'subject', 'last_error']
+    readonly_fields = [
+        'to', 'from_email', 'subject', 'body', 'html_body', 'attempts',
+        'locked_until', 'last_error', 'created_at'
+    ]
+    actions = ['retry_emails']
+
+    @admin.action(description="Relancer les emails en échec sélectionnés")
+    def retry_emails(self, request, queryset):
+        count = MailService.retry(queryset.values_list('pk', flat=True))
+        self.message_user(request, f"{count} email(s) remis en attente.")
+
+
+@admin.register(EmailCampaign)
+class EmailCampaignAdmin(admin.ModelAdmin):
+    """
+    Admin des campagnes d'emails
+    """
+    list_display = ['name', 'audience', 'category', 'status', 'progress', 'created_at', 'finished_at']
+    list_filter = ['status', 'audience', 'category']
+    search_fields = ['name', 'subject']
+    readonly_fields = ['status', 'recipients_ready', 'created_by', 'created_at', 'started_at', 'finished_at']
+    actions = ['start_campaigns', 'pause_campaigns']
+
+    fieldsets = (
+        ('Message', {
+            'fields': ('name', 'subject', 'body', 'html_body'),
+            'description': "Gabarits Django : {{ user.first_name }}, "
+                           "{% for candidature in candidatures %}{{ candidature.category.name }}{% endfor %}…"
+        }),
+        ('Destinataires', {
+            'fields': ('audience', 'category', 'rate')
+        }),
+        ('Suivi', {
+            'fields': ('status', 'recipients_ready', 'created_by', 'created_at', 'started_at', 'finished_at'),
+            'classes': ('collapse',)
+        }),
+    )
+
+    def save_model(self, request, obj, form, change):
+        if not change:
+            obj.created_by = request.user
+        super().save_model(request, obj, form, change)
+
+    @admin.display(description="Envoyés / échecs / total")
+    def progress(self, obj):
+        counts = CampaignService.progress(obj)
+        return f"{counts['sent']} / {counts['failed']} / {sum(counts.values())}"
+
+    @admin.action(description="Lancer ou reprendre les campagnes sélectionnées")
+    def start_campaigns(self, request, queryset):
+        started = 0
+        for campaign in queryset:
+            try:
+                started += CampaignService.start(campaign)
+            except ValueError as e:
+                self.message_user(request, f"{campaign.name} : {e}", level=messages.ERROR)
+        self.message_user(request, f"{started} campagne(s) lancée(s).")
+
+    @admin.action(description="Mettre en pause les campagnes sélectionnées")
+    def pause_campaigns(self, request, queryset):
+        paused = sum(CampaignService.pause(campaign) for campaign in queryset)
+        self.message_user(request, f"{paused} campagne(s) mise(s) en pause.")
+
+
+@admin.register(CampaignRecipient)
+class CampaignRecipientAdmin(admin.ModelAdmin):
+    """
+    Admin du suivi des envois par destinataire
+    """
+    list_display = ['email', 'campaign', 'status', 'attempts', 'sent_at']
+    list_filter = ['status', 'campaign']
+    search_fields = ['email', 'last_error']
+    list_select_related = ['campaign']
+    readonly_fields = ['campaign', 'user', 'email', 'attempts', 'send_after', 'locked_until', 'last_error', 'sent_at']
+    actions = ['retry_recipients']
+
+    @admin.action(description="Renvoyer aux destinataires en échec sélectionnés")
+    def retry_recipients(self, request, queryset):
+        count = CampaignService.retry(queryset.values_list('pk', flat=True))
+        self.message_user(request, f"{count} envoi(s) remis en attente.")
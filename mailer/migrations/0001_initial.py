@@ -0,0 +1,39 @@
+# Generated by Django 5.2.7 on 2026-10-19 18:26
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutgoingEmail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('to', models.EmailField(max_length=254, verbose_name='Destinataire')),
+                ('from_email', models.CharField(blank=True, max_length=254, verbose_name='Expéditeur')),
+                ('subject', models.CharField(max_length=255, verbose_name='Sujet')),
+                ('body', models.TextField(verbose_name='Corps (texte)')),
+                ('html_body', models.TextField(blank=True, verbose_name='Corps (HTML)')),
+                ('priority', models.SmallIntegerField(default=0, help_text='Les emails de priorité la plus élevée sont envoyés en premier', verbose_name='Priorité')),
+                ('status', models.CharField(choices=[('queued', 'En attente'), ('sending', "En cours d'envoi"), ('failed', 'En échec')], default='queued', max_length=20, verbose_name='Statut')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Tentatives')),
+                ('send_after', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Envoi à partir de')),
+                ('locked_until', models.DateTimeField(blank=True, null=True, verbose_name="Réservé jusqu'à")),
+                ('last_error', models.TextField(blank=True, verbose_name='Dernière erreur')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Date de création')),
+            ],
+            options={
+                'verbose_name': 'Email en attente',
+                'verbose_name_plural': 'Emails en attente',
+                'ordering': ['-priority', 'send_after', 'id'],
+                'indexes': [models.Index(fields=['status', 'send_after'], name='email_status_send_after_idx'), models.Index(fields=['status', 'locked_until'], name='email_status_locked_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.7 on 2026-10-19 18:30
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('categories', '0010_category_max_file_sizes'),
+        ('mailer', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailCampaign',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200, verbose_name='Nom')),
+                ('subject', models.CharField(max_length=255, verbose_name='Sujet (gabarit)')),
+                ('body', models.TextField(verbose_name='Corps texte (gabarit)')),
+                ('html_body', models.TextField(blank=True, verbose_name='Corps HTML (gabarit)')),
+                ('audience', models.CharField(choices=[('candidates', 'Tous les candidats'), ('pending', 'Candidatures en attente'), ('approved', 'Candidatures approuvées'), ('rejected', 'Candidatures rejetées')], default='candidates', max_length=20, verbose_name='Destinataires')),
+                ('rate', models.FloatField(blank=True, help_text='Vide = MAILER_CAMPAIGN_RATE', null=True, verbose_name='Débit (emails/seconde)')),
+                ('status', models.CharField(choices=[('draft', 'Brouillon'), ('running', 'En cours'), ('paused', 'En pause'), ('done', 'Terminée')], default='draft', max_length=20, verbose_name='Statut')),
+                ('recipients_ready', models.BooleanField(default=False, verbose_name='Destinataires enregistrés')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Date de création')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Date de lancement')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Date de fin')),
+                ('category', models.ForeignKey(blank=True, help_text='Limiter aux candidatures de cette catégorie', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='email_campaigns', to='categories.category', verbose_name='Catégorie')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='email_campaigns', to=settings.AUTH_USER_MODEL, verbose_name='Créée par')),
+            ],
+            options={
+                'verbose_name': "Campagne d'emails",
+                'verbose_name_plural': "Campagnes d'emails",
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CampaignRecipient',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('email', models.EmailField(max_length=254, verbose_name='Email')),
+                ('status', models.CharField(choices=[('pending', 'À envoyer'), ('sending', "En cours d'envoi"), ('sent', 'Envoyé'), ('failed', 'En échec')], default='pending', max_length=20, verbose_name='Statut')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Tentatives')),
+                ('send_after', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Envoi à partir de')),
+                ('locked_until', models.DateTimeField(blank=True, null=True, verbose_name="Réservé jusqu'à")),
+                ('last_error', models.TextField(blank=True, verbose_name='Dernière erreur')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name="Date d'envoi")),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='campaign_deliveries', to=settings.AUTH_USER_MODEL, verbose_name='Utilisateur')),
+                ('campaign', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recipients', to='mailer.emailcampaign', verbose_name='Campagne')),
+            ],
+            options={
+                'verbose_name': 'Destinataire de campagne',
+                'verbose_name_plural': 'Destinataires de campagne',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['campaign', 'status', 'send_after'], name='recipient_campaign_status_idx')],
+                'unique_together': {('campaign', 'user')},
+            },
+        ),
+    ]
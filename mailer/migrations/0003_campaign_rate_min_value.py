@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-19 19:18
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mailer', '0002_email_campaigns'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='emailcampaign',
+            name='rate',
+            field=models.FloatField(blank=True, help_text='Vide = MAILER_CAMPAIGN_RATE', null=True, validators=[django.core.validators.MinValueValidator(0)], verbose_name='Débit (emails/seconde)'),
+        ),
+    ]
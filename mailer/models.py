@@ -0,0 +1,186 @@
+"""
+Modèles pour l'app mailer
+"""
+from django.conf import settings
+from django.core.validators import MinValueValidator
+from django.db import models
+from django.utils import timezone
+
+
+class OutgoingEmail(models.Model):
+    """
+    Email en file d'attente d'envoi
+
+    Les emails sont envoyés par lots par la tâche `send_queued_emails`, sur
+    une connexion conservée d'un lot à l'autre. Un email envoyé est supprimé ;
+    un échec temporaire est replanifié (`send_after`), un échec définitif
+    reste en statut 'failed'.
+    """
+    STATUS_CHOICES = [
+        ('queued', 'En attente'),
+        ('sending', 'En cours d\'envoi'),
+        ('failed', 'En échec'),
+    ]
+
+    to = models.EmailField(verbose_name="Destinataire")
+    from_email = models.CharField(max_length=254, blank=True, verbose_name="Expéditeur")
+    subject = models.CharField(max_length=255, verbose_name="Sujet")
+    body = models.TextField(verbose_name="Corps (texte)")
+    html_body = models.TextField(blank=True, verbose_name="Corps (HTML)")
+    priority = models.SmallIntegerField(
+        default=0,
+        verbose_name="Priorité",
+        help_text="Les emails de priorité la plus élevée sont envoyés en premier"
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='queued',
+        verbose_name="Statut"
+    )
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name="Tentatives")
+    send_after = models.DateTimeField(default=timezone.now, verbose_name="Envoi à partir de")
+    locked_until = models.DateTimeField(null=True, blank=True, verbose_name="Réservé jusqu'à")
+    last_error = models.TextField(blank=True, verbose_name="Dernière erreur")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Date de création")
+
+    class Meta:
+        verbose_name = "Email en attente"
+        verbose_name_plural = "Emails en attente"
+        ordering = ['-priority', 'send_after', 'id']
+        indexes = [
+            models.Index(fields=['status', 'send_after'], name='email_status_send_after_idx'),
+            models.Index(fields=['status', 'locked_until'], name='email_status_locked_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} → {self.to} ({self.get_status_display()})"
+
+
+class EmailCampaign(models.Model):
+    """
+    Envoi groupé d'un message personnalisé à une liste de candidats
+
+    Le sujet et les corps sont des gabarits Django rendus pour chaque
+    destinataire avec `user` et `candidatures` (ses candidatures visées par
+    la campagne). Les destinataires sont enregistrés avec leur état
+    d'envoi : une campagne interrompue reprend là où elle s'était arrêtée.
+    """
+    AUDIENCE_CHOICES = [
+        ('candidates', 'Tous les candidats'),
+        ('pending', 'Candidatures en attente'),
+        ('approved', 'Candidatures approuvées'),
+        ('rejected', 'Candidatures rejetées'),
+    ]
+
+    STATUS_CHOICES = [
+        ('draft', 'Brouillon'),
+        ('running', 'En cours'),
+        ('paused', 'En pause'),
+        ('done', 'Terminée'),
+    ]
+
+    name = models.CharField(max_length=200, verbose_name="Nom")
+    subject = models.CharField(max_length=255, verbose_name="Sujet (gabarit)")
+    body = models.TextField(verbose_name="Corps texte (gabarit)")
+    html_body = models.TextField(blank=True, verbose_name="Corps HTML (gabarit)")
+    audience = models.CharField(
+        max_length=20,
+        choices=AUDIENCE_CHOICES,
+        default='candidates',
+        verbose_name="Destinataires"
+    )
+    category = models.ForeignKey(
+        'categories.Category',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='email_campaigns',
+        verbose_name="Catégorie",
+        help_text="Limiter aux candidatures de cette catégorie"
+    )
+    rate = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(0)],
+        verbose_name="Débit (emails/seconde)",
+        help_text="Vide = MAILER_CAMPAIGN_RATE"
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='draft',
+        verbose_name="Statut"
+    )
+    recipients_ready = models.BooleanField(
+        default=False,
+        verbose_name="Destinataires enregistrés"
+    )
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='email_campaigns',
+        verbose_name="Créée par"
+    )
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Date de création")
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name="Date de lancement")
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name="Date de fin")
+
+    class Meta:
+        verbose_name = "Campagne d'emails"
+        verbose_name_plural = "Campagnes d'emails"
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.name} ({self.get_status_display()})"
+
+
+class CampaignRecipient(models.Model):
+    """
+    Destinataire d'une campagne et état de son envoi
+    """
+    STATUS_CHOICES = [
+        ('pending', 'À envoyer'),
+        ('sending', 'En cours d\'envoi'),
+        ('sent', 'Envoyé'),
+        ('failed', 'En échec'),
+    ]
+
+    campaign = models.ForeignKey(
+        EmailCampaign,
+        on_delete=models.CASCADE,
+        related_name='recipients',
+        verbose_name="Campagne"
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='campaign_deliveries',
+        verbose_name="Utilisateur"
+    )
+    email = models.EmailField(verbose_name="Email")
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='pending',
+        verbose_name="Statut"
+    )
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name="Tentatives")
+    send_after = models.DateTimeField(default=timezone.now, verbose_name="Envoi à partir de")
+    locked_until = models.DateTimeField(null=True, blank=True, verbose_name="Réservé jusqu'à")
+    last_error = models.TextField(blank=True, verbose_name="Dernière erreur")
+    sent_at = models.DateTimeField(null=True, blank=True, verbose_name="Date d'envoi")
+
+    class Meta:
+        verbose_name = "Destinataire de campagne"
+        verbose_name_plural = "Destinataires de campagne"
+        ordering = ['id']
+        unique_together = ('campaign', 'user')
+        indexes = [
+            models.Index(fields=['campaign', 'status', 'send_after'], name='recipient_campaign_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.email} ({self.get_status_display()})"
@@ -0,0 +1,477 @@
+"""
+Services pour l'app mailer
+"""
+import logging
+import math
+import random
+import smtplib
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db.models import Count, F, Prefetch, Q
+from django.template import Context, Template, TemplateSyntaxError
+from django.utils import timezone
+
+from config.throttle import Throttle
+
+from .models import CampaignRecipient, EmailCampaign, OutgoingEmail
+
+logger = logging.getLogger(__name__)
+
+
+class MailConnection:
+    """
+    Connexion au backend email conservée entre les lots (une par processus)
+
+    Renouvelée après MAILER_CONNECTION_MAX_AGE secondes, ou après une erreur :
+    les serveurs SMTP ferment les connexions restées inactives trop longtemps.
+    """
+    connection = None
+    opened_at = 0
+
+    @classmethod
+    def get(cls):
+        if cls.connection is not None and time.monotonic() - cls.opened_at > settings.MAILER_CONNECTION_MAX_AGE:
+            cls.close()
+        if cls.connection is None:
+            connection = get_connection(fail_silently=False)
+            connection.open()
+            cls.connection = connection
+            cls.opened_at = time.monotonic()
+        return cls.connection
+
+    @classmethod
+    def close(cls):
+        connection, cls.connection = cls.connection, None
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+
+class MailService:
+    """
+    Service de file d'attente des emails
+
+    `queue` enregistre l'email et planifie son envoi : la requête n'attend
+    pas le serveur SMTP. La réservation se fait par UPDATE conditionnel,
+    comme pour les tâches (voir JobService.claim).
+    """
+
+    @staticmethod
+    def queue(to, subject, body, html_body='', from_email=None, priority=0):
+        """
+        Met un email en file d'attente (envoyé après le commit de la transaction)
+        """
+        email = OutgoingEmail.objects.create(
+            to=to, subject=subject, body=body, html_body=html_body,
+            from_email=from_email or '', priority=priority
+        )
+        MailService.schedule(priority=priority)
+        return email
+
+    @staticmethod
+    def schedule(priority=0, delay=None):
+        """
+        Planifie l'envoi des emails en attente par le worker
+        """
+        from .tasks import send_queued_emails
+        send_queued_emails.enqueue(priority=priority, delay=delay)
+
+    @staticmethod
+    def claim(limit):
+        """
+        Réserve jusqu'à `limit` emails à envoyer, par priorité décroissante
+        Les envois interrompus dont la réservation a expiré sont repris.
+        """
+        now = timezone.now()
+        candidates = OutgoingEmail.objects.filter(
+            Q(status='queued', send_after__lte=now) |
+            Q(status='sending', locked_until__lt=now)
+        ).order_by('-priority', 'send_after', 'id').values('id', 'status', 'locked_until')[:limit]
+
+        locked_until = now + timezone.timedelta(seconds=settings.JOBS_VISIBILITY_TIMEOUT)
+        claimed = []
+        for candidate in candidates:
+            updated = OutgoingEmail.objects.filter(
+                pk=candidate['id'], status=candidate['status'],
+                locked_until=candidate['locked_until']
+            ).update(status='sending', locked_until=locked_until, attempts=F('attempts') + 1)
+            if updated:
+                claimed.append(candidate['id'])
+        return list(OutgoingEmail.objects.filter(pk__in=claimed).order_by('-priority', 'send_after', 'id'))
+
+    @staticmethod
+    def build_message(email, connection=None):
+        """
+        Construit le message Django correspondant à un email en attente
+        """
+        message = EmailMultiAlternatives(
+            subject=email.subject,
+            body=email.body,
+            from_email=email.from_email or settings.DEFAULT_FROM_EMAIL,
+            to=[email.to],
+            connection=connection,
+        )
+        if email.html_body:
+            message.attach_alternative(email.html_body, 'text/html')
+        return message
+
+    @staticmethod
+    def send_batch(limit=None):
+        """
+        Envoie un lot d'emails sur la connexion partagée
+
+        Retourne le nombre d'emails traités (0 si la file est vide).
+        """
+        emails = MailService.claim(limit or settings.MAILER_BATCH_SIZE)
+        for email in emails:
+            try:
+                MailService.deliver(MailService.build_message(email))
+            except Exception as e:
+                MailConnection.close()
+                MailService.fail(email, e)
+            else:
+                OutgoingEmail.objects.filter(pk=email.pk, status='sending').delete()
+        return len(emails)
+
+    @staticmethod
+    def deliver(message):
+        """
+        Envoie un message sur la connexion partagée
+        """
+        connection = MailConnection.get()
+        try:
+            connection.send_messages([message])
+        except smtplib.SMTPServerDisconnected:
+            # Connexion fermée par le serveur pendant l'inactivité : une seule reprise
+            MailConnection.close()
+            MailConnection.get().send_messages([message])
+
+    @staticmethod
+    def is_transient(error):
+        """
+        Indique si l'erreur d'envoi peut disparaître en réessayant
+        """
+        if isinstance(error, smtplib.SMTPRecipientsRefused):
+            return all(400 <= code < 500 for code, _ in error.recipients.values())
+        if isinstance(error, smtplib.SMTPResponseException):
+            return 400 <= error.smtp_code < 500
+        return isinstance(error, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, OSError))
+
+    @staticmethod
+    def backoff(attempts):
+        """
+        Délai avant nouvelle tentative : exponentiel, plafonné, avec dispersion
+        """
+        delay = min(settings.MAILER_RETRY_BACKOFF * 2 ** (attempts - 1), settings.JOBS_RETRY_BACKOFF_MAX)
+        return delay * random.uniform(0.8, 1.2)
+
+    @staticmethod
+    def fail(email, error):
+        """
+        Replanifie un email après un échec temporaire, ou le marque en échec
+        """
+        updates = {'last_error': f'{type(error).__name__}: {error}', 'locked_until': None}
+        if MailService.is_transient(error) and email.attempts < settings.MAILER_MAX_ATTEMPTS:
+            delay = MailService.backoff(email.attempts)
+            updates['status'] = 'queued'
+            updates['send_after'] = timezone.now() + timezone.timedelta(seconds=delay)
+            MailService.schedule(priority=email.priority, delay=delay)
+        else:
+            updates['status'] = 'failed'
+            logger.error("Envoi de l'email #%s à %s abandonné : %s", email.pk, email.to, error)
+        OutgoingEmail.objects.filter(pk=email.pk, status='sending').update(**updates)
+
+    @staticmethod
+    def retry(email_ids):
+        """
+        Remet en attente des emails en échec définitif
+        """
+        count = OutgoingEmail.objects.filter(pk__in=email_ids, status='failed').update(
+            status='queued', attempts=0, send_after=timezone.now()
+        )
+        if count:
+            MailService.schedule()
+        return count
+
+
+class CampaignService:
+    """
+    Service des campagnes d'emails
+
+    Les destinataires sont enregistrés par lots depuis un itérateur (la
+    liste n'est jamais chargée en mémoire), puis envoyés par la tâche
+    `run_campaign` au débit de la campagne, sur la connexion partagée.
+    Chaque tâche traite une tranche de CAMPAIGN_SLICE secondes et se
+    replanifie : les emails prioritaires (OTP) ne restent pas bloqués
+    derrière une longue campagne.
+    """
+    CAMPAIGN_SLICE = 60  # secondes
+
+    @staticmethod
+    def audience(campaign):
+        """
+        Retourne les utilisateurs visés par la campagne
+        """
+        users = get_user_model().objects.filter(user_type='candidate', is_active=True)
+        candidatures = CampaignService.candidature_filter(campaign)
+        if candidatures:
+            users = users.filter(**{f'candidatures__{key}': value for key, value in candidatures.items()}).distinct()
+        return users
+
+    @staticmethod
+    def candidature_filter(campaign):
+        """
+        Filtre des candidatures visées par la campagne
+        """
+        filters = {}
+        if campaign.audience != 'candidates':
+            filters['status'] = campaign.audience
+        if campaign.category_id:
+            filters['category_id'] = campaign.category_id
+        return filters
+
+    @staticmethod
+    def compile(campaign):
+        """
+        Compile les gabarits de la campagne (ValueError si l'un est invalide)
+        """
+        try:
+            return (
+                Template(campaign.subject),
+                Template(campaign.body),
+                Template(campaign.html_body) if campaign.html_body else None,
+            )
+        except TemplateSyntaxError as e:
+            raise ValueError(f"Gabarit invalide: {e}")
+
+    @staticmethod
+    def start(campaign):
+        """
+        Lance (ou reprend) l'envoi d'une campagne
+        """
+        if campaign.status == 'done':
+            raise ValueError("Cette campagne est déjà terminée.")
+        CampaignService.compile(campaign)
+        updated = EmailCampaign.objects.filter(pk=campaign.pk, status__in=['draft', 'paused']).update(
+            status='running', started_at=campaign.started_at or timezone.now()
+        )
+        if updated:
+            from .tasks import run_campaign
+            run_campaign.enqueue(campaign.pk)
+        return bool(updated)
+
+    @staticmethod
+    def pause(campaign):
+        """
+        Suspend une campagne ; l'envoi s'arrête à la fin du lot en cours
+        """
+        return bool(EmailCampaign.objects.filter(pk=campaign.pk, status='running').update(status='paused'))
+
+    @staticmethod
+    def add_recipients(campaign, users=None, batch_size=None):
+        """
+        Enregistre les destinataires par lots
+
+        `users` : queryset d'utilisateurs (par défaut l'audience de la
+        campagne). Les destinataires déjà enregistrés sont ignorés, ce qui
+        permet de reprendre après une interruption. Retourne le nombre
+        d'utilisateurs parcourus.
+        """
+        batch_size = batch_size or settings.MAILER_BATCH_SIZE
+        if users is None:
+            users = CampaignService.audience(campaign)
+        rows = users.exclude(email='').order_by('pk').values_list('pk', 'email')
+
+        count = 0
+        batch = []
+        for user_id, email in rows.iterator(chunk_size=batch_size):
+            batch.append(CampaignRecipient(campaign=campaign, user_id=user_id, email=email))
+            if len(batch) == batch_size:
+                CampaignRecipient.objects.bulk_create(batch, ignore_conflicts=True)
+                count += len(batch)
+                batch = []
+        if batch:
+            CampaignRecipient.objects.bulk_create(batch, ignore_conflicts=True)
+            count += len(batch)
+        return count
+
+    @staticmethod
+    def claim(campaign, limit):
+        """
+        Réserve jusqu'à `limit` destinataires à traiter
+        Les envois interrompus dont la réservation a expiré sont repris.
+        """
+        now = timezone.now()
+        candidates = CampaignRecipient.objects.filter(
+            Q(status='pending', send_after__lte=now) |
+            Q(status='sending', locked_until__lt=now),
+            campaign=campaign
+        ).order_by('id').values('id', 'status', 'locked_until')[:limit]
+
+        locked_until = now + timezone.timedelta(seconds=settings.JOBS_VISIBILITY_TIMEOUT)
+        claimed = []
+        for candidate in candidates:
+            updated = CampaignRecipient.objects.filter(
+                pk=candidate['id'], status=candidate['status'],
+                locked_until=candidate['locked_until']
+            ).update(status='sending', locked_until=locked_until, attempts=F('attempts') + 1)
+            if updated:
+                claimed.append(candidate['id'])
+
+        candidatures = Prefetch(
+            'user__candidatures',
+            queryset=CampaignService.candidatures_queryset(campaign),
+            to_attr='campaign_candidatures'
+        )
+        return list(
+            CampaignRecipient.objects.filter(pk__in=claimed)
+            .select_related('user').prefetch_related(candidatures).order_by('id')
+        )
+
+    @staticmethod
+    def candidatures_queryset(campaign):
+        """
+        Candidatures visées par la campagne, passées aux gabarits
+        """
+        from candidates.models import Candidature
+        return Candidature.objects.filter(
+            **CampaignService.candidature_filter(campaign)
+        ).select_related('category')
+
+    @staticmethod
+    def build_message(recipient, templates):
+        """
+        Rend les gabarits pour un destinataire
+        """
+        subject, body, html_body = templates
+        context = {'user': recipient.user, 'candidatures': recipient.user.campaign_candidatures}
+        message = EmailMultiAlternatives(
+            subject=' '.join(subject.render(Context(context, autoescape=False)).split()),
+            body=body.render(Context(context, autoescape=False)),
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[recipient.email],
+        )
+        if html_body:
+            message.attach_alternative(html_body.render(Context(context)), 'text/html')
+        return message
+
+    @staticmethod
+    def batch_size(rate, deadline):
+        """
+        Nombre de destinataires à réserver : pas plus que le débit ne permet
+        d'en envoyer avant la fin de la tranche, pour que les réservations
+        (JOBS_VISIBILITY_TIMEOUT) n'expirent pas avant l'envoi
+        """
+        if not rate:
+            return settings.MAILER_BATCH_SIZE
+        remaining = max(deadline - time.monotonic(), 0)
+        return max(1, min(settings.MAILER_BATCH_SIZE, math.ceil(rate * remaining)))
+
+    @staticmethod
+    def run(campaign_id):
+        """
+        Envoie une tranche de la campagne ; retourne True si elle est terminée
+        """
+        try:
+            campaign = EmailCampaign.objects.get(pk=campaign_id, status='running')
+        except EmailCampaign.DoesNotExist:
+            return True
+
+        if not campaign.recipients_ready:
+            CampaignService.add_recipients(campaign)
+            EmailCampaign.objects.filter(pk=campaign.pk).update(recipients_ready=True)
+
+        templates = CampaignService.compile(campaign)
+        rate = campaign.rate or settings.MAILER_CAMPAIGN_RATE
+        throttle = Throttle(rate)
+        deadline = time.monotonic() + CampaignService.CAMPAIGN_SLICE
+
+        while time.monotonic() < deadline:
+            if not EmailCampaign.objects.filter(pk=campaign.pk, status='running').exists():
+                return True
+            recipients = CampaignService.claim(campaign, CampaignService.batch_size(rate, deadline))
+            if not recipients:
+                return CampaignService.finish(campaign)
+            for recipient in recipients:
+                throttle.wait()
+                CampaignService.send(recipient, templates)
+
+        CampaignService.schedule(campaign)
+        return False
+
+    @staticmethod
+    def send(recipient, templates):
+        """
+        Envoie l'email d'un destinataire et enregistre le résultat
+        """
+        try:
+            MailService.deliver(CampaignService.build_message(recipient, templates))
+        except Exception as e:
+            MailConnection.close()
+            updates = {'last_error': f'{type(e).__name__}: {e}', 'locked_until': None}
+            if MailService.is_transient(e) and recipient.attempts < settings.MAILER_MAX_ATTEMPTS:
+                updates['status'] = 'pending'
+                updates['send_after'] = timezone.now() + timezone.timedelta(
+                    seconds=MailService.backoff(recipient.attempts)
+                )
+            else:
+                updates['status'] = 'failed'
+                logger.warning("Campagne #%s : envoi à %s abandonné : %s", recipient.campaign_id, recipient.email, e)
+        else:
+            updates = {'status': 'sent', 'sent_at': timezone.now(), 'locked_until': None, 'last_error': ''}
+        CampaignRecipient.objects.filter(pk=recipient.pk, status='sending').update(**updates)
+
+    @staticmethod
+    def finish(campaign):
+        """
+        Termine la campagne, ou la replanifie s'il reste des envois différés
+        """
+        remaining = CampaignRecipient.objects.filter(campaign=campaign, status__in=['pending', 'sending'])
+        next_retry = remaining.filter(status='pending').order_by('send_after').values_list('send_after', flat=True).first()
+        if next_retry is not None:
+            delay = max((next_retry - timezone.now()).total_seconds(), 0)
+            CampaignService.schedule(campaign, delay=delay)
+            return False
+        if remaining.exists():
+            # Envois réservés par une autre tâche : elle terminera la campagne
+            return False
+        EmailCampaign.objects.filter(pk=campaign.pk, status='running').update(
+            status='done', finished_at=timezone.now()
+        )
+        return True
+
+    @staticmethod
+    def schedule(campaign, delay=None):
+        from .tasks import run_campaign
+        run_campaign.enqueue(campaign.pk, delay=delay)
+
+    @staticmethod
+    def retry(recipient_ids):
+        """
+        Remet en attente des destinataires en échec et relance leurs campagnes
+        """
+        recipients = CampaignRecipient.objects.filter(pk__in=recipient_ids, status='failed')
+        campaign_ids = set(recipients.values_list('campaign_id', flat=True))
+        count = recipients.update(status='pending', attempts=0, send_after=timezone.now())
+        for campaign in EmailCampaign.objects.filter(pk__in=campaign_ids):
+            if campaign.status == 'done':
+                EmailCampaign.objects.filter(pk=campaign.pk).update(status='paused', finished_at=None)
+                campaign.status = 'paused'
+            if campaign.status == 'paused':
+                CampaignService.start(campaign)
+        return count
+
+    @staticmethod
+    def progress(campaign):
+        """
+        Nombre de destinataires par statut
+        """
+        counts = dict(
+            campaign.recipients.values_list('status').annotate(count=Count('id')).order_by()
+        )
+        return {status: counts.get(status, 0) for status, _ in CampaignRecipient.STATUS_CHOICES}
@@ -0,0 +1,19 @@
+"""
+Tâches en arrière-plan de l'app mailer
+"""
+from jobs.registry import task
+
+from .services import CampaignService, MailService
+
+
+@task(priority=10)
+def send_queued_emails():
+    """Envoie les emails en attente par lots, jusqu'à épuisement de la file"""
+    while MailService.send_batch():
+        pass
+
+
+@task(priority=0)
+def run_campaign(campaign_id):
+    """Envoie une tranche d'une campagne d'emails (se replanifie jusqu'à la fin)"""
+    CampaignService.run(campaign_id)
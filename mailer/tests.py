@@ -0,0 +1,191 @@
+import smtplib
+import time
+
+from django.core import mail
+from django.core.exceptions import ValidationError
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase, override_settings
+
+from accounts.models import User
+from candidates.models import Candidature
+from categories.models import Category
+from .models import CampaignRecipient, EmailCampaign, OutgoingEmail
+from .services import CampaignService, MailConnection, MailService
+
+
+class FlakyBackend(EmailBackend):
+    """
+    Backend locmem qui compte ses ouvertures et refuse certains destinataires
+    """
+    opened = 0
+    disconnects = 0
+
+    def open(self):
+        FlakyBackend.opened += 1
+
+    def send_messages(self, messages):
+        for message in messages:
+            if 'temporaire' in message.to[0]:
+                raise smtplib.SMTPRecipientsRefused({message.to[0]: (451, b'Try again later')})
+            if 'inconnu' in message.to[0]:
+                raise smtplib.SMTPRecipientsRefused({message.to[0]: (550, b'No such user')})
+            if FlakyBackend.disconnects:
+                FlakyBackend.disconnects -= 1
+                raise smtplib.SMTPServerDisconnected('Connection unexpectedly closed')
+        return super().send_messages(messages)
+
+
+@override_settings(EMAIL_BACKEND='mailer.tests.FlakyBackend', JOBS_EAGER=True, MAILER_BATCH_SIZE=10)
+class MailServiceTest(TestCase):
+    """
+    Les emails sont mis en file dans la requête et envoyés par lots sur une
+    connexion réutilisée ; les échecs temporaires sont replanifiés.
+    """
+
+    def setUp(self):
+        MailConnection.close()
+        FlakyBackend.opened = 0
+        FlakyBackend.disconnects = 0
+
+    def queue(self, count, to='candidat{}@example.com', **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            for index in range(count):
+                MailService.queue(to.format(index), 'Sujet', 'Corps', **kwargs)
+
+    def test_queue_does_not_send_before_commit(self):
+        MailService.queue('candidat@example.com', 'Sujet', 'Corps')
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutgoingEmail.objects.count(), 1)
+
+    def test_batch_reuses_connection(self):
+        self.queue(25)
+        self.assertEqual(len(mail.outbox), 25)
+        self.assertEqual(FlakyBackend.opened, 1)
+        self.assertFalse(OutgoingEmail.objects.exists())
+
+    def test_priority_order(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            MailService.queue('campagne@example.com', 'Campagne', 'Corps', priority=-5)
+            MailService.queue('otp@example.com', 'Code', 'Corps', priority=10)
+        MailService.send_batch()
+        self.assertEqual([message.to[0] for message in mail.outbox], ['otp@example.com', 'campagne@example.com'])
+
+    def test_disconnect_reopens_connection(self):
+        FlakyBackend.disconnects = 1
+        self.queue(3)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(FlakyBackend.opened, 2)
+
+    def test_transient_failure_is_rescheduled(self):
+        self.queue(1, to='temporaire@example.com')
+        email = OutgoingEmail.objects.get()
+        self.assertEqual(email.status, 'queued')
+        self.assertEqual(email.attempts, 1)
+        self.assertGreater(email.send_after, email.created_at)
+        self.assertIn('451', email.last_error)
+
+    def test_permanent_failure(self):
+        self.queue(1, to='inconnu@example.com')
+        self.queue(1)
+        self.assertEqual(OutgoingEmail.objects.get().status, 'failed')
+        self.assertEqual(len(mail.outbox), 1)
+
+
+@override_settings(EMAIL_BACKEND='mailer.tests.FlakyBackend', JOBS_EAGER=True, MAILER_BATCH_SIZE=2)
+class CampaignServiceTest(TestCase):
+    """
+    Une campagne rend ses gabarits par destinataire, enregistre l'état de
+    chaque envoi et reprend sans renvoyer aux destinataires déjà servis.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.musique = Category.objects.create(name='Musique', description='d')
+        cls.danse = Category.objects.create(name='Danse', description='d')
+        for index, (category, status) in enumerate([
+            (cls.musique, 'approved'), (cls.danse, 'approved'), (cls.musique, 'rejected'),
+            (cls.danse, 'approved'), (cls.musique, 'approved'),
+        ]):
+            candidate = User.objects.create_user(
+                email=f'candidat{index}@example.com', username=f'candidat{index}',
+                password='x', first_name=f'Fanta{index}', last_name='Kouyaté', user_type='candidate'
+            )
+            Candidature.objects.create(candidate=candidate, category=category, status=status)
+
+    def setUp(self):
+        MailConnection.close()
+        FlakyBackend.opened = 0
+        FlakyBackend.disconnects = 0
+        self.campaign = EmailCampaign.objects.create(
+            name='Résultats', audience='approved', rate=0,
+            subject='Bravo {{ user.first_name }}',
+            body='{% for candidature in candidatures %}{{ candidature.category.name }}{% endfor %}',
+            html_body='<p>{{ user.last_name }} & co</p>',
+        )
+
+    def start(self, campaign=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            CampaignService.start(campaign or self.campaign)
+        self.campaign.refresh_from_db()
+
+    def test_campaign_sends_rendered_messages(self):
+        self.start()
+        self.assertEqual(self.campaign.status, 'done')
+        self.assertEqual(len(mail.outbox), 4)
+        self.assertEqual(FlakyBackend.opened, 1)
+        message = next(m for m in mail.outbox if m.to == ['candidat1@example.com'])
+        self.assertEqual(message.subject, 'Bravo Fanta1')
+        self.assertEqual(message.body, 'Danse')
+        self.assertEqual(message.alternatives[0][0], '<p>Kouyaté & co</p>')
+        self.assertEqual(CampaignService.progress(self.campaign)['sent'], 4)
+
+    def test_category_filter(self):
+        self.campaign.category = self.musique
+        self.campaign.save()
+        self.start()
+        self.assertEqual(sorted(m.to[0] for m in mail.outbox), ['candidat0@example.com', 'candidat4@example.com'])
+
+    def test_resume_skips_sent_recipients(self):
+        CampaignService.add_recipients(self.campaign)
+        CampaignRecipient.objects.filter(email='candidat0@example.com').update(status='sent')
+        EmailCampaign.objects.filter(pk=self.campaign.pk).update(recipients_ready=True)
+        self.start()
+        self.assertEqual(self.campaign.status, 'done')
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertNotIn(['candidat0@example.com'], [m.to for m in mail.outbox])
+
+    def test_paused_campaign_stops(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            CampaignService.start(self.campaign)
+        CampaignService.pause(self.campaign)
+        self.assertTrue(CampaignService.run(self.campaign.pk))
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_failures_are_tracked_per_recipient(self):
+        User.objects.filter(email='candidat1@example.com').update(email='temporaire@example.com')
+        User.objects.filter(email='candidat3@example.com').update(email='inconnu@example.com')
+        self.start()
+        statuses = dict(CampaignRecipient.objects.values_list('email', 'status'))
+        self.assertEqual(statuses['temporaire@example.com'], 'pending')
+        self.assertEqual(statuses['inconnu@example.com'], 'failed')
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(self.campaign.status, 'running')
+
+    @override_settings(MAILER_BATCH_SIZE=100)
+    def test_batch_size_follows_rate(self):
+        deadline = time.monotonic() + CampaignService.CAMPAIGN_SLICE
+        # 0,1 email/s : 6 envois tiennent dans la tranche de 60 secondes
+        self.assertEqual(CampaignService.batch_size(0.1, deadline), 6)
+        self.assertEqual(CampaignService.batch_size(10, deadline), 100)
+        self.assertEqual(CampaignService.batch_size(0, deadline), 100)
+        self.assertEqual(CampaignService.batch_size(0.1, time.monotonic()), 1)
+
+    def test_negative_rate_rejected(self):
+        self.campaign.rate = -1
+        with self.assertRaises(ValidationError):
+            self.campaign.full_clean()
+
+    def test_invalid_template(self):
+        self.campaign.subject = '{% if %}'
+        with self.assertRaises(ValueError):
+            CampaignService.start(self.campaign)
@@ -0,0 +1,25 @@
+from django.contrib import admin
+
+from .models import MediaBlob, ResponsiveImage
+
+
+@admin.register(ResponsiveImage)
+class ResponsiveImageAdmin(admin.ModelAdmin):
+    """Administration des déclinaisons d'images (lecture seule)"""
+    list_display = ['source', 'width', 'height', 'created_at']
+    search_fields = ['source']
+    readonly_fields = ['source', 'width', 'height', 'lqip', 'renditions', 'created_at']
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(MediaBlob)
+class MediaBlobAdmin(admin.ModelAdmin):
+    """Administration des blobs dédupliqués (lecture seule)"""
+    list_display = ['sha256', 'name', 'size', 'ref_count', 'created_at']
+    search_fields = ['sha256', 'name']
+    readonly_fields = ['sha256', 'name', 'size', 'ref_count', 'created_at']
+
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class MediafilesConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "mediafiles"
+
+    def ready(self):
+        from .signals import connect_signals
+        connect_signals()
@@ -0,0 +1,37 @@
+"""
+Champ fichier à stockage adressé par contenu
+"""
+from django.db import models
+from django.db.models.fields.files import FieldFile
+
+
+class ContentAddressedFieldFile(FieldFile):
+    """
+    Fichier enregistré sous son empreinte SHA-256 : un contenu déjà stocké
+    n'est pas réécrit, le champ pointe vers le blob existant.
+    """
+
+    def save(self, name, content, save=True):
+        from .services import BlobService
+
+        blob = BlobService.store(content, name, storage=self.storage)
+        self.name = blob.name
+        setattr(self.instance, self.field.attname, self.name)
+        # Référence déjà prise par store() : le signal ne doit pas la recompter
+        self.instance._acquired_blob_names = getattr(self.instance, '_acquired_blob_names', set()) | {blob.name}
+        self._committed = True
+
+        if save:
+            self.instance.save()
+
+    save.alters_data = True
+
+
+class ContentAddressedFileField(models.FileField):
+    """
+    FileField dont les uploads sont dédupliqués (voir MediaBlob)
+
+    `upload_to` reste utilisé pour les noms réservés hors upload (upload
+    direct vers le stockage), qui ne sont pas dédupliqués.
+    """
+    attr_class = ContentAddressedFieldFile
@@ -0,0 +1,181 @@
+"""
+Ramasse-miettes des fichiers médias orphelins (stockage local)
+
+Les noms référencés en base (champs fichier de tous les modèles,
+déclinaisons d'images, blobs) sont chargés par lots dans un ensemble
+d'empreintes de 8 octets, puis l'arborescence de MEDIA_ROOT est parcourue
+avec `os.scandir` sans être chargée en mémoire. Une collision d'empreintes
+ne peut que conserver un fichier orphelin, jamais supprimer un fichier utilisé.
+
+Les fichiers récents sont ignorés : un upload en cours est écrit sur disque
+avant que sa ligne ne soit enregistrée.
+"""
+import hashlib
+import os
+import shutil
+
+from django.apps import apps
+from django.db import models
+
+from config.throttle import Throttle
+from .models import MediaBlob, ResponsiveImage
+
+
+def name_key(name):
+    """Empreinte compacte d'un nom de fichier du stockage"""
+    return hashlib.blake2b(name.encode('utf-8', 'surrogateescape'), digest_size=8).digest()
+
+
+def file_fields():
+    """
+    Retourne les (modèle, champ) de type fichier de tous les modèles installés
+    """
+    return [
+        (model, field)
+        for model in apps.get_models()
+        for field in model._meta.concrete_fields
+        if isinstance(field, models.FileField)
+    ]
+
+
+def referenced_file_keys(batch_size=2000):
+    """
+    Empreintes des noms enregistrés dans les champs fichier
+    """
+    keys = set()
+    for model, field in file_fields():
+        names = model._base_manager.exclude(**{field.attname: ''}).exclude(
+            **{f'{field.attname}__isnull': True}
+        ).values_list(field.attname, flat=True)
+        for name in names.iterator(chunk_size=batch_size):
+            keys.add(name_key(name))
+    return keys
+
+
+class MediaGarbageCollector:
+    """
+    Supprime (ou met en quarantaine) les fichiers de `root` non référencés
+
+    `cutoff` : horodatage (datetime) avant lequel un fichier ou une ligne
+    est assez ancien pour être collecté.
+    """
+
+    def __init__(self, root, cutoff, dry_run=False, quarantine_dir=None,
+                 rate=0, scan_rate=0, batch_size=2000):
+        self.root = os.path.abspath(root)
+        self.cutoff = cutoff
+        self.dry_run = dry_run
+        self.quarantine_dir = os.path.abspath(quarantine_dir) if quarantine_dir else None
+        self.remove_throttle = Throttle(rate)
+        self.scan_throttle = Throttle(scan_rate)
+        self.batch_size = batch_size
+        self.stats = {
+            'scanned': 0, 'orphans': 0, 'bytes': 0,
+            'stale_derivatives': 0, 'unused_blobs': 0, 'errors': 0,
+        }
+
+    def referenced_keys(self):
+        """
+        Ensemble des empreintes des noms encore utilisés
+
+        Les déclinaisons d'une image qui n'est plus référencée et les blobs
+        sans référence sont écartés (et leurs lignes supprimées).
+        """
+        keys = referenced_file_keys(self.batch_size)
+
+        derivatives = ResponsiveImage.objects.values_list('pk', 'source', 'renditions', 'created_at')
+        stale = []
+        for pk, source, renditions, created_at in derivatives.iterator(chunk_size=self.batch_size):
+            if name_key(source) not in keys and created_at < self.cutoff:
+                stale.append(pk)
+                continue
+            keys.update(name_key(rendition['name']) for rendition in renditions)
+        self.stats['stale_derivatives'] = len(stale)
+        if not self.dry_run:
+            for start in range(0, len(stale), self.batch_size):
+                ResponsiveImage.objects.filter(pk__in=stale[start:start + self.batch_size]).delete()
+
+        blobs = MediaBlob.objects.values_list('pk', 'name', 'ref_count', 'created_at')
+        unused = []
+        for pk, name, ref_count, created_at in blobs.iterator(chunk_size=self.batch_size):
+            key = name_key(name)
+            if ref_count == 0 and key not in keys and created_at < self.cutoff:
+                unused.append(pk)
+            else:
+                keys.add(key)
+        self.stats['unused_blobs'] = len(unused)
+        if not self.dry_run:
+            for start in range(0, len(unused), self.batch_size):
+                batch = unused[start:start + self.batch_size]
+                # Suppression conditionnelle : un blob a pu être réutilisé entre-temps
+                MediaBlob.objects.filter(pk__in=batch, ref_count=0).delete()
+                # Ses fichiers restent alors protégés
+                revived = MediaBlob.objects.filter(pk__in=batch).values_list('name', flat=True)
+                keys.update(name_key(name) for name in revived)
+                self.stats['unused_blobs'] -= len(revived)
+        return keys
+
+    def run(self):
+        """
+        Parcourt l'arborescence et traite les orphelins ; retourne les statistiques
+        """
+        keys = self.referenced_keys()
+        self._walk(self.root, keys, self.cutoff.timestamp())
+        return self.stats
+
+    def _walk(self, directory, keys, cutoff):
+        """
+        Parcours en profondeur ; retourne le nombre d'entrées conservées
+        """
+        kept = 0
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            self.stats['errors'] += 1
+            return 1
+        with entries:
+            for entry in entries:
+                self.scan_throttle.wait()
+                if entry.is_dir(follow_symlinks=False):
+                    if os.path.abspath(entry.path) == self.quarantine_dir:
+                        kept += 1
+                    elif self._walk(entry.path, keys, cutoff):
+                        kept += 1
+                    elif not self.dry_run:
+                        try:
+                            os.rmdir(entry.path)
+                        except OSError:
+                            kept += 1
+                    continue
+
+                self.stats['scanned'] += 1
+                name = os.path.relpath(entry.path, self.root).replace(os.sep, '/')
+                try:
+                    stat = entry.stat(follow_symlinks=False)
+                except OSError:
+                    self.stats['errors'] += 1
+                    kept += 1
+                    continue
+                if name_key(name) in keys or stat.st_mtime >= cutoff:
+                    kept += 1
+                    continue
+
+                self.stats['orphans'] += 1
+                self.stats['bytes'] += stat.st_size
+                if not self.dry_run and not self._remove(entry.path, name):
+                    kept += 1
+        return kept
+
+    def _remove(self, path, name):
+        self.remove_throttle.wait()
+        try:
+            if self.quarantine_dir:
+                target = os.path.join(self.quarantine_dir, name)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.move(path, target)
+            else:
+                os.remove(path)
+        except OSError:
+            self.stats['errors'] += 1
+            return False
+        return True
@@ -0,0 +1,133 @@
+"""
+Génération des déclinaisons d'images (Pillow)
+
+Pour chaque image source : redimensionnements aux largeurs IMAGE_WIDTHS
+(sans jamais agrandir) en WebP et JPEG, et un LQIP (miniature floue en data
+URI) affiché pendant le chargement. Les fichiers sont écrits dans le stockage
+par défaut sous `derivatives/`.
+"""
+import base64
+import io
+import logging
+import os
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageFilter, ImageOps, UnidentifiedImageError
+
+from .models import ResponsiveImage
+from .services import ResponsiveImageService
+
+logger = logging.getLogger(__name__)
+
+IMAGE_WIDTHS = (320, 640, 1024, 1600)
+LQIP_WIDTH = 24
+FORMATS = {
+    'webp': {'format': 'WEBP', 'quality': 80, 'method': 4},
+    'jpeg': {'format': 'JPEG', 'quality': 82, 'optimize': True, 'progressive': True},
+}
+
+# Champs image déclinés : (modèle, champ, filtre sur l'instance)
+IMAGE_FIELDS = (
+    ('settings.HeroCarouselImage', 'image', {}),
+    ('settings.TeamMember', 'photo', {}),
+    ('settings.HallOfFame', 'winner_photo', {}),
+    ('accounts.User', 'profile_picture', {}),
+    ('candidates.CandidatureFile', 'file', {'file_type': 'photo'}),
+)
+
+
+def derivative_name(source, width, extension):
+    """Nom de stockage d'une déclinaison"""
+    root = os.path.splitext(source)[0]
+    return f'derivatives/{root}/{width}w.{extension}'
+
+
+def target_widths(width):
+    """Largeurs à générer pour une image de largeur `width` (sans agrandissement)"""
+    widths = {w for w in IMAGE_WIDTHS if w < width}
+    widths.add(min(width, IMAGE_WIDTHS[-1]))
+    return sorted(widths)
+
+
+def _flatten(image):
+    """Convertit en RGB, en posant la transparence sur fond blanc (JPEG)"""
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def _encode(image, options):
+    buffer = io.BytesIO()
+    image.save(buffer, **options)
+    return buffer.getvalue()
+
+
+def _save(name, content):
+    # Noms déterministes : une régénération remplace les fichiers existants
+    if default_storage.exists(name):
+        default_storage.delete(name)
+    return default_storage.save(name, ContentFile(content))
+
+
+def generate_derivatives(source, force=False):
+    """
+    Génère (ou régénère avec `force`) les déclinaisons d'une image source
+
+    Retourne le ResponsiveImage, ou None si la source n'est pas une image lisible.
+    """
+    if not force:
+        existing = ResponsiveImage.objects.filter(source=source).first()
+        if existing is not None:
+            return existing
+
+    try:
+        with default_storage.open(source, 'rb') as fh:
+            image = Image.open(fh)
+            image = ImageOps.exif_transpose(image)
+            image.load()
+    except (FileNotFoundError, UnidentifiedImageError, OSError) as e:
+        logger.warning("Déclinaisons impossibles pour %s : %s", source, e)
+        if isinstance(e, UnidentifiedImageError):
+            # Format illisible : l'échec est définitif
+            ResponsiveImageService.mark_missing(source)
+        return None
+
+    rgb = _flatten(image)
+    width, height = rgb.size
+    renditions = []
+    for target in target_widths(width):
+        resized = rgb if target == width else rgb.resize(
+            (target, max(1, round(height * target / width))), Image.LANCZOS
+        )
+        for extension, options in FORMATS.items():
+            name = _save(derivative_name(source, target, extension), _encode(resized, options))
+            renditions.append({'width': target, 'format': extension, 'name': name})
+
+    lqip = rgb.copy()
+    lqip.thumbnail((LQIP_WIDTH, LQIP_WIDTH * 4))
+    lqip = lqip.filter(ImageFilter.GaussianBlur(1))
+    lqip_data = base64.b64encode(_encode(lqip, {'format': 'JPEG', 'quality': 50})).decode('ascii')
+
+    responsive, _ = ResponsiveImage.objects.update_or_create(
+        source=source,
+        defaults={
+            'width': width,
+            'height': height,
+            'lqip': f'data:image/jpeg;base64,{lqip_data}',
+            'renditions': renditions,
+        }
+    )
+    ResponsiveImageService.invalidate(source)
+
+    if not default_storage.exists(source):
+        # Source supprimée pendant la génération : pas de déclinaisons orphelines
+        for rendition in renditions:
+            default_storage.delete(rendition['name'])
+        responsive.delete()
+        ResponsiveImageService.invalidate(source)
+        return None
+    return responsive
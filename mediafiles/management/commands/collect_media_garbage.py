@@ -0,0 +1,89 @@
+"""
+Commande Django pour supprimer les fichiers médias qui ne sont plus référencés
+Usage: python manage.py collect_media_garbage [--dry-run] [--quarantine] [--min-age HEURES]
+                                              [--rate N] [--scan-rate N] [--batch-size N]
+"""
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from candidates.services import ChunkedUploadService
+from mediafiles.garbage import MediaGarbageCollector
+from mediafiles.storage import is_local_storage
+
+
+class Command(BaseCommand):
+    help = 'Supprimer les fichiers orphelins de MEDIA_ROOT, les déclinaisons et blobs inutilisés et les uploads expirés'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Afficher ce qui serait supprimé sans rien modifier',
+        )
+        parser.add_argument(
+            '--quarantine',
+            action='store_true',
+            help='Déplacer les orphelins dans MEDIA_GC_QUARANTINE_DIR au lieu de les supprimer',
+        )
+        parser.add_argument(
+            '--min-age',
+            type=int,
+            default=settings.MEDIA_GC_MIN_AGE_HOURS,
+            help='Âge minimal (heures) d\'un fichier pour être collecté (défaut: %(default)s)',
+        )
+        parser.add_argument(
+            '--rate',
+            type=float,
+            default=20,
+            help='Nombre maximal de suppressions par seconde, 0 = illimité (défaut: %(default)s)',
+        )
+        parser.add_argument(
+            '--scan-rate',
+            type=float,
+            default=2000,
+            help='Nombre maximal d\'entrées parcourues par seconde, 0 = illimité (défaut: %(default)s)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=2000,
+            help='Nombre de lignes lues par requête (défaut: %(default)s)',
+        )
+
+    def handle(self, *args, **options):
+        if not is_local_storage():
+            raise CommandError('Le ramasse-miettes ne s\'applique qu\'au stockage local')
+        root = default_storage.path('')
+
+        dry_run = options['dry_run']
+        if dry_run:
+            self.stdout.write(self.style.WARNING('🔍 Mode simulation : aucun fichier ne sera modifié'))
+
+        sessions, parts = ChunkedUploadService.purge_expired(dry_run=dry_run)
+        self.stdout.write(f'📤 {sessions} sessions d\'upload expirées, {parts} fichiers temporaires sans session')
+
+        collector = MediaGarbageCollector(
+            root,
+            cutoff=timezone.now() - timezone.timedelta(hours=options['min_age']),
+            dry_run=dry_run,
+            quarantine_dir=settings.MEDIA_GC_QUARANTINE_DIR if options['quarantine'] else None,
+            rate=options['rate'],
+            scan_rate=options['scan_rate'],
+            batch_size=options['batch_size'],
+        )
+        stats = collector.run()
+
+        self.stdout.write(
+            f'🖼️  {stats["stale_derivatives"]} déclinaisons et {stats["unused_blobs"]} blobs sans référence'
+        )
+        if stats['errors']:
+            self.stdout.write(self.style.WARNING(f'⚠️  {stats["errors"]} erreurs d\'accès ignorées'))
+
+        action = 'à traiter' if dry_run else ('mis en quarantaine' if options['quarantine'] else 'supprimés')
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {stats["scanned"]} fichiers parcourus, {stats["orphans"]} orphelins {action} '
+            f'({stats["bytes"] / (1024 * 1024):.1f} MB)'
+        ))
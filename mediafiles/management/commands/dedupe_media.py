@@ -0,0 +1,68 @@
+"""
+Commande Django pour dédupliquer les fichiers de candidature existants
+Usage: python manage.py dedupe_media [--dry-run]
+"""
+
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from candidates.models import CandidatureFile
+from mediafiles.models import MediaBlob
+from mediafiles.services import BlobService
+from mediafiles.tasks import delete_media, generate_derivatives
+
+
+class Command(BaseCommand):
+    help = 'Migrer les fichiers de candidature vers le stockage adressé par contenu (blobs)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Afficher l\'espace récupérable sans rien modifier',
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        files = CandidatureFile.objects.exclude(file='').exclude(file__startswith='blobs/')
+        seen = set(MediaBlob.objects.values_list('sha256', flat=True))
+        migrated = duplicates = saved = 0
+
+        for candidature_file in files.iterator():
+            name = candidature_file.file.name
+            if not default_storage.exists(name):
+                self.stdout.write(self.style.WARNING(f'⚠️  {name} introuvable'))
+                continue
+
+            with default_storage.open(name, 'rb') as fh:
+                content = File(fh, name=name)
+                digest = BlobService.hash_content(content)
+                if digest in seen:
+                    duplicates += 1
+                    saved += content.size
+                seen.add(digest)
+                if dry_run:
+                    continue
+                content.sha256 = digest
+                blob = BlobService.store(content, name)
+
+            CandidatureFile.objects.filter(pk=candidature_file.pk).update(file=blob.name)
+            if not CandidatureFile.objects.filter(file=name).exists():
+                # L'ancien fichier (et ses déclinaisons) n'est plus référencé
+                delete_media([name])
+            if candidature_file.file_type == 'photo':
+                generate_derivatives.enqueue(blob.name)
+            migrated += 1
+
+        if dry_run:
+            self.stdout.write(self.style.SUCCESS(
+                f'🔍 {duplicates} doublons, {saved / (1024 * 1024):.1f} MB récupérables'
+            ))
+            return
+
+        fixed = BlobService.recount()
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {migrated} fichiers migrés, {duplicates} doublons '
+            f'({saved / (1024 * 1024):.1f} MB récupérés), {fixed} compteurs mis à jour'
+        ))
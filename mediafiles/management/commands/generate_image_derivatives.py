@@ -0,0 +1,49 @@
+"""
+Commande Django pour générer les déclinaisons des images existantes
+Usage: python manage.py generate_image_derivatives [--force]
+"""
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from mediafiles.images import IMAGE_FIELDS, generate_derivatives
+from mediafiles.models import ResponsiveImage
+
+
+class Command(BaseCommand):
+    help = 'Générer les déclinaisons responsives (WebP/JPEG + LQIP) des images existantes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Régénérer aussi les images déjà déclinées',
+        )
+
+    def handle(self, *args, **options):
+        done = set() if options['force'] else set(
+            ResponsiveImage.objects.values_list('source', flat=True)
+        )
+        generated = failed = 0
+
+        for model_label, field_name, filters in IMAGE_FIELDS:
+            model = apps.get_model(model_label)
+            names = (
+                model.objects.filter(**filters)
+                .exclude(**{field_name: ''}).exclude(**{f'{field_name}__isnull': True})
+                .values_list(field_name, flat=True)
+            )
+            self.stdout.write(f'🖼️  {model_label}.{field_name}')
+            for name in names.iterator():
+                if name in done:
+                    continue
+                done.add(name)
+                if generate_derivatives(name, force=options['force']):
+                    generated += 1
+                else:
+                    failed += 1
+                    self.stdout.write(self.style.WARNING(f'   ⚠️  {name} illisible ou introuvable'))
+
+        self.stdout.write(
+            self.style.SUCCESS(f'✅ {generated} images déclinées, {failed} en échec')
+        )
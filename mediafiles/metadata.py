@@ -0,0 +1,70 @@
+"""
+Extraction des métadonnées d'un fichier média (taille, type MIME, dimensions, durée)
+
+Seuls les en-têtes sont lus : Pillow ne décode pas l'image pour en donner
+les dimensions, la durée est lue dans les en-têtes du conteneur (voir
+`probe`). Les métadonnées sont calculées une fois, à l'enregistrement
+du fichier, puis lues en base.
+"""
+import logging
+import mimetypes
+import os
+
+from PIL import Image, UnidentifiedImageError
+
+from .probe import probe_duration
+
+logger = logging.getLogger(__name__)
+
+
+def _image_size(fh):
+    try:
+        with Image.open(fh) as image:
+            return image.size
+    except (UnidentifiedImageError, OSError):
+        return None, None
+
+
+def extract_metadata(content, name):
+    """
+    Retourne {size, mime_type, width, height, duration} pour un fichier
+
+    `content` est un fichier Django ouvert (upload en cours ou fichier du
+    stockage) ; sa position est remise au début après lecture.
+    """
+    mime_type = mimetypes.guess_type(name)[0] or ''
+    metadata = {
+        'size': content.size,
+        'mime_type': mime_type,
+        'width': None,
+        'height': None,
+        'duration': None,
+    }
+
+    try:
+        content.seek(0)
+        if mime_type.startswith('image/'):
+            metadata['width'], metadata['height'] = _image_size(content)
+        elif mime_type.startswith(('audio/', 'video/')):
+            duration = probe_duration(content)
+            metadata['duration'] = round(duration, 3) if duration is not None else None
+    except OSError as e:
+        logger.warning("Métadonnées illisibles pour %s : %s", os.path.basename(name), e)
+    finally:
+        content.seek(0)
+    return metadata
+
+
+def field_file_metadata(field_file):
+    """
+    Métadonnées d'un FieldFile : lues sur l'upload en cours s'il n'est pas
+    encore enregistré, sinon dans le stockage
+    """
+    if not field_file._committed:
+        return extract_metadata(field_file.file, field_file.name)
+
+    field_file.open('rb')
+    try:
+        return extract_metadata(field_file, field_file.name)
+    finally:
+        field_file.close()
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-19 18:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResponsiveImage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(help_text="Nom de l'image originale dans le stockage", max_length=500, unique=True, verbose_name='Image source')),
+                ('width', models.PositiveIntegerField(verbose_name='Largeur originale')),
+                ('height', models.PositiveIntegerField(verbose_name='Hauteur originale')),
+                ('lqip', models.TextField(blank=True, help_text='Miniature floue encodée en data URI (placeholder)', verbose_name='Aperçu basse qualité')),
+                ('renditions', models.JSONField(default=list, help_text='Liste de {width, format, name}', verbose_name='Déclinaisons')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Image responsive',
+                'verbose_name_plural': 'Images responsives',
+            },
+        ),
+    ]
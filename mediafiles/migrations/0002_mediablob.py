@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-19 18:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mediafiles', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True, verbose_name='Empreinte SHA-256')),
+                ('name', models.CharField(max_length=500, unique=True, verbose_name='Nom dans le stockage')),
+                ('size', models.BigIntegerField(verbose_name='Taille (octets)')),
+                ('ref_count', models.PositiveIntegerField(default=0, verbose_name='Références')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Blob média',
+                'verbose_name_plural': 'Blobs médias',
+            },
+        ),
+    ]
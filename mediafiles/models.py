@@ -0,0 +1,70 @@
+"""
+Modèles pour l'app mediafiles
+"""
+from django.db import models
+
+
+class ResponsiveImage(models.Model):
+    """
+    Déclinaisons responsives d'une image stockée (tailles WebP/JPEG + LQIP)
+
+    Indexé par le nom de l'image source dans le stockage, ce qui permet de
+    servir tous les champs image (carousel, avatars, photos...) sans modifier
+    leurs modèles.
+    """
+    source = models.CharField(
+        max_length=500,
+        unique=True,
+        verbose_name="Image source",
+        help_text="Nom de l'image originale dans le stockage"
+    )
+    width = models.PositiveIntegerField(verbose_name="Largeur originale")
+    height = models.PositiveIntegerField(verbose_name="Hauteur originale")
+    lqip = models.TextField(
+        blank=True,
+        verbose_name="Aperçu basse qualité",
+        help_text="Miniature floue encodée en data URI (placeholder)"
+    )
+    renditions = models.JSONField(
+        default=list,
+        verbose_name="Déclinaisons",
+        help_text="Liste de {width, format, name}"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = "Image responsive"
+        verbose_name_plural = "Images responsives"
+    
+    def __str__(self):
+        return f"{self.source} ({len(self.renditions)} déclinaisons)"
+
+
+class MediaBlob(models.Model):
+    """
+    Contenu stocké une seule fois, adressé par son empreinte SHA-256
+
+    Les fichiers de candidature identiques (même photo déposée pour plusieurs
+    catégories) pointent vers le même blob ; `ref_count` compte les
+    références et le blob est supprimé quand il n'est plus utilisé.
+    """
+    sha256 = models.CharField(
+        max_length=64,
+        unique=True,
+        verbose_name="Empreinte SHA-256"
+    )
+    name = models.CharField(
+        max_length=500,
+        unique=True,
+        verbose_name="Nom dans le stockage"
+    )
+    size = models.BigIntegerField(verbose_name="Taille (octets)")
+    ref_count = models.PositiveIntegerField(default=0, verbose_name="Références")
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = "Blob média"
+        verbose_name_plural = "Blobs médias"
+    
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.ref_count} réf.)"
@@ -0,0 +1,230 @@
+"""
+Mesure de la durée des fichiers audio/vidéo par lecture des seuls en-têtes
+
+Formats pris en charge :
+- MP4/MOV/M4A : boîte `mvhd` de `moov` (les boîtes `mdat` sont sautées) ;
+- WAV : débit du bloc `fmt ` et taille du bloc `data` ;
+- AVI : nombre de trames et durée d'une trame de l'en-tête `avih` (ou nombre
+  total de trames de `dmlh` pour un AVI OpenDML de plus de 1 Go) ;
+- FLAC : bloc STREAMINFO ;
+- MP3 : en-tête Xing/Info ou VBRI (VBR), sinon débit de la première trame (CBR).
+Quelques centaines d'octets sont lus, quelle que soit la taille du fichier.
+"""
+import struct
+
+# Recherche de la première trame MP3 après les balises ID3
+MP3_SCAN_SIZE = 64 * 1024
+
+MP4_BOX_TYPES = (b'ftyp', b'moov', b'mdat', b'free', b'skip', b'wide', b'pnot')
+
+MP3_BITRATES = {
+    (1, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (1, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (1, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (2, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (2, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (2, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+MP3_SAMPLE_RATES = {
+    1: (44100, 48000, 32000),
+    2: (22050, 24000, 16000),
+    25: (11025, 12000, 8000),
+}
+
+
+def probe_duration(fh):
+    """
+    Durée en secondes d'un fichier audio/vidéo ouvert en binaire
+
+    Retourne None pour un format non pris en charge ou illisible. La position
+    du fichier est remise au début.
+    """
+    try:
+        fh.seek(0, 2)
+        size = fh.tell()
+        fh.seek(0)
+        head = fh.read(12)
+        if len(head) < 12:
+            return None
+        if head[4:8] in MP4_BOX_TYPES:
+            return _mp4_duration(fh, size)
+        if head[:4] == b'RIFF' and head[8:12] == b'WAVE':
+            return _wav_duration(fh, size)
+        if head[:4] == b'RIFF' and head[8:12] == b'AVI ':
+            return _avi_duration(fh, size)
+        if head[:4] == b'fLaC':
+            return _flac_duration(fh)
+        if head[:3] == b'ID3' or (head[0] == 0xFF and head[1] & 0xE0 == 0xE0):
+            return _mp3_duration(fh, size)
+        return None
+    except (OSError, struct.error, IndexError, ZeroDivisionError):
+        return None
+    finally:
+        fh.seek(0)
+
+
+def _mp4_boxes(fh, start, end):
+    """Boîtes (type, début du contenu, fin) entre `start` et `end`"""
+    offset = start
+    while offset + 8 <= end:
+        fh.seek(offset)
+        size, box_type = struct.unpack('>I4s', fh.read(8))
+        header_size = 8
+        if size == 1:
+            size = struct.unpack('>Q', fh.read(8))[0]
+            header_size = 16
+        elif size == 0:
+            size = end - offset
+        if size < header_size:
+            return
+        yield box_type, offset + header_size, offset + size
+        offset += size
+
+
+def _mp4_duration(fh, size):
+    for box_type, start, end in _mp4_boxes(fh, 0, size):
+        if box_type != b'moov':
+            continue
+        for child_type, child_start, _ in _mp4_boxes(fh, start, end):
+            if child_type != b'mvhd':
+                continue
+            fh.seek(child_start)
+            version = fh.read(4)[0]
+            if version == 1:
+                _, _, timescale, duration = struct.unpack('>QQIQ', fh.read(28))
+            else:
+                _, _, timescale, duration = struct.unpack('>IIII', fh.read(16))
+            return duration / timescale if timescale else None
+        return None
+    return None
+
+
+def _wav_duration(fh, size):
+    byte_rate = None
+    offset = 12
+    while offset + 8 <= size:
+        fh.seek(offset)
+        chunk_id, chunk_size = struct.unpack('<4sI', fh.read(8))
+        if chunk_id == b'fmt ':
+            _, _, _, byte_rate = struct.unpack('<HHII', fh.read(12))
+        elif chunk_id == b'data':
+            if not byte_rate:
+                return None
+            # Taille absente (0xFFFFFFFF en flux) ou fichier tronqué : reste du fichier
+            data_size = min(chunk_size, size - offset - 8)
+            return data_size / byte_rate
+        offset += 8 + chunk_size + (chunk_size & 1)
+    return None
+
+
+def _riff_chunks(fh, start, end):
+    """Blocs RIFF (identifiant, début du contenu, taille) entre `start` et `end`"""
+    offset = start
+    while offset + 8 <= end:
+        fh.seek(offset)
+        chunk_id, chunk_size = struct.unpack('<4sI', fh.read(8))
+        yield chunk_id, offset + 8, chunk_size
+        offset += 8 + chunk_size + (chunk_size & 1)
+
+
+def _avi_duration(fh, size):
+    fh.seek(12)
+    list_id, list_size, list_type = struct.unpack('<4sI4s', fh.read(12))
+    if list_id != b'LIST' or list_type != b'hdrl':
+        return None
+
+    micro_seconds = frames = None
+    for chunk_id, start, chunk_size in _riff_chunks(fh, 24, min(20 + list_size, size)):
+        if chunk_id == b'avih':
+            micro_seconds, _, _, _, frames = struct.unpack('<5I', fh.read(20))
+        elif chunk_id == b'LIST' and fh.read(4) == b'odml':
+            # AVI OpenDML : `avih` ne compte que les trames du premier bloc RIFF
+            for child_id, _, _ in _riff_chunks(fh, start + 4, start + chunk_size):
+                if child_id == b'dmlh':
+                    frames = struct.unpack('<I', fh.read(4))[0]
+                    break
+    if not micro_seconds or not frames:
+        return None
+    return frames * micro_seconds / 1_000_000
+
+
+def _flac_duration(fh):
+    fh.seek(4)
+    block_header = fh.read(4)
+    if block_header[0] & 0x7F != 0:
+        return None
+    info = fh.read(34)
+    packed = int.from_bytes(info[10:18], 'big')
+    sample_rate = packed >> 44
+    total_samples = packed & ((1 << 36) - 1)
+    if not sample_rate or not total_samples:
+        return None
+    return total_samples / sample_rate
+
+
+def _mp3_frame(header):
+    """Paramètres d'un en-tête de trame MP3, ou None s'il est invalide"""
+    if header[0] != 0xFF or header[1] & 0xE0 != 0xE0:
+        return None
+    version = {0: 25, 2: 2, 3: 1}.get((header[1] >> 3) & 3)
+    layer = {1: 3, 2: 2, 3: 1}.get((header[1] >> 1) & 3)
+    bitrate_index = header[2] >> 4
+    sample_rate_index = (header[2] >> 2) & 3
+    if version is None or layer is None or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    if layer == 1:
+        samples = 384
+    elif layer == 2 or version == 1:
+        samples = 1152
+    else:
+        samples = 576
+    return {
+        'version': version,
+        'bitrate': MP3_BITRATES[(1 if version == 1 else 2, layer)][bitrate_index] * 1000,
+        'sample_rate': MP3_SAMPLE_RATES[version][sample_rate_index],
+        'samples': samples,
+        'mono': header[3] >> 6 == 3,
+    }
+
+
+def _mp3_duration(fh, size):
+    fh.seek(0)
+    start = 0
+    id3 = fh.read(10)
+    if id3[:3] == b'ID3':
+        # Taille "synchsafe" (7 bits par octet), plus le pied de balise éventuel
+        start = 10 + ((id3[6] << 21) | (id3[7] << 14) | (id3[8] << 7) | id3[9])
+        if id3[5] & 0x10:
+            start += 10
+
+    fh.seek(start)
+    data = fh.read(MP3_SCAN_SIZE)
+    position = data.find(b'\xff')
+    while 0 <= position <= len(data) - 4:
+        frame = _mp3_frame(data[position:position + 4])
+        if frame is not None:
+            break
+        position = data.find(b'\xff', position + 1)
+    else:
+        return None
+
+    # En-tête VBR : nombre total de trames
+    side_info = (32 if not frame['mono'] else 17) if frame['version'] == 1 else (17 if not frame['mono'] else 9)
+    xing = position + 4 + side_info
+    frames = None
+    if data[xing:xing + 4] in (b'Xing', b'Info'):
+        flags = struct.unpack('>I', data[xing + 4:xing + 8])[0]
+        if flags & 1:
+            frames = struct.unpack('>I', data[xing + 8:xing + 12])[0]
+    elif data[position + 36:position + 40] == b'VBRI':
+        frames = struct.unpack('>I', data[position + 50:position + 54])[0]
+    if frames:
+        return frames * frame['samples'] / frame['sample_rate']
+
+    # CBR : octets audio / débit (hors balise ID3v1 finale)
+    audio_size = size - start - position
+    fh.seek(max(size - 128, 0))
+    if fh.read(3) == b'TAG':
+        audio_size -= 128
+    return audio_size * 8 / frame['bitrate']
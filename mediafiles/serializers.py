@@ -0,0 +1,232 @@
+"""
+Serializers pour l'app mediafiles
+"""
+import os
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import models
+from rest_framework import serializers
+from rest_framework.fields import SkipField
+
+from candidates.models import Candidature, CandidatureFile
+from candidates.services import UploadLimitService
+from .services import ResponsiveImageService
+
+IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.gif', '.webp']
+
+# Préfixe de Content-Type attendu par type de fichier de candidature
+FILE_TYPE_CONTENT_TYPES = {
+    'photo': 'image/',
+    'video': 'video/',
+    'audio': 'audio/',
+    'portfolio': 'application/',
+}
+
+
+# Clé du contexte des serializers : déclinaisons préchargées {nom: données}
+PRELOADED_CONTEXT_KEY = 'responsive_images'
+
+
+class ResponsiveImageField(serializers.Field):
+    """
+    Déclinaisons responsives d'un champ image, prêtes pour `srcset`
+
+    Renvoie {width, height, lqip, srcset: {webp, jpeg}} ou None tant que les
+    déclinaisons n'ont pas été générées (ou pour un fichier non-image).
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        preloaded = self.context.get(PRELOADED_CONTEXT_KEY, {})
+        if value.name in preloaded:
+            responsive = preloaded[value.name]
+        else:
+            responsive = ResponsiveImageService.get(value.name)
+        if responsive is None:
+            return None
+
+        request = self.context.get('request')
+        srcset = {}
+        for rendition in responsive['renditions']:
+            url = default_storage.url(rendition['name'])
+            if request:
+                url = request.build_absolute_uri(url)
+            srcset.setdefault(rendition['format'], []).append(f"{url} {rendition['width']}w")
+
+        return {
+            'width': responsive['width'],
+            'height': responsive['height'],
+            'lqip': responsive['lqip'],
+            'srcset': {fmt: ', '.join(items) for fmt, items in srcset.items()},
+        }
+
+
+def _nested_serializer(field):
+    """Serializer imbriqué porté par un champ (liste ou objet), sinon None"""
+    if isinstance(field, serializers.ListSerializer):
+        field = field.child
+    return field if isinstance(field, serializers.Serializer) else None
+
+
+def _has_responsive_images(serializer):
+    return any(
+        isinstance(field, ResponsiveImageField)
+        or (_nested_serializer(field) is not None and _has_responsive_images(_nested_serializer(field)))
+        for field in serializer.fields.values()
+    )
+
+
+def responsive_image_sources(serializer, instances):
+    """
+    Noms des fichiers affichés par les ResponsiveImageField de `serializer`
+    (et de ses serializers imbriqués) pour `instances`
+    """
+    names = set()
+    for field in serializer.fields.values():
+        if isinstance(field, ResponsiveImageField):
+            for instance in instances:
+                value = field.get_attribute(instance)
+                if value:
+                    names.add(value.name)
+            continue
+
+        nested = _nested_serializer(field)
+        if nested is None or not _has_responsive_images(nested):
+            continue
+        related = []
+        for instance in instances:
+            try:
+                value = field.get_attribute(instance)
+            except (AttributeError, KeyError, SkipField):
+                continue
+            if value is None:
+                continue
+            if isinstance(field, serializers.ListSerializer):
+                related.extend(value.all() if isinstance(value, models.Manager) else value)
+            else:
+                related.append(value)
+        if related:
+            names |= responsive_image_sources(nested, related)
+    return names
+
+
+class ResponsiveImageListSerializer(serializers.ListSerializer):
+    """
+    Liste préchargeant les déclinaisons de toutes ses images en une fois
+
+        class Meta:
+            list_serializer_class = ResponsiveImageListSerializer
+
+    Le préchargement est partagé avec les serializers imbriqués via le
+    contexte : une page de candidatures et de leurs fichiers ne coûte
+    qu'une lecture groupée du cache et au plus une requête.
+    """
+
+    def to_representation(self, data):
+        items = data.all() if isinstance(data, models.Manager) else data
+        if not isinstance(items, list):
+            items = list(items)
+        preloaded = self.context.setdefault(PRELOADED_CONTEXT_KEY, {})
+        if isinstance(self.child, serializers.Serializer):
+            sources = responsive_image_sources(self.child, items) - preloaded.keys()
+            if sources:
+                preloaded.update(ResponsiveImageService.get_many(sources))
+        return super().to_representation(items)
+
+
+class DirectUploadSerializer(serializers.Serializer):
+    """
+    Serializer pour demander une URL d'upload direct
+    """
+    TARGET_CHOICES = [
+        ('candidature_file', 'Fichier de candidature'),
+        ('profile_picture', 'Photo de profil'),
+        ('carousel_image', 'Image du carousel'),
+    ]
+
+    target = serializers.ChoiceField(choices=TARGET_CHOICES)
+    filename = serializers.CharField(max_length=255)
+    content_type = serializers.CharField(max_length=100)
+    size = serializers.IntegerField(min_value=1)
+    # Fichier de candidature
+    candidature = serializers.PrimaryKeyRelatedField(queryset=Candidature.objects.all(), required=False)
+    file_type = serializers.ChoiceField(choices=CandidatureFile.FILE_TYPE_CHOICES, required=False)
+    # Fichier de candidature et image du carousel
+    title = serializers.CharField(max_length=200, required=False, allow_blank=True)
+    order = serializers.IntegerField(min_value=0, required=False)
+    # Image du carousel
+    alt_text = serializers.CharField(max_length=200, required=False, allow_blank=True)
+    is_active = serializers.BooleanField(required=False)
+
+    def validate_filename(self, value):
+        return os.path.basename(value)
+
+    def validate(self, attrs):
+        target = attrs['target']
+        user = self.context['request'].user
+        extension = os.path.splitext(attrs['filename'])[1].lower()
+
+        if target == 'candidature_file':
+            candidature = attrs.get('candidature')
+            if candidature is None or 'file_type' not in attrs:
+                raise serializers.ValidationError("Les champs candidature et file_type sont requis.")
+            if candidature.candidate_id != user.id:
+                raise serializers.ValidationError({'candidature': "Candidature non trouvée."})
+            if not candidature.can_be_modified():
+                raise serializers.ValidationError({'candidature': "Cette candidature ne peut plus être modifiée."})
+
+            is_valid, message = CandidatureFile(
+                file_type=attrs['file_type'], file=attrs['filename']
+            ).validate_file_type()
+            if not is_valid:
+                raise serializers.ValidationError({'filename': message})
+            expected_type = FILE_TYPE_CONTENT_TYPES[attrs['file_type']]
+            # Limite de la catégorie (ou du site), comme pour un envoi à Django
+            max_size = UploadLimitService.max_size(attrs['file_type'], candidature.category) or (
+                settings.DIRECT_UPLOAD_MAX_IMAGE_SIZE if attrs['file_type'] == 'photo'
+                else settings.DIRECT_UPLOAD_MAX_SIZE
+            )
+        else:
+            if target == 'carousel_image' and not user.is_staff:
+                raise serializers.ValidationError({'target': "Réservé aux administrateurs."})
+            if extension not in IMAGE_EXTENSIONS:
+                raise serializers.ValidationError({'filename': "Le fichier doit être une image"})
+            expected_type = 'image/'
+            max_size = settings.DIRECT_UPLOAD_MAX_IMAGE_SIZE
+
+        if not attrs['content_type'].startswith(expected_type):
+            raise serializers.ValidationError({'content_type': f"Type de contenu attendu : {expected_type}*"})
+        if attrs['size'] > max_size:
+            raise serializers.ValidationError(
+                {'size': f"Le fichier ne peut pas dépasser {max_size // (1024 * 1024)}MB."}
+            )
+
+        attrs['max_size'] = max_size
+        return attrs
+
+    def get_params(self):
+        """
+        Paramètres propres à la cible, conservés dans l'identifiant d'upload
+        """
+        data = self.validated_data
+        params = {
+            name: data[name]
+            for name in ('file_type', 'title', 'order', 'alt_text', 'is_active')
+            if name in data
+        }
+        if 'candidature' in data:
+            params['candidature'] = data['candidature'].pk
+        return params
+
+
+class DirectUploadCompleteSerializer(serializers.Serializer):
+    """
+    Serializer pour le rappel de fin d'upload direct
+    """
+    upload_id = serializers.CharField()
@@ -0,0 +1,376 @@
+"""
+Services pour l'app mediafiles
+"""
+import hashlib
+import mimetypes
+import os
+import posixpath
+import uuid
+from hashlib import md5
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from candidates.models import Candidature, CandidatureFile
+from candidates.services import MediaDurationService
+from settings.models import HeroCarouselImage
+from .models import MediaBlob, ResponsiveImage
+from .sniff import SNIFF_SIZE, matches_extension
+from .storage import get_direct_upload_backend, open_headers
+
+
+class DirectUploadService:
+    """
+    Service d'upload direct vers le stockage (URLs présignées)
+
+    1. `prepare` choisit une clé d'objet unique selon le `upload_to` du champ
+       cible et renvoie l'URL signée ainsi qu'un `upload_id` signé décrivant
+       l'upload ;
+    2. le client envoie le fichier directement au stockage ;
+    3. `complete` vérifie la présence et la taille de l'objet (ainsi que la
+       signature et la durée d'un fichier de candidature, par ses seuls
+       en-têtes) puis l'enregistre sur le modèle cible. Le fichier ne transite
+       pas par Django (hors stockage local).
+    """
+    SALT = 'mediafiles.direct-upload'
+    TARGET_FIELDS = {
+        'candidature_file': 'file',
+        'profile_picture': 'profile_picture',
+        'carousel_image': 'image',
+    }
+
+    @staticmethod
+    def build_instance(target, user, params):
+        """
+        Construit l'instance (non enregistrée) portant le champ fichier cible
+        """
+        if target == 'candidature_file':
+            return CandidatureFile(
+                candidature=Candidature.objects.get(pk=params['candidature']),
+                file_type=params['file_type'],
+                title=params.get('title', ''),
+                order=params.get('order', 0),
+            )
+        if target == 'profile_picture':
+            return user
+        return HeroCarouselImage(
+            title=params.get('title', ''),
+            alt_text=params.get('alt_text', ''),
+            order=params.get('order', 1),
+            is_active=params.get('is_active', True),
+        )
+
+    @staticmethod
+    def unique_key(instance, field, filename):
+        """
+        Clé d'objet unique pour `filename` selon le `upload_to` du champ
+
+        Un identifiant aléatoire est ajouté au nom : deux uploads préparés en
+        même temps pour le même fichier n'obtiennent jamais la même clé
+        (`get_available_name` ne réserve rien sur S3). Le nom d'origine est
+        raccourci si la clé dépasse la longueur du champ.
+        """
+        stem, extension = os.path.splitext(filename)
+        unique = uuid.uuid4().hex
+        key = field.generate_filename(instance, f'{stem}_{unique}{extension}')
+        excess = len(key) - field.max_length
+        if excess > 0:
+            key = field.generate_filename(instance, f'{stem[:max(0, len(stem) - excess)]}_{unique}{extension}')
+        return key
+
+    @staticmethod
+    def prepare(request, target, filename, content_type, max_size, params):
+        """
+        Réserve une clé d'objet et retourne les informations d'upload direct
+        """
+        instance = DirectUploadService.build_instance(target, request.user, params)
+        field = instance._meta.get_field(DirectUploadService.TARGET_FIELDS[target])
+        key = DirectUploadService.unique_key(instance, field, filename)
+
+        upload = get_direct_upload_backend().presign(request, key, content_type, max_size)
+        upload_id = signing.dumps({
+            'target': target,
+            'key': key,
+            'user': request.user.id,
+            'max_size': max_size,
+            'params': params,
+        }, salt=DirectUploadService.SALT)
+
+        return {
+            'upload_id': upload_id,
+            'key': key,
+            'expires_in': settings.DIRECT_UPLOAD_EXPIRY_SECONDS,
+            **upload,
+        }
+
+    @staticmethod
+    def complete(user, upload_id):
+        """
+        Enregistre l'objet envoyé sur le modèle cible et retourne l'instance
+        """
+        try:
+            # Fenêtre doublée : un upload commencé juste avant l'expiration de l'URL
+            # doit encore pouvoir être finalisé
+            upload = signing.loads(
+                upload_id, salt=DirectUploadService.SALT,
+                max_age=settings.DIRECT_UPLOAD_EXPIRY_SECONDS * 2
+            )
+        except signing.BadSignature:
+            raise ValueError("Identifiant d'upload invalide ou expiré")
+
+        if upload['user'] != user.id:
+            raise ValueError("Identifiant d'upload invalide ou expiré")
+
+        key = upload['key']
+        if not default_storage.exists(key):
+            raise ValueError("Le fichier n'a pas été reçu par le stockage")
+
+        size = default_storage.size(key)
+        if size > upload['max_size']:
+            default_storage.delete(key)
+            raise ValueError("Le fichier dépasse la taille autorisée")
+
+        target = upload['target']
+        field_name = DirectUploadService.TARGET_FIELDS[target]
+        instance = DirectUploadService.build_instance(target, user, upload['params'])
+        if type(instance).objects.filter(**{field_name: key}).exists():
+            raise ValueError("Cet upload a déjà été enregistré")
+        if target == 'candidature_file' and not instance.candidature.can_be_modified():
+            raise ValueError("Cette candidature ne peut plus être modifiée")
+        if target == 'candidature_file':
+            # Lecture des seuls en-têtes (requêtes partielles sur S3)
+            with open_headers(key) as fh:
+                try:
+                    if not matches_extension(fh.read(SNIFF_SIZE), os.path.splitext(key)[1].lstrip('.')):
+                        raise ValueError("Le contenu du fichier ne correspond pas à son extension")
+                    fh.seek(0)
+                    MediaDurationService.check(fh, instance.file_type, instance.candidature.category)
+                except ValueError:
+                    default_storage.delete(key)
+                    raise
+
+        setattr(instance, field_name, key)
+        if target == 'profile_picture':
+            instance.save(update_fields=[field_name, 'updated_at'])
+        else:
+            instance.save()
+        return instance
+
+
+class ResponsiveImageService:
+    """
+    Service de lecture des déclinaisons d'images (avec cache)
+
+    Les absences ne sont mises en cache que pour les fichiers non-image et
+    les images illisibles, qui n'auront jamais de déclinaisons : une image
+    en attente de génération est relue en base jusqu'à ce que ses
+    déclinaisons existent. La génération invalide l'entrée correspondante.
+    """
+    MISSING = 'missing'
+
+    @staticmethod
+    def _cache_key(source):
+        return f'responsive:{md5(source.encode()).hexdigest()}'
+
+    @staticmethod
+    def get(source):
+        """
+        Retourne {width, height, lqip, renditions} ou None si non générées
+        """
+        return ResponsiveImageService.get_many([source])[source]
+
+    @staticmethod
+    def get_many(sources):
+        """
+        Version groupée de get() : {source: données ou None}
+
+        Une seule lecture du cache et au plus une requête pour toute une
+        page de résultats.
+        """
+        keys = {ResponsiveImageService._cache_key(source): source for source in set(sources)}
+        found = {keys[key]: data for key, data in cache.get_many(list(keys)).items()}
+
+        missing = set(keys.values()) - found.keys()
+        if missing:
+            rows = ResponsiveImage.objects.filter(source__in=missing).values(
+                'source', 'width', 'height', 'lqip', 'renditions'
+            )
+            loaded = {row.pop('source'): row for row in rows}
+            to_cache = {}
+            for source in missing:
+                data = loaded.get(source)
+                if data is None:
+                    if (mimetypes.guess_type(source)[0] or '').startswith('image/'):
+                        # En attente de génération : pas mise en cache
+                        found[source] = None
+                        continue
+                    data = ResponsiveImageService.MISSING
+                found[source] = data
+                to_cache[ResponsiveImageService._cache_key(source)] = data
+            if to_cache:
+                cache.set_many(to_cache, timeout=settings.RESPONSIVE_IMAGE_CACHE_TTL)
+
+        return {
+            source: None if data == ResponsiveImageService.MISSING else data
+            for source, data in found.items()
+        }
+
+    @staticmethod
+    def mark_missing(source):
+        """
+        Met en cache l'absence définitive de déclinaisons (image illisible)
+        """
+        cache.set(
+            ResponsiveImageService._cache_key(source), ResponsiveImageService.MISSING,
+            timeout=settings.RESPONSIVE_IMAGE_CACHE_TTL
+        )
+
+    @staticmethod
+    def invalidate(source):
+        cache.delete(ResponsiveImageService._cache_key(source))
+
+
+class BlobService:
+    """
+    Service de stockage adressé par contenu des fichiers de candidature
+
+    Chaque contenu est stocké une fois sous `blobs/aa/bb/<sha256><ext>`.
+    Un upload prend sa référence dans `store()` ; les autres changements de
+    références (CandidatureFile) sont comptés par signaux. Un blob dont le
+    compteur tombe à zéro est supprimé par une tâche en arrière-plan.
+    """
+    CHUNK_SIZE = 64 * 1024
+
+    @staticmethod
+    def blob_name(digest, filename):
+        extension = os.path.splitext(filename)[1].lower()
+        return f'blobs/{digest[:2]}/{digest[2:4]}/{digest}{extension}'
+
+    @staticmethod
+    def hash_content(content):
+        """
+        Empreinte SHA-256 du contenu, lu par blocs
+
+        Un gestionnaire d'upload peut l'avoir déjà calculée pendant la
+        réception (attribut `sha256`) : le fichier n'est alors pas relu.
+        """
+        digest = getattr(content, 'sha256', None)
+        if digest:
+            return digest
+        sha256 = hashlib.sha256()
+        for chunk in content.chunks(BlobService.CHUNK_SIZE):
+            sha256.update(chunk)
+        return sha256.hexdigest()
+
+    @staticmethod
+    def store(content, filename, storage=default_storage):
+        """
+        Retourne le blob du contenu, en l'écrivant dans le stockage s'il est nouveau
+
+        La référence de l'appelant est prise dans la même requête que la
+        lecture du blob existant : une suppression en attente (`delete_blob`,
+        compteur à zéro) ne peut plus l'emporter entre les deux.
+        """
+        digest = BlobService.hash_content(content)
+        if MediaBlob.objects.filter(sha256=digest).update(ref_count=F('ref_count') + 1):
+            return MediaBlob.objects.get(sha256=digest)
+
+        name = storage.save(BlobService.blob_name(digest, filename), content)
+        try:
+            with transaction.atomic():
+                return MediaBlob.objects.create(sha256=digest, name=name, size=storage.size(name), ref_count=1)
+        except IntegrityError:
+            # Même contenu enregistré en parallèle : on garde le premier
+            storage.delete(name)
+            MediaBlob.objects.filter(sha256=digest).update(ref_count=F('ref_count') + 1)
+            return MediaBlob.objects.get(sha256=digest)
+
+    @staticmethod
+    def acquire(name):
+        """
+        Ajoute une référence au blob `name` (sans effet hors blob)
+        """
+        MediaBlob.objects.filter(name=name).update(ref_count=F('ref_count') + 1)
+
+    @staticmethod
+    def release(name):
+        """
+        Retire une référence au blob `name` et planifie sa suppression à zéro
+        Retourne False si `name` n'est pas un blob.
+        """
+        blob_id = MediaBlob.objects.filter(name=name).values_list('pk', flat=True).first()
+        if blob_id is None:
+            return False
+
+        MediaBlob.objects.filter(pk=blob_id, ref_count__gt=0).update(ref_count=F('ref_count') - 1)
+        if MediaBlob.objects.filter(pk=blob_id, ref_count=0).exists():
+            from .tasks import delete_blob
+            delete_blob.enqueue(blob_id)
+        return True
+
+    @staticmethod
+    def recount():
+        """
+        Recalcule les compteurs de références depuis CandidatureFile
+        Retourne le nombre de blobs corrigés.
+        """
+        references = CandidatureFile.objects.filter(file=OuterRef('name')).order_by().values('file').annotate(
+            count=Count('pk')
+        ).values('count')
+        blobs = MediaBlob.objects.annotate(actual=Coalesce(Subquery(references), 0)).exclude(
+            ref_count=F('actual')
+        )
+        fixed = 0
+        for blob_id, actual in blobs.values_list('pk', 'actual'):
+            MediaBlob.objects.filter(pk=blob_id).update(ref_count=actual)
+            fixed += 1
+        return fixed
+
+
+class MediaAccessService:
+    """
+    Règles d'accès aux fichiers médias servis par l'application
+
+    Les fichiers de candidature ne sont publics que si une candidature qui
+    les référence est publiée ou approuvée ; sinon seuls le candidat et les
+    administrateurs y ont accès. Les autres médias (carousel, équipe, Hall of
+    Fame, photos de profil) sont publics. Une déclinaison suit son image source.
+    """
+    DERIVATIVES_PREFIX = 'derivatives/'
+
+    @staticmethod
+    def source_name(name):
+        """
+        Nom du fichier d'origine (None pour une déclinaison orpheline)
+        """
+        if not name.startswith(MediaAccessService.DERIVATIVES_PREFIX):
+            return name
+        root = posixpath.dirname(name[len(MediaAccessService.DERIVATIVES_PREFIX):])
+        return ResponsiveImage.objects.filter(source__startswith=f'{root}.').values_list(
+            'source', flat=True
+        ).first()
+
+    @staticmethod
+    def check_access(user, name):
+        """
+        Retourne (autorisé, public) pour le fichier `name`
+        """
+        source = MediaAccessService.source_name(name)
+        if source is None:
+            return False, False
+
+        files = CandidatureFile.objects.filter(file=source)
+        if not files.exists():
+            return True, True
+        if files.filter(Q(candidature__published=True) | Q(candidature__status='approved')).exists():
+            return True, True
+
+        if not user.is_authenticated:
+            return False, False
+        allowed = user.is_admin() or user.is_staff or files.filter(candidature__candidate=user).exists()
+        return allowed, False
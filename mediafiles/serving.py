@@ -0,0 +1,134 @@
+"""
+Livraison des fichiers médias
+
+Le contenu est délégué au proxy frontal quand il le permet (MEDIA_ACCEL_REDIRECT) :
+- 'nginx' : en-tête `X-Accel-Redirect` vers une location `internal` ;
+- 'sendfile' : en-tête `X-Sendfile` (Apache mod_xsendfile, lighttpd).
+Sinon Django sert le fichier par blocs, avec prise en charge de `Range`
+(lecture/déplacement dans les vidéos) et des requêtes conditionnelles.
+"""
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.http import HttpResponse, HttpResponseRedirect, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_etags, quote_etag
+
+from .storage import is_local_storage
+
+CHUNK_SIZE = 64 * 1024
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+# Contenus immuables : blobs adressés par leur empreinte
+IMMUTABLE_PREFIXES = ('blobs/',)
+
+
+def parse_range(header, size):
+    """
+    Interprète un en-tête `Range` à intervalle unique
+
+    Retourne (début, fin inclusive), None si l'en-tête est absent ou non pris
+    en charge (plusieurs intervalles : réponse complète), ou False s'il n'est
+    pas satisfiable.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if match is None:
+        return None
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if not start:
+        # Suffixe : les N derniers octets
+        length = int(end)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def _read(path, start, length):
+    with open(path, 'rb') as fh:
+        fh.seek(start)
+        while length > 0:
+            data = fh.read(min(CHUNK_SIZE, length))
+            if not data:
+                break
+            length -= len(data)
+            yield data
+
+
+def _cache_control(name, public):
+    if not public:
+        return 'private, no-cache'
+    if name.startswith(IMMUTABLE_PREFIXES):
+        return 'public, max-age=31536000, immutable'
+    return f'public, max-age={settings.MEDIA_CACHE_MAX_AGE}'
+
+
+def serve_media(request, name, public):
+    """
+    Réponse HTTP pour le fichier `name` du stockage par défaut
+    """
+    if not is_local_storage():
+        # Stockage distant : URL (présignée) servie directement par le stockage
+        return HttpResponseRedirect(default_storage.url(name))
+
+    path = default_storage.path(name)
+    if not os.path.isfile(path):
+        # Répertoire (ou fichier absent) : rien à servir
+        raise FileNotFoundError(name)
+    stat = os.stat(path)
+    etag = quote_etag(f'{int(stat.st_mtime):x}-{stat.st_size:x}')
+    content_type, encoding = mimetypes.guess_type(name)
+    if encoding:
+        # Archive compressée (.gz...) : servie telle quelle, sans Content-Encoding
+        content_type = 'application/octet-stream'
+
+    response = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if response is None:
+        if settings.MEDIA_ACCEL_REDIRECT == 'nginx':
+            response = HttpResponse()
+            response['X-Accel-Redirect'] = settings.MEDIA_ACCEL_PREFIX + quote(name)
+        elif settings.MEDIA_ACCEL_REDIRECT == 'sendfile':
+            response = HttpResponse()
+            response['X-Sendfile'] = path
+        else:
+            response = _stream(request, path, stat.st_size, etag)
+        response['Content-Type'] = content_type or 'application/octet-stream'
+
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    response['Cache-Control'] = _cache_control(name, public)
+    if not public:
+        response['Vary'] = 'Cookie'
+    return response
+
+
+def _stream(request, path, size, etag):
+    byte_range = parse_range(request.META.get('HTTP_RANGE'), size)
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if byte_range is not None and if_range and etag not in parse_etags(if_range):
+        # Le fichier a changé depuis la première réponse : renvoi complet
+        byte_range = None
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    start, end = byte_range or (0, size - 1)
+    length = end - start + 1 if size else 0
+    response = StreamingHttpResponse(_read(path, start, length), status=206 if byte_range else 200)
+    response['Content-Length'] = str(length)
+    response['Accept-Ranges'] = 'bytes'
+    if byte_range:
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    return response
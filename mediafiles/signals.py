@@ -0,0 +1,110 @@
+"""
+Signaux pour l'app mediafiles
+"""
+from django.apps import apps
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from .images import IMAGE_FIELDS
+from .services import BlobService
+from .tasks import delete_media, generate_derivatives
+
+# Champs dont les uploads sont dédupliqués (références comptées sur MediaBlob)
+BLOB_FIELDS = [
+    ('candidates.CandidatureFile', 'file'),
+]
+
+# Autres champs fichier dont le contenu est supprimé du stockage avec l'objet
+MEDIA_FIELDS = [
+    (model_label, field_name) for model_label, field_name, _ in IMAGE_FIELDS
+    if (model_label, field_name) not in BLOB_FIELDS
+]
+
+
+def _release(name):
+    """Libère un blob, ou supprime directement un fichier non dédupliqué"""
+    if not BlobService.release(name):
+        delete_media.enqueue([name])
+
+
+def schedule_image_derivatives(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Met en file la génération des déclinaisons des champs image enregistrés"""
+    if raw:
+        return
+    for model_label, field_name, filters in IMAGE_FIELDS:
+        if apps.get_model(model_label) is not sender:
+            continue
+        if update_fields is not None and field_name not in update_fields:
+            continue
+        if any(getattr(instance, key) != value for key, value in filters.items()):
+            continue
+        image = getattr(instance, field_name)
+        if image:
+            generate_derivatives.enqueue(image.name)
+
+
+def schedule_media_deletion(sender, instance, **kwargs):
+    """Met en file la suppression des fichiers d'un objet supprimé"""
+    names = [
+        getattr(instance, field_name).name
+        for model_label, field_name in MEDIA_FIELDS
+        if apps.get_model(model_label) is sender and getattr(instance, field_name)
+    ]
+    if names:
+        delete_media.enqueue(names)
+
+
+def remember_blob_names(sender, instance, **kwargs):
+    """Mémorise les fichiers enregistrés en base avant modification"""
+    if instance.pk is None:
+        return
+    fields = [field_name for model_label, field_name in BLOB_FIELDS if apps.get_model(model_label) is sender]
+    instance._previous_blob_names = sender.objects.filter(pk=instance.pk).values(*fields).first() or {}
+
+
+def count_blob_references(sender, instance, created, **kwargs):
+    """Met à jour les références des blobs après création ou remplacement du fichier"""
+    previous = {} if created else getattr(instance, '_previous_blob_names', {})
+    # Références prises par BlobService.store() lors de l'upload
+    acquired = getattr(instance, '_acquired_blob_names', set())
+    instance._acquired_blob_names = set()
+    for model_label, field_name in BLOB_FIELDS:
+        if apps.get_model(model_label) is not sender:
+            continue
+        name = getattr(instance, field_name).name
+        old_name = previous.get(field_name)
+        if name == old_name:
+            if name in acquired:
+                # Même contenu renvoyé : la référence existait déjà
+                BlobService.release(name)
+            continue
+        if name and name not in acquired:
+            BlobService.acquire(name)
+        if old_name:
+            _release(old_name)
+
+
+def release_blob_references(sender, instance, **kwargs):
+    """Libère les blobs d'un objet supprimé"""
+    for model_label, field_name in BLOB_FIELDS:
+        if apps.get_model(model_label) is sender and getattr(instance, field_name):
+            _release(getattr(instance, field_name).name)
+
+
+def connect_signals():
+    for model_label, _, _ in IMAGE_FIELDS:
+        post_save.connect(
+            schedule_image_derivatives,
+            sender=apps.get_model(model_label),
+            dispatch_uid=f'mediafiles.derivatives.{model_label}'
+        )
+    for model_label in {model_label for model_label, _ in MEDIA_FIELDS}:
+        post_delete.connect(
+            schedule_media_deletion,
+            sender=apps.get_model(model_label),
+            dispatch_uid=f'mediafiles.deletion.{model_label}'
+        )
+    for model_label in {model_label for model_label, _ in BLOB_FIELDS}:
+        model = apps.get_model(model_label)
+        pre_save.connect(remember_blob_names, sender=model, dispatch_uid=f'mediafiles.blobs.pre.{model_label}')
+        post_save.connect(count_blob_references, sender=model, dispatch_uid=f'mediafiles.blobs.save.{model_label}')
+        post_delete.connect(release_blob_references, sender=model, dispatch_uid=f'mediafiles.blobs.delete.{model_label}')
@@ -0,0 +1,87 @@
+"""
+Reconnaissance du format d'un fichier par ses premiers octets (signatures)
+
+Utilisée pendant la réception d'un upload : le premier morceau suffit à
+refuser un fichier dont le contenu ne correspond pas à son extension.
+Les extensions sans signature fiable (txt) ne sont pas contrôlées.
+"""
+from .probe import MP4_BOX_TYPES
+
+# Nombre d'octets nécessaires pour reconnaître tous les formats ci-dessous
+SNIFF_SIZE = 16
+
+
+def _prefix(*prefixes):
+    return lambda head: head.startswith(prefixes)
+
+
+def _riff(form):
+    return lambda head: head[:4] == b'RIFF' and head[8:12] == form
+
+
+def _iso_media(head):
+    # MP4/MOV/M4A : première boîte (ftyp, ou moov/mdat... pour les anciens MOV)
+    return head[4:8] in MP4_BOX_TYPES
+
+
+def _mpeg_audio(head):
+    # Balises ID3 ou mot de synchronisation d'une trame MPEG/ADTS
+    return head[:3] == b'ID3' or (len(head) >= 2 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0)
+
+
+JPEG = _prefix(b'\xff\xd8\xff')
+EBML = _prefix(b'\x1a\x45\xdf\xa3')
+ASF = _prefix(b'\x30\x26\xb2\x75\x8e\x66\xcf\x11')
+OLE = _prefix(b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1')
+ZIP = _prefix(b'PK\x03\x04', b'PK\x05\x06')
+
+SIGNATURES = {
+    # Images
+    'jpg': JPEG,
+    'jpeg': JPEG,
+    'png': _prefix(b'\x89PNG\r\n\x1a\n'),
+    'gif': _prefix(b'GIF87a', b'GIF89a'),
+    'webp': _riff(b'WEBP'),
+    'bmp': _prefix(b'BM'),
+    'tiff': _prefix(b'II*\x00', b'MM\x00*'),
+    # Vidéos
+    'mp4': _iso_media,
+    'm4v': _iso_media,
+    'mov': _iso_media,
+    'avi': _riff(b'AVI '),
+    'webm': EBML,
+    'mkv': EBML,
+    'wmv': ASF,
+    'flv': _prefix(b'FLV'),
+    # Audios
+    'mp3': _mpeg_audio,
+    'aac': lambda head: _mpeg_audio(head) or head[:4] == b'ADIF',
+    'wav': _riff(b'WAVE'),
+    'flac': lambda head: head[:4] == b'fLaC' or head[:3] == b'ID3',
+    'ogg': _prefix(b'OggS'),
+    'm4a': _iso_media,
+    'wma': ASF,
+    # Documents
+    'pdf': _prefix(b'%PDF-'),
+    'rtf': _prefix(b'{\\rtf'),
+    'doc': OLE,
+    'xls': OLE,
+    'ppt': OLE,
+    'docx': ZIP,
+    'xlsx': ZIP,
+    'pptx': ZIP,
+    'odt': ZIP,
+    'zip': ZIP,
+    'rar': _prefix(b'Rar!\x1a\x07'),
+    '7z': _prefix(b'7z\xbc\xaf\x27\x1c'),
+}
+
+
+def matches_extension(head, extension):
+    """
+    Vérifie que les premiers octets correspondent à l'extension (sans le point)
+
+    Retourne True pour une extension sans signature connue.
+    """
+    signature = SIGNATURES.get(extension.lower())
+    return signature is None or bool(signature(head))
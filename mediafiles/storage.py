@@ -0,0 +1,148 @@
+"""
+Abstraction du stockage des médias pour les uploads directs
+
+Le stockage par défaut de Django (`STORAGES['default']`) est soit le système
+de fichiers local (MEDIA_ROOT), soit un stockage objet compatible S3
+(django-storages). Les backends ci-dessous émettent des URLs d'upload signées
+et de courte durée, pour que les clients envoient les fichiers sans passer
+par un worker Python :
+
+- S3DirectUpload : POST présigné vers le bucket (taille bornée par la politique) ;
+- LocalDirectUpload : équivalent local (développement, tests), un endpoint
+  Django signé qui écrit dans le stockage par défaut.
+
+Les en-têtes d'un fichier reçu sont relus par `open_headers`, par requêtes
+partielles sur S3 plutôt qu'en téléchargeant l'objet entier.
+"""
+import io
+
+from django.conf import settings
+from django.core import signing
+from django.core.files.storage import default_storage
+from django.urls import reverse
+
+LOCAL_UPLOAD_SALT = 'mediafiles.local-upload'
+
+
+class LocalDirectUpload:
+    """
+    Upload direct vers le stockage local via un endpoint signé (PUT)
+    """
+
+    def presign(self, request, key, content_type, max_size):
+        token = signing.dumps(
+            {'key': key, 'content_type': content_type, 'max_size': max_size},
+            salt=LOCAL_UPLOAD_SALT
+        )
+        return {
+            'method': 'PUT',
+            'url': request.build_absolute_uri(reverse('mediafiles:local_upload', args=[token])),
+            'fields': {},
+            'headers': {'Content-Type': content_type},
+        }
+
+    @staticmethod
+    def load_token(token):
+        """
+        Décode le jeton d'un upload local (lève signing.BadSignature si invalide)
+        """
+        return signing.loads(
+            token, salt=LOCAL_UPLOAD_SALT, max_age=settings.DIRECT_UPLOAD_EXPIRY_SECONDS
+        )
+
+
+class S3DirectUpload:
+    """
+    Upload direct vers un stockage compatible S3 (POST présigné)
+    """
+
+    def presign(self, request, key, content_type, max_size):
+        client = default_storage.connection.meta.client
+        post = client.generate_presigned_post(
+            Bucket=default_storage.bucket_name,
+            Key=default_storage._normalize_name(key),
+            Fields={'Content-Type': content_type},
+            Conditions=[
+                {'Content-Type': content_type},
+                ['content-length-range', 1, max_size],
+            ],
+            ExpiresIn=settings.DIRECT_UPLOAD_EXPIRY_SECONDS,
+        )
+        return {
+            'method': 'POST',
+            'url': post['url'],
+            'fields': post['fields'],
+            'headers': {},
+        }
+
+
+def get_direct_upload_backend():
+    """
+    Retourne le backend d'upload direct correspondant au stockage configuré
+    """
+    if settings.MEDIA_STORAGE == 's3':
+        return S3DirectUpload()
+    return LocalDirectUpload()
+
+
+def is_local_storage():
+    """
+    Indique si le stockage par défaut est un système de fichiers local
+    """
+    try:
+        default_storage.path('')
+    except NotImplementedError:
+        return False
+    return True
+
+
+# Taille des lectures partielles (S3) : une requête suffit pour la plupart des en-têtes
+RANGE_READ_SIZE = 64 * 1024
+
+
+class RangedObjectReader(io.RawIOBase):
+    """
+    Lecture d'un objet S3 par requêtes GET partielles (en-tête Range)
+    """
+
+    def __init__(self, key):
+        super().__init__()
+        self.name = key
+        self.object = default_storage.bucket.Object(default_storage._normalize_name(key))
+        self.size = self.object.content_length
+        self.position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self.position, io.SEEK_END: self.size}[whence]
+        self.position = max(0, base + offset)
+        return self.position
+
+    def readinto(self, buffer):
+        if self.position >= self.size or not len(buffer):
+            return 0
+        end = min(self.position + len(buffer), self.size) - 1
+        data = self.object.get(Range=f'bytes={self.position}-{end}')['Body'].read()
+        buffer[:len(data)] = data
+        self.position += len(data)
+        return len(data)
+
+
+def open_headers(key):
+    """
+    Ouvre un fichier du stockage pour en lire les en-têtes (signature, durée)
+
+    Stockage local : fichier ordinaire ; S3 : lectures partielles de
+    RANGE_READ_SIZE octets à la demande.
+    """
+    if settings.MEDIA_STORAGE == 's3':
+        return io.BufferedReader(RangedObjectReader(key), buffer_size=RANGE_READ_SIZE)
+    return default_storage.open(key, 'rb')
@@ -0,0 +1,40 @@
+"""
+Tâches en arrière-plan de l'app mediafiles
+"""
+from django.core.files.storage import default_storage
+
+from jobs.registry import task
+
+from . import images
+from .models import MediaBlob, ResponsiveImage
+from .services import ResponsiveImageService
+
+
+@task(max_attempts=3)
+def generate_derivatives(source):
+    """Génère les déclinaisons responsives d'une image"""
+    images.generate_derivatives(source)
+
+
+@task(priority=-10)
+def delete_media(names):
+    """Supprime des fichiers du stockage ainsi que leurs déclinaisons"""
+    for responsive in ResponsiveImage.objects.filter(source__in=names):
+        for rendition in responsive.renditions:
+            default_storage.delete(rendition['name'])
+        responsive.delete()
+        ResponsiveImageService.invalidate(responsive.source)
+    for name in names:
+        default_storage.delete(name)
+
+
+@task(priority=-10)
+def delete_blob(blob_id):
+    """Supprime un blob qui n'est plus référencé"""
+    blob = MediaBlob.objects.filter(pk=blob_id, ref_count=0).first()
+    if blob is None:
+        return
+    # Suppression conditionnelle : le blob a pu être réutilisé entre-temps
+    deleted, _ = MediaBlob.objects.filter(pk=blob_id, ref_count=0).delete()
+    if deleted:
+        delete_media([blob.name])
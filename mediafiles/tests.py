@@ -0,0 +1,571 @@
+import gzip
+import io
+import os
+import shutil
+import struct
+import tempfile
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+from django.core import signing
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection
+from django.db.models import QuerySet
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from candidates.models import Candidature, CandidatureFile
+from categories.models import Category
+from .garbage import MediaGarbageCollector
+from .images import generate_derivatives
+from .models import MediaBlob, ResponsiveImage
+from .probe import probe_duration
+from .serializers import DirectUploadSerializer
+from .services import BlobService, DirectUploadService, ResponsiveImageService
+from .sniff import SNIFF_SIZE, matches_extension
+from .storage import open_headers
+from .tasks import delete_blob
+
+
+class MediaTestCase(TestCase):
+    """
+    Cas de test disposant d'un MEDIA_ROOT temporaire
+    """
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def write(self, name, content):
+        path = os.path.join(self.media_root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as fh:
+            fh.write(content)
+        return path
+
+
+@override_settings(MEDIA_ACCEL_REDIRECT='', COMPRESSION_MIN_LENGTH=512)
+class MediaServingTest(MediaTestCase):
+    """
+    Les médias sont servis en flux avec `Range` ; seuls les types textuels
+    sont compressés, jamais une réponse partielle.
+    """
+
+    def get(self, name, **headers):
+        response = self.client.get(f'/media/{name}', HTTP_ACCEPT_ENCODING='gzip, br', **headers)
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        return response, body
+
+    def test_range_is_not_compressed(self):
+        content = os.urandom(5000)
+        self.write('uploads/clip.mp4', content)
+        response, body = self.get('uploads/clip.mp4', HTTP_RANGE='bytes=100-199')
+        self.assertEqual(response.status_code, 206)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response['Content-Range'], 'bytes 100-199/5000')
+        self.assertEqual(response['Content-Length'], '100')
+        self.assertEqual(body, content[100:200])
+
+    def test_binary_types_are_not_compressed(self):
+        for name in ('uploads/clip.mp4', 'exports/dossiers.zip'):
+            content = os.urandom(5000)
+            self.write(name, content)
+            response, body = self.get(name)
+            self.assertEqual(response.status_code, 200)
+            self.assertFalse(response.has_header('Content-Encoding'), name)
+            self.assertEqual(body, content)
+
+    def test_directory_is_not_found(self):
+        self.write('uploads/photos/photo.jpg', b'x')
+        for name in ('uploads/photos', 'uploads/photos/', 'uploads/absent.jpg'):
+            self.assertEqual(self.client.get(f'/media/{name}').status_code, 404, name)
+
+    def test_streamed_text_is_compressed(self):
+        content = b'Makona Awards\n' * 400
+        self.write('uploads/notes.txt', content)
+        response, body = self.get('uploads/notes.txt')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(body), content)
+
+
+class MediaGarbageCollectorTest(MediaTestCase):
+    """
+    Seuls les fichiers anciens et non référencés (champs fichier,
+    déclinaisons d'images et blobs encore utilisés) sont collectés.
+    """
+
+    OLD = [
+        'profiles/kept.jpg', 'responsive/kept-320.webp', 'blobs/11/used.pdf',
+        'orphans/old.bin', 'responsive/gone-320.webp', 'blobs/00/unused.pdf',
+    ]
+    ORPHANS = ['orphans/old.bin', 'responsive/gone-320.webp', 'blobs/00/unused.pdf']
+
+    def setUp(self):
+        super().setUp()
+        old = time.time() - 2 * 24 * 3600
+        for name in self.OLD:
+            os.utime(self.write(name, b'x'), (old, old))
+        self.write('recent.bin', b'x')
+
+        user = User.objects.create_user(email='candidat@example.com', username='candidat', password='x')
+        User.objects.filter(pk=user.pk).update(profile_picture='profiles/kept.jpg')
+        for source in ('profiles/kept.jpg', 'gone.jpg'):
+            stem = os.path.splitext(os.path.basename(source))[0]
+            ResponsiveImage.objects.create(
+                source=source, width=640, height=480,
+                renditions=[{'name': f'responsive/{stem}-320.webp', 'width': 320}],
+            )
+        MediaBlob.objects.create(sha256='1' * 64, name='blobs/11/used.pdf', size=1, ref_count=1)
+        MediaBlob.objects.create(sha256='0' * 64, name='blobs/00/unused.pdf', size=1, ref_count=0)
+        old_date = timezone.now() - timezone.timedelta(days=2)
+        ResponsiveImage.objects.update(created_at=old_date)
+        MediaBlob.objects.update(created_at=old_date)
+
+    def collect(self, **kwargs):
+        cutoff = timezone.now() - timezone.timedelta(hours=1)
+        return MediaGarbageCollector(self.media_root, cutoff, **kwargs).run()
+
+    def exists(self, name, root=None):
+        return os.path.exists(os.path.join(root or self.media_root, name))
+
+    def test_orphans_are_removed(self):
+        stats = self.collect()
+        self.assertEqual((stats['orphans'], stats['stale_derivatives'], stats['unused_blobs']), (3, 1, 1))
+        for name in self.OLD:
+            self.assertEqual(self.exists(name), name not in self.ORPHANS, name)
+        self.assertTrue(self.exists('recent.bin'))
+        # Répertoires vidés supprimés, les autres conservés
+        self.assertFalse(self.exists('orphans'))
+        self.assertFalse(self.exists('blobs/00'))
+        self.assertTrue(self.exists('responsive'))
+        self.assertEqual(list(ResponsiveImage.objects.values_list('source', flat=True)), ['profiles/kept.jpg'])
+        self.assertEqual(list(MediaBlob.objects.values_list('name', flat=True)), ['blobs/11/used.pdf'])
+
+    def test_revived_blob_is_kept(self):
+        delete = QuerySet.delete
+
+        def revive_then_delete(queryset):
+            # store() reprend une référence entre la lecture et la suppression
+            if queryset.model is MediaBlob:
+                MediaBlob.objects.filter(name='blobs/00/unused.pdf').update(ref_count=1)
+            return delete(queryset)
+
+        with mock.patch.object(QuerySet, 'delete', revive_then_delete):
+            stats = self.collect()
+        self.assertEqual((stats['orphans'], stats['unused_blobs']), (2, 0))
+        self.assertTrue(self.exists('blobs/00/unused.pdf'))
+        self.assertTrue(MediaBlob.objects.filter(name='blobs/00/unused.pdf').exists())
+
+    def test_quarantine(self):
+        quarantine_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, quarantine_dir, ignore_errors=True)
+        self.collect(quarantine_dir=quarantine_dir)
+        for name in self.ORPHANS:
+            self.assertFalse(self.exists(name), name)
+            self.assertTrue(self.exists(name, quarantine_dir), name)
+
+    def test_dry_run(self):
+        stats = self.collect(dry_run=True)
+        self.assertEqual((stats['orphans'], stats['stale_derivatives'], stats['unused_blobs']), (3, 1, 1))
+        for name in self.OLD:
+            self.assertTrue(self.exists(name), name)
+        self.assertEqual(ResponsiveImage.objects.count(), 2)
+        self.assertEqual(MediaBlob.objects.count(), 2)
+
+
+class ResponsiveImageServiceTest(MediaTestCase):
+    """
+    Une image sans déclinaisons n'est pas mise en cache comme absente :
+    les autres processus les voient dès leur génération. Seule une image
+    illisible, qui n'en aura jamais, l'est.
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_pending_image_is_not_cached(self):
+        self.assertIsNone(ResponsiveImageService.get('uploads/photo.jpg'))
+        # Génération par le worker, sans invalidation visible de ce processus
+        ResponsiveImage.objects.create(source='uploads/photo.jpg', width=640, height=480, renditions=[])
+        with self.assertNumQueries(1):
+            self.assertEqual(ResponsiveImageService.get('uploads/photo.jpg')['width'], 640)
+        with self.assertNumQueries(0):
+            ResponsiveImageService.get('uploads/photo.jpg')
+
+    def test_non_image_miss_is_cached(self):
+        self.assertIsNone(ResponsiveImageService.get('uploads/clip.mp4'))
+        with self.assertNumQueries(0):
+            self.assertIsNone(ResponsiveImageService.get('uploads/clip.mp4'))
+
+    def test_undecodable_image_is_cached(self):
+        self.write('uploads/illisible.jpg', b'pas une image')
+        self.assertIsNone(generate_derivatives('uploads/illisible.jpg'))
+        with self.assertNumQueries(0):
+            self.assertIsNone(ResponsiveImageService.get('uploads/illisible.jpg'))
+
+    def test_get_many(self):
+        ResponsiveImage.objects.create(source='uploads/a.jpg', width=640, height=480, renditions=[])
+        with self.assertNumQueries(1):
+            found = ResponsiveImageService.get_many(['uploads/a.jpg', 'uploads/b.jpg', 'uploads/c.pdf'])
+        self.assertEqual(found['uploads/a.jpg']['width'], 640)
+        self.assertIsNone(found['uploads/b.jpg'])
+        self.assertIsNone(found['uploads/c.pdf'])
+        # Seule l'image en attente est relue
+        with CaptureQueriesContext(connection) as queries:
+            ResponsiveImageService.get_many(['uploads/a.jpg', 'uploads/b.jpg', 'uploads/c.pdf'])
+        self.assertEqual(len(queries), 1)
+        self.assertIn('uploads/b.jpg', queries[0]['sql'])
+        self.assertNotIn('uploads/a.jpg', queries[0]['sql'])
+
+
+@override_settings(JOBS_EAGER=False)
+class ResponsiveImageListTest(MediaTestCase):
+    """
+    Une page de candidatures charge les déclinaisons de toutes leurs photos
+    en une seule requête, même sans déclinaisons générées.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            email='admin@example.com', username='admin', password='x', user_type='admin'
+        )
+        category = Category.objects.create(name='Musique', description='d')
+        cls.candidatures = []
+        for index in range(10):
+            candidate = User.objects.create_user(
+                email=f'candidat{index}@example.com', username=f'candidat{index}',
+                password='x', user_type='candidate'
+            )
+            cls.candidatures.append(Candidature.objects.create(candidate=candidate, category=category))
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        for index, candidature in enumerate(self.candidatures):
+            for photo in range(3):
+                CandidatureFile.objects.create(
+                    candidature=candidature, file_type='photo',
+                    file=ContentFile(b'\xff\xd8\xff\xe0' + bytes([index, photo]), name='photo.jpg')
+                )
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def responsive_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return [query for query in queries if 'mediafiles_responsiveimage' in query['sql']]
+
+    def test_admin_lists(self):
+        for url in ('/api/admin/candidates/candidatures/', '/api/candidatures/admin/'):
+            with self.subTest(url):
+                for _ in range(2):
+                    self.assertEqual(len(self.responsive_queries(url)), 1)
+
+
+@override_settings(JOBS_EAGER=True)
+class BlobReferenceTest(MediaTestCase):
+    """
+    Un contenu identique n'est stocké qu'une fois ; chaque fichier de
+    candidature compte une référence, prise dès l'upload.
+    """
+
+    PDF = b'%PDF-1.7\n' + b'x' * 100
+
+    @classmethod
+    def setUpTestData(cls):
+        category = Category.objects.create(name='Musique', description='d')
+        candidate = User.objects.create_user(
+            email='candidat@example.com', username='candidat', password='x', user_type='candidate'
+        )
+        cls.candidature = Candidature.objects.create(candidate=candidate, category=category)
+
+    def create_file(self, content, name='dossier.pdf'):
+        return CandidatureFile.objects.create(
+            candidature=self.candidature, file_type='portfolio', file=ContentFile(content, name=name)
+        )
+
+    def test_identical_content_shares_blob(self):
+        first = self.create_file(self.PDF)
+        second = self.create_file(self.PDF, name='copie.pdf')
+        self.assertEqual(first.file.name, second.file.name)
+        blob = MediaBlob.objects.get()
+        self.assertEqual(blob.ref_count, 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertEqual(MediaBlob.objects.get().ref_count, 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(MediaBlob.objects.exists())
+        self.assertFalse(default_storage.exists(blob.name))
+
+    def test_replacing_file_moves_reference(self):
+        candidature_file = self.create_file(self.PDF)
+        old_name = candidature_file.file.name
+        candidature_file.file = ContentFile(self.PDF + b'v2', name='dossier.pdf')
+        with self.captureOnCommitCallbacks(execute=True):
+            candidature_file.save()
+        self.assertEqual(MediaBlob.objects.get(name=candidature_file.file.name).ref_count, 1)
+        self.assertFalse(MediaBlob.objects.filter(name=old_name).exists())
+
+        # Même contenu renvoyé : aucune référence supplémentaire
+        candidature_file.file = ContentFile(self.PDF + b'v2', name='dossier.pdf')
+        candidature_file.save()
+        self.assertEqual(MediaBlob.objects.get().ref_count, 1)
+
+    def test_store_takes_reference_before_pending_deletion(self):
+        blob = BlobService.store(ContentFile(self.PDF, name='dossier.pdf'), 'dossier.pdf')
+        MediaBlob.objects.filter(pk=blob.pk).update(ref_count=0)
+
+        # Réutilisation du blob alors que sa suppression est en file
+        reused = BlobService.store(ContentFile(self.PDF, name='dossier.pdf'), 'dossier.pdf')
+        self.assertEqual((reused.pk, reused.ref_count), (blob.pk, 1))
+        delete_blob(blob.pk)
+        self.assertTrue(MediaBlob.objects.filter(pk=blob.pk).exists())
+        self.assertTrue(default_storage.exists(blob.name))
+
+    def test_recount(self):
+        self.create_file(self.PDF)
+        MediaBlob.objects.update(ref_count=5)
+        self.assertEqual(BlobService.recount(), 1)
+        self.assertEqual(MediaBlob.objects.get().ref_count, 1)
+
+
+def box(box_type, payload=b'', large=False):
+    if large:
+        return struct.pack('>I4sQ', 1, box_type, len(payload) + 16) + payload
+    return struct.pack('>I4s', len(payload) + 8, box_type) + payload
+
+
+def mvhd(timescale, duration, version=0):
+    if version == 1:
+        fields = struct.pack('>QQIQ', 0, 0, timescale, duration)
+    else:
+        fields = struct.pack('>IIII', 0, 0, timescale, duration)
+    return box(b'mvhd', bytes([version, 0, 0, 0]) + fields + b'\0' * 80)
+
+
+def wav(byte_rate, data_size, declared_size=None):
+    fmt = struct.pack('<HHII', 1, 2, 44100, byte_rate) + struct.pack('<HH', 4, 16)
+    chunks = (
+        b'fmt ' + struct.pack('<I', len(fmt)) + fmt
+        + b'LIST' + struct.pack('<I', 3) + b'abc\0'
+        + b'data' + struct.pack('<I', data_size if declared_size is None else declared_size)
+        + b'\0' * data_size
+    )
+    return b'RIFF' + struct.pack('<I', len(chunks) + 4) + b'WAVE' + chunks
+
+
+def riff_list(list_type, payload):
+    return b'LIST' + struct.pack('<I', len(payload) + 4) + list_type + payload
+
+
+def avi(micro_seconds, frames, dml_frames=None):
+    chunks = b'avih' + struct.pack('<I', 56) + struct.pack('<5I', micro_seconds, 0, 0, 0, frames) + b'\0' * 36
+    chunks += riff_list(b'strl', b'strh' + struct.pack('<I', 4) + b'vids')
+    if dml_frames is not None:
+        chunks += riff_list(b'odml', b'dmlh' + struct.pack('<I', 248) + struct.pack('<I', dml_frames) + b'\0' * 244)
+    body = b'AVI ' + riff_list(b'hdrl', chunks) + riff_list(b'movi', b'')
+    return b'RIFF' + struct.pack('<I', len(body)) + body
+
+
+def flac(sample_rate, total_samples, block_type=0):
+    packed = (sample_rate << 44) | (1 << 41) | (15 << 36) | total_samples
+    streaminfo = b'\0' * 10 + packed.to_bytes(8, 'big') + b'\0' * 16
+    return b'fLaC' + bytes([0x80 | block_type, 0, 0, 34]) + streaminfo
+
+
+# MPEG-1 Layer III, 128 kbit/s, 44,1 kHz, stéréo
+MP3_HEADER = b'\xff\xfb\x90\x64'
+ID3_TAG = b'ID3\x03\x00\x00\x00\x00\x00\x14' + b'\0' * 20
+
+
+class ProbeDurationTest(TestCase):
+    """
+    La durée est lue dans les en-têtes de chaque format ; une entrée
+    tronquée ou corrompue donne None sans exception.
+    """
+
+    def probe(self, content):
+        fh = io.BytesIO(content)
+        fh.seek(5 if len(content) > 5 else 0)
+        duration = probe_duration(fh)
+        self.assertEqual(fh.tell(), 0)
+        return duration
+
+    def test_mp4_moov_after_mdat(self):
+        content = box(b'ftyp', b'isom\0\0\0\0') + box(b'mdat', b'\0' * 4096) + box(b'moov', mvhd(1000, 12345))
+        self.assertAlmostEqual(self.probe(content), 12.345)
+
+    def test_mp4_mvhd_version_1(self):
+        content = box(b'ftyp', b'isom') + box(b'moov', box(b'trak') + mvhd(600, 600 * 90, version=1))
+        self.assertAlmostEqual(self.probe(content), 90)
+
+    def test_mp4_large_mdat(self):
+        content = box(b'ftyp', b'isom') + box(b'mdat', b'\0' * 64, large=True) + box(b'moov', mvhd(25, 250))
+        self.assertAlmostEqual(self.probe(content), 10)
+
+    def test_wav(self):
+        self.assertAlmostEqual(self.probe(wav(176400, 176400 * 2)), 2)
+        # Taille du bloc `data` inconnue (flux) : reste du fichier
+        self.assertAlmostEqual(self.probe(wav(176400, 88200, declared_size=0xFFFFFFFF)), 0.5)
+
+    def test_avi(self):
+        # 250 trames de 40 ms
+        self.assertAlmostEqual(self.probe(avi(40000, 250)), 10)
+        # AVI OpenDML : total de `dmlh`
+        self.assertAlmostEqual(self.probe(avi(40000, 250, dml_frames=2500)), 100)
+
+    def test_flac(self):
+        self.assertAlmostEqual(self.probe(flac(44100, 44100 * 7)), 7)
+
+    def test_mp3_cbr(self):
+        # 2 s à 128 kbit/s après la balise ID3, plus une balise ID3v1 finale
+        audio = (MP3_HEADER + b'\0' * 413) * 76 + MP3_HEADER + b'\0' * 304
+        self.assertEqual(len(audio), 32000)
+        self.assertAlmostEqual(self.probe(ID3_TAG + audio + b'TAG' + b'\0' * 125), 2)
+
+    def test_mp3_xing(self):
+        frame = MP3_HEADER + b'\0' * 32 + b'Xing' + struct.pack('>II', 1, 1000) + b'\0' * 400
+        self.assertAlmostEqual(self.probe(ID3_TAG + frame * 3), 1000 * 1152 / 44100)
+
+    def test_mp3_vbri(self):
+        frame = MP3_HEADER + b'\0' * 32 + b'VBRI' + b'\0' * 10 + struct.pack('>I', 500) + b'\0' * 400
+        self.assertAlmostEqual(self.probe(frame * 3), 500 * 1152 / 44100)
+
+    def test_truncated_and_corrupt(self):
+        cases = {
+            'vide': b'',
+            'trop court': b'fLaC\x80',
+            'inconnu': b'GIF89a' + b'\0' * 64,
+            'mp4 sans moov': box(b'ftyp', b'isom') + box(b'mdat', b'\0' * 64),
+            'mp4 tronqué': box(b'ftyp', b'isom') + box(b'moov', mvhd(1000, 5000))[:20],
+            'mp4 taille de boîte invalide': box(b'ftyp', b'isom') + struct.pack('>I4s', 4, b'moov'),
+            'mp4 timescale nul': box(b'ftyp', b'isom') + box(b'moov', mvhd(0, 5000)),
+            'wav sans fmt': b'RIFF\0\0\0\0WAVE' + b'data' + struct.pack('<I', 8) + b'\0' * 8,
+            'wav tronqué': wav(176400, 1000)[:30],
+            'avi tronqué': avi(40000, 250)[:40],
+            'avi sans trames': avi(40000, 0),
+            'flac sans STREAMINFO': flac(44100, 1000, block_type=4),
+            'flac sans échantillons': flac(44100, 0),
+            'mp3 sans trame': ID3_TAG + b'\xff\x00' * 200,
+            'mp3 en-tête invalide': MP3_HEADER[:2] + b'\0' * 10,
+            'mp3 balise ID3 tronquée': b'ID3\x03\x00\x00\x00\x00\x7f\x7f' + MP3_HEADER + b'\0' * 16,
+        }
+        for label, content in cases.items():
+            with self.subTest(label):
+                self.assertIsNone(self.probe(content))
+
+
+class DirectUploadSerializerTest(TestCase):
+    """
+    L'upload direct d'un fichier de candidature applique la limite de taille
+    de sa catégorie, comme un envoi reçu par Django.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name='Vidéo', description='d', max_video_size=500)
+        cls.candidate = User.objects.create_user(
+            email='candidat@example.com', username='candidat', password='x', user_type='candidate'
+        )
+        cls.candidature = Candidature.objects.create(candidate=cls.candidate, category=cls.category)
+
+    def validate(self, size):
+        serializer = DirectUploadSerializer(data={
+            'target': 'candidature_file', 'candidature': self.candidature.pk, 'file_type': 'video',
+            'filename': 'clip.mp4', 'content_type': 'video/mp4', 'size': size,
+        }, context={'request': SimpleNamespace(user=self.candidate)})
+        return serializer.is_valid()
+
+    def test_category_limit(self):
+        self.assertTrue(self.validate(400 * 1024 * 1024))
+        self.assertFalse(self.validate(501 * 1024 * 1024))
+
+
+class FakeS3Object:
+    """
+    Objet S3 minimal : lectures partielles comptées
+    """
+
+    def __init__(self, content):
+        self.content = content
+        self.content_length = len(content)
+        self.ranges = []
+
+    def get(self, Range):
+        start, end = map(int, Range.removeprefix('bytes=').split('-'))
+        self.ranges.append((start, end))
+        return {'Body': io.BytesIO(self.content[start:end + 1])}
+
+
+class DirectUploadServiceTest(MediaTestCase):
+    """
+    Les clés d'upload direct sont uniques ; la signature et la durée d'un
+    fichier de candidature sont contrôlées sur ses seuls en-têtes, y compris
+    sur S3.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name='Vidéo', description='d', max_video_duration=60)
+        cls.candidate = User.objects.create_user(
+            email='candidat@example.com', username='candidat', password='x', user_type='candidate'
+        )
+        cls.candidature = Candidature.objects.create(candidate=cls.candidate, category=cls.category)
+
+    def test_unique_keys(self):
+        instance = CandidatureFile(candidature=self.candidature, file_type='video')
+        field = CandidatureFile._meta.get_field('file')
+        keys = {DirectUploadService.unique_key(instance, field, 'clip.mp4') for _ in range(2)}
+        self.assertEqual(len(keys), 2)
+
+        key = DirectUploadService.unique_key(instance, field, 'a' * 300 + '.mp4')
+        self.assertLessEqual(len(key), field.max_length)
+        self.assertTrue(key.endswith('.mp4'))
+
+    def complete(self, key, content):
+        self.write(key, content)
+        upload_id = signing.dumps({
+            'target': 'candidature_file', 'key': key, 'user': self.candidate.id,
+            'max_size': 10 * 1024 * 1024,
+            'params': {'candidature': self.candidature.pk, 'file_type': 'video'},
+        }, salt=DirectUploadService.SALT)
+        return DirectUploadService.complete(self.candidate, upload_id)
+
+    def test_complete_checks_signature(self):
+        with self.assertRaises(ValueError):
+            self.complete('candidatures/clip.mp4', b'%PDF-1.7\n' + b'\0' * 64)
+        self.assertFalse(self.candidature.files.exists())
+        self.assertFalse(default_storage.exists('candidatures/clip.mp4'))
+
+    def test_complete_checks_duration(self):
+        content = box(b'ftyp', b'isom') + box(b'moov', mvhd(1000, 90000))
+        with self.assertRaises(ValueError):
+            self.complete('candidatures/long.mp4', content)
+        self.assertFalse(self.candidature.files.exists())
+
+    @override_settings(MEDIA_STORAGE='s3')
+    def test_s3_headers_read_by_range(self):
+        content = box(b'ftyp', b'isom\0\0\0\0') + box(b'mdat', b'\0' * 1024 * 1024) + box(b'moov', mvhd(1000, 12345))
+        s3_object = FakeS3Object(content)
+        storage = SimpleNamespace(bucket=SimpleNamespace(Object=lambda name: s3_object), _normalize_name=str)
+        with mock.patch('mediafiles.storage.default_storage', storage):
+            with open_headers('candidatures/clip.mp4') as fh:
+                self.assertTrue(matches_extension(fh.read(SNIFF_SIZE), 'mp4'))
+                self.assertAlmostEqual(probe_duration(fh), 12.345)
+        # En-têtes seuls : ni l'objet entier ni la boîte `mdat`
+        self.assertLessEqual(len(s3_object.ranges), 3)
+        self.assertLess(sum(end - start + 1 for start, end in s3_object.ranges), len(content) // 4)
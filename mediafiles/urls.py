@@ -0,0 +1,14 @@
+"""
+URLs pour l'app mediafiles
+"""
+from django.urls import path
+from . import views
+
+app_name = 'mediafiles'
+
+urlpatterns = [
+    # Upload direct vers le stockage (URL présignée + rappel de fin)
+    path('direct-uploads/', views.DirectUploadView.as_view(), name='direct_upload'),
+    path('direct-uploads/complete/', views.DirectUploadCompleteView.as_view(), name='direct_upload_complete'),
+    path('local-uploads/<str:token>/', views.LocalUploadView.as_view(), name='local_upload'),
+]
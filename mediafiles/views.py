@@ -0,0 +1,129 @@
+"""
+Vues pour l'app mediafiles
+"""
+import tempfile
+
+from django.core import signing
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.http import Http404
+from django.views import View
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from accounts.models import User
+from accounts.candidate_serializers import UserProfileSerializer
+from candidates.models import CandidatureFile
+from candidates.serializers import CandidatureFileSerializer
+from settings.models import HeroCarouselImage
+from settings.serializers import HeroCarouselImageSerializer
+from .serializers import DirectUploadCompleteSerializer, DirectUploadSerializer
+from .serving import serve_media
+from .services import DirectUploadService, MediaAccessService
+from .storage import LocalDirectUpload
+
+# Serializer de la réponse selon le modèle cible
+RESULT_SERIALIZERS = {
+    CandidatureFile: CandidatureFileSerializer,
+    User: UserProfileSerializer,
+    HeroCarouselImage: HeroCarouselImageSerializer,
+}
+
+
+class DirectUploadView(APIView):
+    """
+    Vue pour obtenir une URL d'upload direct vers le stockage
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def post(self, request):
+        serializer = DirectUploadSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        
+        upload = DirectUploadService.prepare(
+            request, data['target'], data['filename'], data['content_type'],
+            data['max_size'], serializer.get_params()
+        )
+        return Response(upload, status=status.HTTP_201_CREATED)
+
+
+class DirectUploadCompleteView(APIView):
+    """
+    Vue de rappel après un upload direct : enregistre l'objet sur le modèle cible
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def post(self, request):
+        serializer = DirectUploadCompleteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        upload_id = serializer.validated_data['upload_id']
+        
+        try:
+            instance = DirectUploadService.complete(request.user, upload_id)
+        except ValueError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        result = RESULT_SERIALIZERS[type(instance)](instance, context={'request': request})
+        return Response(result.data, status=status.HTTP_201_CREATED)
+
+
+class LocalUploadView(APIView):
+    """
+    Réception d'un upload direct sur le stockage local (équivalent du PUT présigné S3)
+
+    Le jeton signé de l'URL tient lieu d'authentification.
+    """
+    permission_classes = [permissions.AllowAny]
+    authentication_classes = []
+    
+    def put(self, request, token):
+        try:
+            upload = LocalDirectUpload.load_token(token)
+        except signing.BadSignature:
+            return Response({'detail': "URL d'upload invalide ou expirée"}, status=status.HTTP_403_FORBIDDEN)
+        
+        if request.content_type.split(';')[0].strip() != upload['content_type']:
+            return Response({'detail': "Content-Type non conforme"}, status=status.HTTP_400_BAD_REQUEST)
+        if default_storage.exists(upload['key']):
+            return Response({'detail': "Objet déjà envoyé"}, status=status.HTTP_409_CONFLICT)
+        
+        # Lecture en flux du corps brut, bornée par la taille autorisée
+        with tempfile.SpooledTemporaryFile(max_size=1024 * 1024) as buffer:
+            received = 0
+            while True:
+                data = request._request.read(64 * 1024)
+                if not data:
+                    break
+                received += len(data)
+                if received > upload['max_size']:
+                    return Response({'detail': "Fichier trop volumineux"}, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+                buffer.write(data)
+            if not received:
+                return Response({'detail': "Fichier vide"}, status=status.HTTP_400_BAD_REQUEST)
+            buffer.seek(0)
+            default_storage.save(upload['key'], File(buffer))
+        
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ProtectedMediaView(View):
+    """
+    Vue servant les fichiers de MEDIA_URL après contrôle d'accès
+
+    Authentification par session (les balises <img>/<video> n'envoient pas
+    d'en-tête Authorization). Un fichier inaccessible répond 404, sans
+    révéler son existence.
+    """
+    http_method_names = ['get', 'head']
+
+    def get(self, request, path):
+        allowed, public = MediaAccessService.check_access(request.user, path)
+        if not allowed:
+            raise Http404("Fichier introuvable")
+        try:
+            return serve_media(request, path, public)
+        except (FileNotFoundError, SuspiciousFileOperation):
+            raise Http404("Fichier introuvable")
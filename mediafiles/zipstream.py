@@ -0,0 +1,99 @@
+"""
+Archive ZIP produite à la volée, sans fichier temporaire
+
+`zipfile` écrit dans un tampon non positionnable : chaque entrée porte un
+descripteur de données (taille et CRC après le contenu), et le tampon est
+vidé après chaque bloc écrit. La mémoire utilisée ne dépend pas de la
+taille des fichiers.
+"""
+import io
+import os
+import zipfile
+
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+CHUNK_SIZE = 64 * 1024
+
+# Formats déjà compressés : stockés tels quels, recompresser ne ferait que coûter du CPU
+COMPRESSED_EXTENSIONS = {
+    '.jpg', '.jpeg', '.png', '.gif', '.webp',
+    '.mp4', '.m4v', '.mov', '.avi', '.wmv', '.flv', '.webm', '.mkv',
+    '.mp3', '.aac', '.m4a', '.ogg', '.wma', '.flac',
+    '.zip', '.rar', '.7z', '.docx', '.xlsx', '.pptx', '.odt',
+}
+
+
+class _StreamBuffer(io.RawIOBase):
+    """
+    Tampon en écriture seule, vidé par le générateur après chaque écriture
+    """
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.buffer += data
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def pop(self):
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        return data
+
+
+def compression_for(name):
+    """
+    Méthode de compression d'une entrée selon l'extension du fichier
+    """
+    if os.path.splitext(name)[1].lower() in COMPRESSED_EXTENSIONS:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+def stream_zip(entries, storage=default_storage):
+    """
+    Génère les octets d'une archive ZIP
+
+    `entries` : itérable de (chemin dans l'archive, nom dans le stockage).
+    Les fichiers introuvables sont ignorés.
+    """
+    output = _StreamBuffer()
+    with zipfile.ZipFile(output, 'w', allowZip64=True) as archive:
+        for arcname, name in entries:
+            try:
+                fh = storage.open(name, 'rb')
+            except FileNotFoundError:
+                continue
+            with fh:
+                info = zipfile.ZipInfo(arcname, date_time=_date_time(storage, name))
+                info.compress_type = compression_for(name)
+                # Taille connue : active ZIP64 pour les entrées de plus de 4 Go
+                info.file_size = fh.size
+                with archive.open(info, 'w') as entry:
+                    for chunk in fh.chunks(CHUNK_SIZE):
+                        entry.write(chunk)
+                        if output.buffer:
+                            yield output.pop()
+            if output.buffer:
+                yield output.pop()
+    yield output.pop()
+
+
+def _date_time(storage, name):
+    try:
+        modified = timezone.localtime(storage.get_modified_time(name))
+    except (NotImplementedError, OSError, ValueError):
+        return (1980, 1, 1, 0, 0, 0)
+    return modified.timetuple()[:6]
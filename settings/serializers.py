@@ -2,16 +2,18 @@
 Serializers pour l'app settings
 """
 from rest_framework import serializers
+from mediafiles.serializers import ResponsiveImageField
 from .models import Settings, HeroCarouselImage, TeamMember, HallOfFame
 
 
 class HeroCarouselImageSerializer(serializers.ModelSerializer):
     """Serializer pour les images du carousel"""
     image_url = serializers.SerializerMethodField()
+    image_variants = ResponsiveImageField(source='image')
     
     class Meta:
         model = HeroCarouselImage
-        fields = ['id', 'image', 'image_url', 'title', 'alt_text', 'order', 'is_active']
+        fields = ['id', 'image', 'image_url', 'image_variants', 'title', 'alt_text', 'order', 'is_active']
     
     def get_image_url(self, obj):
         if obj.image:
@@ -55,12 +57,13 @@ class TeamMemberSerializer(serializers.ModelSerializer):
     """Serializer pour les membres de l'équipe"""
     full_name = serializers.CharField(read_only=True)
     photo_url = serializers.SerializerMethodField()
+    photo_variants = ResponsiveImageField(source='photo')
     
     class Meta:
         model = TeamMember
         fields = [
             'id', 'first_name', 'last_name', 'full_name', 'email', 'phone',
-            'photo', 'photo_url', 'role', 'member_type', 'bio', 'order',
+            'photo', 'photo_url', 'photo_variants', 'role', 'member_type', 'bio', 'order',
             'is_active', 'facebook_url', 'linkedin_url', 'twitter_url',
             'created_at', 'updated_at'
         ]
@@ -78,12 +81,13 @@ class TeamMemberSerializer(serializers.ModelSerializer):
 class HallOfFameSerializer(serializers.ModelSerializer):
     """Serializer pour le Hall of Fame"""
     winner_photo_url = serializers.SerializerMethodField()
+    winner_photo_variants = ResponsiveImageField(source='winner_photo')
     
     class Meta:
         model = HallOfFame
         fields = [
             'id', 'year', 'category_name', 'winner_name', 'winner_photo',
-            'winner_photo_url', 'description', 'award_type', 'order',
+            'winner_photo_url', 'winner_photo_variants', 'description', 'award_type', 'order',
             'is_featured', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']